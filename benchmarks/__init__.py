@@ -0,0 +1,4 @@
+"""Load and latency benchmarks for the PPT Command Executor server.
+
+Run with ``python -m benchmarks --help``.
+"""
@@ -0,0 +1,134 @@
+"""
+Benchmark runner.
+
+Starts a headless server (fake keystrokes, no overlay window) in a
+subprocess, drives it with the load generator and reports latency
+percentiles, event loss, throughput and server CPU/RSS.
+
+Usage:
+    python -m benchmarks [--scenario all] [--duration 10]
+    python -m benchmarks --save-baseline benchmarks/baselines/local.json
+    python -m benchmarks --baseline benchmarks/baselines/local.json --tolerance 0.2
+    python -m benchmarks --profile low-latency --baseline benchmarks/baselines/local.json
+
+Exits with status 1 if a baseline is given and p99 latency or throughput regressed.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from src.config import PROFILES
+from src.network.utils import find_free_port
+
+from . import loadgen
+from .report import ResourceSampler, compare_to_baseline, format_results, load_baseline, save_baseline
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SCENARIOS = ("commands", "laser", "mixed", "connect", "flood")
+
+
+def start_server(port, inject_delay, profile=None, timeout=15.0):
+    """
+    Launch benchmarks.serve and wait until it answers HTTP.
+
+    Returns:
+        subprocess.Popen: The server process
+    """
+    command = [sys.executable, "-m", "benchmarks.serve", "--port", str(port), "--inject-delay", str(inject_delay)]
+    if profile:
+        command += ["--profile", profile]
+    process = subprocess.Popen(command, cwd=ROOT_DIR)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Benchmark server exited with status {process.returncode}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=1.0).close()
+            return process
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Benchmark server did not start in time")
+
+
+def run_scenario(name, url, args):
+    if name == "commands":
+        return loadgen.run_commands(url, args.command_rate, args.duration)
+    if name == "laser":
+        return loadgen.run_laser(url, args.laser_rate, args.duration)
+    if name == "mixed":
+        return loadgen.run_mixed(url, args.command_rate, args.laser_rate, args.duration)
+    if name == "connect":
+        return loadgen.run_connect_storm(url, args.connect_rate, args.connects)
+    if name == "flood":
+        return loadgen.run_flood(url, args.duration)
+    raise ValueError(f"Unknown scenario: {name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PPT server load and latency benchmarks")
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--command-rate", type=float, default=5.0,
+                        help="commands per second (keep within RATE_LIMITS, except to test rejection)")
+    parser.add_argument("--laser-rate", type=float, default=60.0, help="laser moves per second")
+    parser.add_argument("--connect-rate", type=float, default=20.0, help="connection attempts per second")
+    parser.add_argument("--connects", type=int, default=200, help="connection attempts in the connect storm")
+    parser.add_argument("--inject-delay", type=float, default=0.0,
+                        help="simulated keystroke injection time in seconds")
+    parser.add_argument("--profile", choices=sorted(PROFILES), help="performance profile of the started server")
+    parser.add_argument("--url", help="benchmark an already running server instead of starting one")
+    parser.add_argument("--baseline", help="fail if results regress against this baseline")
+    parser.add_argument("--save-baseline", help="write results to this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression, e.g. 0.2 for 20%%")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.url:
+        url = args.url.rstrip("/")
+    else:
+        port = find_free_port(6000, 6100)
+        process = start_server(port, args.inject_delay, args.profile)
+        url = f"http://127.0.0.1:{port}"
+
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    results = {}
+    try:
+        for name in scenarios:
+            sampler = ResourceSampler(process.pid) if process is not None else None
+            if sampler is not None:
+                sampler.start()
+            results[name] = run_scenario(name, url, args)
+            if sampler is not None:
+                results[name].update(sampler.stop())
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    print(json.dumps(results, indent=2) if args.json else format_results(results))
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, load_baseline(args.baseline), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Advertise a DNS-SD record on the loopback interface and resolve it with a second mDNS stack.
+
+Usage:
+    python -m benchmarks.discovery_check [--timeout 5]
+
+Needs the zeroconf package and multicast on the loopback interface, but no
+outside network access. Prints PASS with the resolution time, or FAIL with
+the reason, and exits with status 1 on failure.
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+from src.network.discovery import ZEROCONF_AVAILABLE, IPVersion, ServiceAdvertiser, Zeroconf
+
+SERVICE_TYPE = "_pptcontrol._tcp.local."
+
+
+def check(service_type=SERVICE_TYPE, timeout=5.0):
+    """
+    Advertise a record over loopback and resolve it.
+
+    Args:
+        service_type (str): DNS-SD type to test with
+        timeout (float): Seconds to wait for registration and resolution
+
+    Returns:
+        tuple: (passed, message)
+    """
+    if not ZEROCONF_AVAILABLE:
+        return False, "zeroconf is not installed"
+
+    properties = {"v": "1", "token": "self-test", "path": "/"}
+    advertiser = ServiceAdvertiser(service_type, f"self-test-{time.monotonic_ns()}", 5999, properties,
+                                   address="127.0.0.1", interfaces=["127.0.0.1"])
+    advertiser.start()
+    try:
+        if not advertiser.wait_registered(timeout):
+            return False, "registration did not complete"
+
+        browser = Zeroconf(interfaces=["127.0.0.1"], ip_version=IPVersion.V4Only)
+        try:
+            started = time.perf_counter()
+            info = browser.get_service_info(service_type, advertiser.name, timeout=int(timeout * 1000))
+            elapsed = (time.perf_counter() - started) * 1000
+        finally:
+            browser.close()
+
+        if info is None:
+            return False, f"{advertiser.name} did not resolve"
+        received = {key.decode(): (value or b"").decode() for key, value in info.properties.items()}
+        if info.port != advertiser.port or received != properties:
+            return False, f"record mismatch: port {info.port}, properties {received}"
+        return True, f"resolved {advertiser.name} in {elapsed:.1f} ms"
+    finally:
+        advertiser.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DNS-SD loopback advertisement check")
+    parser.add_argument("--timeout", type=float, default=5.0, help="seconds to wait for registration and resolution")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    passed, message = check(timeout=args.timeout)
+    print(f"{'PASS' if passed else 'FAIL'}: {message}")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+"""Socket.IO load generator driving the controller events at fixed rates."""
+
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import socketio
+
+from .report import scrape_metrics, summarize_latencies
+
+FLOOD_EVENTS = ("command", "laser_pointer_move")
+
+
+def paced(rate, duration):
+    """
+    Yield iteration numbers at a fixed rate without accumulating drift.
+
+    Args:
+        rate (float): Iterations per second
+        duration (float): Seconds to run
+
+    Yields:
+        int: Iteration number
+    """
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    for i in range(int(rate * duration)):
+        delay = start + i * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        yield i
+
+
+class ControllerClient:
+    """
+    Socket.IO client that times commands until their command_ack.
+
+    The server acknowledges commands from one client in order, so acks are
+    matched to send times first-in, first-out.
+    """
+
+    def __init__(self, url):
+        """
+        Initialize the client.
+
+        Args:
+            url (str): Server URL
+        """
+        self.url = url
+        self.sio = socketio.Client(reconnection=False)
+        self.pending = deque()
+        self.latencies = []
+        self.acked = 0
+        self.failed = 0
+        self.sio.on("command_ack", self._on_ack)
+        # Answer heartbeats so idle phases do not get the client dropped
+        self.sio.on("hb", lambda data: True)
+
+    def connect(self, timeout=5.0):
+        self.sio.connect(self.url, transports=["websocket"], wait_timeout=timeout)
+
+    def disconnect(self):
+        self.sio.disconnect()
+
+    def _on_ack(self, data):
+        now = time.perf_counter()
+        if not self.pending:
+            return
+        self.latencies.append(now - self.pending.popleft())
+        self.acked += 1
+        if not (isinstance(data, dict) and data.get("ok")):
+            self.failed += 1
+
+    def send_command(self, command):
+        self.pending.append(time.perf_counter())
+        self.sio.emit("command", command)
+
+    def wait_for_acks(self, timeout):
+        """Wait until every sent command was acknowledged or the timeout passes."""
+        deadline = time.perf_counter() + timeout
+        while self.pending and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+
+def _laser_delivered(url):
+    samples = scrape_metrics(url)
+    return samples.get(("ppt_laser_events_total", ""), 0.0)
+
+
+def run_commands(url, rate, duration, command="NEXT_SLIDE", drain=5.0):
+    """
+    Send commands at a fixed rate and time each one until its ack.
+
+    Args:
+        url (str): Server URL
+        rate (float): Commands per second
+        duration (float): Seconds to send for
+        command (str): Command to send
+        drain (float): Seconds to wait for outstanding acks
+
+    Returns:
+        dict: Scenario result
+    """
+    client = ControllerClient(url)
+    client.connect()
+    try:
+        start = time.perf_counter()
+        sent = 0
+        for _ in paced(rate, duration):
+            client.send_command(command)
+            sent += 1
+        client.wait_for_acks(drain)
+        elapsed = time.perf_counter() - start
+    finally:
+        client.disconnect()
+
+    return {
+        "sent": sent,
+        "lost": sent - client.acked,
+        "failed": client.failed,
+        "throughput": client.acked / elapsed,
+        "latency_ms": summarize_latencies(client.latencies),
+    }
+
+
+def run_laser(url, rate, duration, drain=1.0):
+    """
+    Stream laser pointer moves and count how many the server applied.
+
+    Args:
+        url (str): Server URL
+        rate (float): Moves per second
+        duration (float): Seconds to send for
+        drain (float): Seconds to let the server catch up before counting
+
+    Returns:
+        dict: Scenario result
+    """
+    client = ControllerClient(url)
+    client.connect()
+    try:
+        client.sio.emit("laser_pointer_toggle", {"enabled": True})
+        time.sleep(0.1)
+        before = _laser_delivered(url)
+
+        start = time.perf_counter()
+        sent = 0
+        for i in paced(rate, duration):
+            client.sio.emit("laser_pointer_move", {"x": (i % 100) / 100.0, "y": 0.5})
+            sent += 1
+        time.sleep(drain)
+        elapsed = time.perf_counter() - start
+
+        delivered = int(_laser_delivered(url) - before)
+        client.sio.emit("laser_pointer_toggle", {"enabled": False})
+    finally:
+        client.disconnect()
+
+    return {
+        "sent": sent,
+        "lost": sent - delivered,
+        "throughput": delivered / elapsed,
+    }
+
+
+def run_mixed(url, command_rate, laser_rate, duration, command="NEXT_SLIDE", drain=5.0):
+    """
+    Time commands while laser moves stream on the same connection, as in a live talk.
+
+    Args:
+        url (str): Server URL
+        command_rate (float): Commands per second
+        laser_rate (float): Laser moves per second
+        duration (float): Seconds to send for
+        command (str): Command to send
+        drain (float): Seconds to wait for outstanding acks
+
+    Returns:
+        dict: Scenario result; loss counts both commands and laser moves
+    """
+    client = ControllerClient(url)
+    client.connect()
+    laser_sent = [0]
+
+    def stream_laser():
+        for i in paced(laser_rate, duration):
+            client.sio.emit("laser_pointer_move", {"x": (i % 100) / 100.0, "y": 0.5})
+            laser_sent[0] += 1
+
+    try:
+        client.sio.emit("laser_pointer_toggle", {"enabled": True})
+        time.sleep(0.1)
+        laser_before = _laser_delivered(url)
+
+        laser_thread = threading.Thread(target=stream_laser, daemon=True)
+        start = time.perf_counter()
+        laser_thread.start()
+        sent = 0
+        for _ in paced(command_rate, duration):
+            client.send_command(command)
+            sent += 1
+        laser_thread.join()
+        client.wait_for_acks(drain)
+        elapsed = time.perf_counter() - start
+
+        laser_delivered = int(_laser_delivered(url) - laser_before)
+        client.sio.emit("laser_pointer_toggle", {"enabled": False})
+    finally:
+        client.disconnect()
+
+    return {
+        "sent": sent + laser_sent[0],
+        "lost": (sent - client.acked) + (laser_sent[0] - laser_delivered),
+        "failed": client.failed,
+        "throughput": client.acked / elapsed,
+        "latency_ms": summarize_latencies(client.latencies),
+    }
+
+
+def run_connect_storm(url, rate, count, concurrency=32, timeout=5.0):
+    """
+    Open connections at a fixed rate; each new controller takes over from the last.
+
+    Args:
+        url (str): Server URL
+        rate (float): Connection attempts per second
+        count (int): Total connection attempts
+        concurrency (int): Maximum connections in flight
+        timeout (float): Connect timeout in seconds
+
+    Returns:
+        dict: Scenario result; latency is the time until the namespace is joined
+    """
+    latencies = []
+    failures = [0]
+
+    def connect_once():
+        client = socketio.Client(reconnection=False)
+        started = time.perf_counter()
+        try:
+            client.connect(url, transports=["websocket"], wait_timeout=timeout)
+            latencies.append(time.perf_counter() - started)
+        except socketio.exceptions.ConnectionError:
+            failures[0] += 1
+        finally:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(connect_once) for _ in paced(rate, count / rate)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "sent": len(futures),
+        "lost": failures[0],
+        "throughput": len(latencies) / elapsed,
+        "latency_ms": summarize_latencies(latencies),
+    }
+
+
+def run_flood(url, duration, probe_rate=10.0):
+    """
+    Flood the server with commands and laser moves while probing its responsiveness.
+
+    The flooding client holds the controller slot and sends as fast as it
+    can; a separate thread times HTTP requests to /metrics, which share the
+    server's event loop. The result's latency is the probe latency and its
+    loss the failed probes.
+
+    Args:
+        url (str): Server URL
+        duration (float): Seconds to flood for
+        probe_rate (float): Probe requests per second
+
+    Returns:
+        dict: Scenario result, including what the server rate-limited
+    """
+    client = ControllerClient(url)
+    client.connect()
+    stop = threading.Event()
+    sent = [0]
+
+    def flood():
+        i = 0
+        while not stop.is_set():
+            client.sio.emit("laser_pointer_move", {"x": (i % 100) / 100.0, "y": 0.5})
+            sent[0] += 1
+            if i % 4 == 0:
+                client.sio.emit("command", "NEXT_SLIDE")
+                sent[0] += 1
+            i += 1
+
+    probes = []
+    failures = 0
+    before = scrape_metrics(url)
+    try:
+        client.sio.emit("laser_pointer_toggle", {"enabled": True})
+        flooder = threading.Thread(target=flood, daemon=True)
+        start = time.perf_counter()
+        flooder.start()
+        for _ in paced(probe_rate, duration):
+            probe_start = time.perf_counter()
+            try:
+                urllib.request.urlopen(f"{url}/metrics", timeout=5.0).close()
+                probes.append(time.perf_counter() - probe_start)
+            except OSError:
+                failures += 1
+        stop.set()
+        flooder.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        client.disconnect()
+
+    after = scrape_metrics(url)
+
+    def delta(name, labels=""):
+        return int(after.get((name, labels), 0.0) - before.get((name, labels), 0.0))
+
+    received = sum(delta("ppt_events_received_total", f'{{event="{event}"}}') for event in FLOOD_EVENTS)
+    return {
+        "sent": sent[0],
+        "lost": failures,
+        "throughput": received / elapsed,
+        "latency_ms": summarize_latencies(probes),
+        "rate_limited": {
+            "laser_coalesced": delta("ppt_rate_limited_total", '{event="laser_pointer_move",action="coalesced"}'),
+            "commands_rejected": delta("ppt_rate_limited_total", '{event="command",action="rejected"}'),
+        },
+    }
@@ -0,0 +1,215 @@
+"""
+Render the laser pointer overlay under Xvfb and report its frame pacing.
+
+Usage:
+    python -m benchmarks.overlay_bench [--rates 30 60 120 240] [--duration 5] [--display :0]
+
+Unless --display is given, a private Xvfb server is started. For each rate,
+a feeder thread (standing in for the server thread) sends positions along
+a circle while Tk runs the overlay's animation loop; the overlay's
+FrameStats are then reported per rate: frame times, received-to-drawn
+latency, and missed, duplicate and superseded frames.
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from .report import compare_to_baseline, load_baseline, save_baseline
+
+XVFB_SCREEN = "1920x1080x24"
+WARMUP = 0.5  # seconds of each run not counted
+
+
+def start_xvfb(timeout=5.0):
+    """
+    Start Xvfb on a free display and point DISPLAY at it.
+
+    Returns:
+        subprocess.Popen: The Xvfb process
+
+    Raises:
+        RuntimeError: If Xvfb is not installed or does not come up
+    """
+    if shutil.which("Xvfb") is None:
+        raise RuntimeError("Xvfb not found; install it (e.g. apt install xvfb) or pass --display")
+
+    display = next(
+        n for n in range(99, 200)
+        if not os.path.exists(f"/tmp/.X11-unix/X{n}") and not os.path.exists(f"/tmp/.X{n}-lock")
+    )
+    process = subprocess.Popen(
+        ["Xvfb", f":{display}", "-screen", "0", XVFB_SCREEN, "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(f"/tmp/.X11-unix/X{display}"):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError(f"Xvfb did not start on :{display}")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = f":{display}"
+    return process
+
+
+def feed_positions(overlay, rate, stop, period=2.0):
+    """
+    Send positions along a circle at a fixed rate until stopped.
+
+    Args:
+        overlay (LaserPointerOverlay): Overlay receiving the positions
+        rate (float): Positions per second
+        stop (threading.Event): Set to end the stream
+        period (float): Seconds per revolution
+
+    Returns:
+        int: Positions sent
+    """
+    interval = 1.0 / rate
+    started = time.perf_counter()
+    sent = 0
+    while not stop.is_set():
+        delay = started + sent * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        angle = 2 * math.pi * sent * interval / period
+        overlay.update_position(0.5 + 0.4 * math.cos(angle), 0.5 + 0.4 * math.sin(angle))
+        sent += 1
+    return sent
+
+
+def run_rate(root, overlay, rate, duration):
+    """
+    Feed one rate for a duration while Tk renders, and collect the overlay's stats.
+
+    Returns:
+        dict: FrameStats snapshot plus rate, sent and throughput (frames per second)
+    """
+    stop = threading.Event()
+    result = {}
+    feeder = threading.Thread(target=lambda: result.update(sent=feed_positions(overlay, rate, stop)), daemon=True)
+    feeder.start()
+
+    root.after(int(WARMUP * 1000), overlay.frame_stats.reset)
+    root.after(int((WARMUP + duration) * 1000), root.quit)
+    root.mainloop()
+    stop.set()
+    feeder.join()
+
+    stats = overlay.frame_stats.snapshot()
+    stats.update(rate=rate, sent=result["sent"], throughput=stats["frames"] / duration)
+    return stats
+
+
+def run(rates, duration):
+    """
+    Run the overlay at each position rate.
+
+    Returns:
+        dict: '<rate>hz' -> result
+    """
+    import tkinter as tk
+
+    from src.gui.laser_overlay import LaserPointerOverlay
+
+    root = tk.Tk()
+    root.withdraw()
+    overlay = LaserPointerOverlay()
+    overlay.enable()
+    if not overlay.enabled:
+        root.destroy()
+        raise RuntimeError("The overlay could not be shown")
+
+    try:
+        return {f"{rate:g}hz": run_rate(root, overlay, rate, duration) for rate in rates}
+    finally:
+        overlay.disable()
+        root.destroy()
+
+
+def format_report(results):
+    """
+    Format results as a plain-text table.
+
+    Args:
+        results (dict): Run name -> result
+
+    Returns:
+        str: Report text
+    """
+    def fmt(summary, key):
+        value = summary.get(key)
+        return "-" if value is None else f"{value:.2f}"
+
+    header = f"{'rate':<8} {'sent':>6} {'frames':>7} {'fps':>6} {'missed':>7} {'dup':>6} {'super':>6} " \
+             f"{'frame p50':>10} {'frame p99':>10} {'lat p50':>8} {'lat p99':>8} {'draw p99':>9}"
+    lines = [header, "-" * len(header)]
+    for name, result in results.items():
+        frame, latency, draw = result["frame_ms"], result["latency_ms"], result["draw_ms"]
+        lines.append(
+            f"{name:<8} {result['sent']:>6} {result['frames']:>7} {result['throughput']:>6.1f} "
+            f"{result['missed']:>7} {result['duplicate']:>6} {result['superseded']:>6} "
+            f"{fmt(frame, 'p50'):>10} {fmt(frame, 'p99'):>10} {fmt(latency, 'p50'):>8} "
+            f"{fmt(latency, 'p99'):>8} {fmt(draw, 'p99'):>9}"
+        )
+
+    lines.append("\nFrame times (ms):")
+    for name, result in results.items():
+        buckets = "  ".join(f"<={bound}:{count}" for bound, count in result["histogram"].items())
+        lines.append(f"  {name:<8} {buckets}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laser overlay rendering benchmark")
+    parser.add_argument("--rates", type=float, nargs="+", default=[30.0, 60.0, 120.0, 240.0],
+                        help="laser positions per second to feed, one run each")
+    parser.add_argument("--duration", type=float, default=5.0, help="measured seconds per rate")
+    parser.add_argument("--display", help="render on this X display instead of a private Xvfb")
+    parser.add_argument("--baseline", help="fail if results regress against this baseline")
+    parser.add_argument("--save-baseline", help="write results to this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression, e.g. 0.2 for 20%%")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    xvfb = None
+    try:
+        if args.display:
+            os.environ["DISPLAY"] = args.display
+        else:
+            xvfb = start_xvfb()
+        results = run(args.rates, args.duration)
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+        return 1
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait(timeout=10)
+
+    print(json.dumps(results, indent=2) if args.json else format_report(results))
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        # Received-to-drawn p99 and frames per second, as for the server scenarios
+        regressions = compare_to_baseline(results, load_baseline(args.baseline), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
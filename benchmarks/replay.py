@@ -0,0 +1,168 @@
+"""
+Replay a recorded session into a headless server and report how it kept up.
+
+Record a live session by starting the app with PPT_RECORD_EVENTS=FILE, then:
+
+    python -m benchmarks.replay FILE [--speed 1.0] [--inject-delay 0.002]
+
+Events are dispatched to the server's Socket.IO handlers in their own
+greenlets, at the recorded times divided by --speed (0 replays as fast as
+possible), so the handler backlog shows how far the server falls behind.
+The controller's events then pass through its ordered lane as they would
+live. Screen mirroring events are
+skipped unless --include-mirror is given, since they capture the screen.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from collections import Counter
+
+import gevent
+
+from src.server.socket_server import ServerState
+from src.server.tracing import TraceRing
+from src.server.recorder import read_recording
+
+from .report import summarize_latencies
+from .serve import create_server
+
+
+class ReplayStats:
+    """Dispatch lag and backlog of a replay."""
+
+    def __init__(self):
+        self.events = Counter()
+        self.lags = []
+        self.in_flight = 0
+        self.max_depth = 0
+        self.depth_sum = 0
+
+    def dispatched(self, lag):
+        self.lags.append(lag)
+        self.depth_sum += self.in_flight
+        self.in_flight += 1
+        self.max_depth = max(self.max_depth, self.in_flight)
+
+    def finished(self):
+        self.in_flight -= 1
+
+
+def replay(path, speed=1.0, inject_delay=0.0, include_mirror=False):
+    """
+    Replay a recording into a fresh headless server.
+
+    Args:
+        path (Path): Recording file
+        speed (float): Time compression factor; 0 dispatches without waiting
+        inject_delay (float): Simulated keystroke injection time in seconds
+        include_mirror (bool): Also replay screen mirroring events
+
+    Returns:
+        dict: Replay report
+    """
+    records = [
+        record for record in read_recording(path)
+        if include_mirror or not record[2].startswith("mirror_")
+    ]
+    commands = sum(1 for record in records if record[2] == "command")
+
+    server = create_server(inject_delay)
+    server.traces = TraceRing(max(commands, 1))
+    server.state = ServerState.RUNNING
+    handlers = server.sio.handlers["/"]
+    stats = ReplayStats()
+
+    def dispatch(handler, sid, args):
+        try:
+            handler(sid, *args)
+        except Exception as e:
+            logging.getLogger(__name__).error("Replayed handler failed: %s", e)
+        finally:
+            stats.finished()
+
+    greenlets = []
+    start = time.monotonic()
+    for timestamp, sid, event, args in records:
+        handler = handlers.get(event)
+        if handler is None:
+            continue
+        due = start + (timestamp / speed if speed > 0 else 0.0)
+        delay = due - time.monotonic()
+        if delay > 0:
+            gevent.sleep(delay)
+        stats.events[event] += 1
+        stats.dispatched(max(0.0, time.monotonic() - due))
+        greenlets.append(gevent.spawn(dispatch, handler, sid, args))
+    gevent.joinall(greenlets)
+    server.lane.join()  # Events queued behind a command finish on the lane's worker
+    elapsed = time.monotonic() - start
+
+    metrics = server.metrics
+    laser_sent = stats.events["laser_pointer_move"]
+    return {
+        "events": dict(stats.events),
+        "elapsed_s": elapsed,
+        "recorded_s": records[-1][0] if records else 0.0,
+        "dispatch_lag_ms": summarize_latencies(stats.lags),
+        "queue_depth": {
+            "max": stats.max_depth,
+            "mean": stats.depth_sum / len(stats.lags) if stats.lags else 0.0,
+        },
+        "laser": {
+            "sent": laser_sent,
+            "applied": metrics.laser_events.value(),
+            "dropped": {
+                reason: metrics.laser_dropped.value(reason)
+                for reason in ("unauthorized", "invalid", "disabled")
+            },
+        },
+        "command_latency_ms": summarize_latencies([record.total for record in server.traces.completed()]),
+    }
+
+
+def format_report(report):
+    lag = report["dispatch_lag_ms"]
+    command = report["command_latency_ms"]
+    laser = report["laser"]
+    lines = [
+        f"Replayed {sum(report['events'].values())} events in {report['elapsed_s']:.2f} s "
+        f"(recorded over {report['recorded_s']:.2f} s)",
+        "  " + ", ".join(f"{event}={count}" for event, count in sorted(report["events"].items())),
+        f"Dispatch lag      p50 {lag.get('p50', 0):.2f} ms  p99 {lag.get('p99', 0):.2f} ms  "
+        f"max {lag.get('max', 0):.2f} ms",
+        f"Queue depth       max {report['queue_depth']['max']}  mean {report['queue_depth']['mean']:.2f}",
+        f"Laser frames      sent {laser['sent']}  applied {laser['applied']}  dropped "
+        + ", ".join(f"{reason}={count}" for reason, count in laser["dropped"].items()),
+    ]
+    if command["count"]:
+        lines.append(
+            f"Command latency   p50 {command['p50']:.2f} ms  p99 {command['p99']:.2f} ms  "
+            f"max {command['max']:.2f} ms  ({command['count']} commands)"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded PPT controller session")
+    parser.add_argument("recording", help="file written with PPT_RECORD_EVENTS")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="replay speed factor; 0 for as fast as possible")
+    parser.add_argument("--inject-delay", type=float, default=0.0,
+                        help="simulated keystroke injection time in seconds")
+    parser.add_argument("--include-mirror", action="store_true", help="also replay screen mirroring events")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        report = replay(args.recording, args.speed, args.inject_delay, args.include_mirror)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        return 1
+    print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Benchmark statistics, resource sampling and baseline comparison."""
+
+import json
+import re
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+METRIC_LINE = re.compile(r"^(\w+)(\{[^}]*\})?\s+(\S+)$")
+
+
+def percentile(sorted_values, q):
+    """
+    Nearest-rank percentile.
+
+    Args:
+        sorted_values (list): Ascending values
+        q (float): Quantile between 0 and 1
+
+    Returns:
+        float or None: The percentile, or None for no data
+    """
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def summarize_latencies(latencies):
+    """
+    Summarize latencies in seconds as milliseconds.
+
+    Args:
+        latencies (list): Latency samples in seconds
+
+    Returns:
+        dict: count, mean, p50, p90, p99 and max in milliseconds
+    """
+    values = sorted(latencies)
+    summary = {"count": len(values)}
+    if not values:
+        return summary
+    summary["mean"] = sum(values) / len(values) * 1000.0
+    for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        summary[name] = percentile(values, q) * 1000.0
+    summary["max"] = values[-1] * 1000.0
+    return summary
+
+
+def scrape_metrics(base_url, timeout=5.0):
+    """
+    Read the server's /metrics endpoint.
+
+    Args:
+        base_url (str): Server URL, e.g. http://127.0.0.1:5050
+        timeout (float): Request timeout in seconds
+
+    Returns:
+        dict: (metric name, label string) -> value
+    """
+    with urllib.request.urlopen(f"{base_url}/metrics", timeout=timeout) as response:
+        text = response.read().decode("utf-8")
+
+    samples = {}
+    for line in text.splitlines():
+        match = METRIC_LINE.match(line)
+        if match:
+            samples[(match.group(1), match.group(2) or "")] = float(match.group(3))
+    return samples
+
+
+class ResourceSampler(threading.Thread):
+    """Samples CPU usage and resident memory of a process while a scenario runs."""
+
+    def __init__(self, pid, interval=0.25):
+        """
+        Initialize the sampler.
+
+        Args:
+            pid (int): Process to watch
+            interval (float): Sampling interval in seconds
+        """
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.process = psutil.Process(pid) if psutil is not None else None
+        self.cpu_samples = []
+        self.rss_max = 0
+        self._stop_event = threading.Event()
+        self._cpu_start = None
+        self._wall_start = None
+
+    def run(self):
+        if self.process is None:
+            return
+        self.process.cpu_percent(None)
+        times = self.process.cpu_times()
+        self._cpu_start = times.user + times.system
+        self._wall_start = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.cpu_samples.append(self.process.cpu_percent(None))
+                self.rss_max = max(self.rss_max, self.process.memory_info().rss)
+            except psutil.Error:
+                break
+
+    def stop(self):
+        """
+        Stop sampling.
+
+        Returns:
+            dict: Average and peak CPU percent and peak RSS in MB, or {} without psutil
+        """
+        self._stop_event.set()
+        self.join()
+        if self.process is None or self._wall_start is None:
+            return {}
+        try:
+            times = self.process.cpu_times()
+            cpu_avg = (times.user + times.system - self._cpu_start) / (time.perf_counter() - self._wall_start) * 100
+        except psutil.Error:
+            cpu_avg = None
+        return {
+            "cpu_avg_percent": cpu_avg,
+            "cpu_peak_percent": max(self.cpu_samples, default=None),
+            "rss_peak_mb": self.rss_max / (1024 * 1024),
+        }
+
+
+def compare_to_baseline(results, baseline, tolerance=0.2):
+    """
+    Find regressions against a saved baseline.
+
+    A scenario regresses if its p99 latency grew, or its throughput fell,
+    by more than the tolerance.
+
+    Args:
+        results (dict): Scenario name -> result
+        baseline (dict): Scenario name -> result from an earlier run
+        tolerance (float): Allowed relative change, e.g. 0.2 for 20%
+
+    Returns:
+        list: Human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+
+        p99 = result.get("latency_ms", {}).get("p99")
+        reference_p99 = reference.get("latency_ms", {}).get("p99")
+        if p99 is not None and reference_p99 and p99 > reference_p99 * (1 + tolerance):
+            regressions.append(f"{name}: p99 latency {p99:.2f} ms > baseline {reference_p99:.2f} ms")
+
+        throughput = result.get("throughput")
+        reference_throughput = reference.get("throughput")
+        if throughput is not None and reference_throughput and throughput < reference_throughput * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {throughput:.1f}/s < baseline {reference_throughput:.1f}/s"
+            )
+    return regressions
+
+
+def load_baseline(path):
+    """Load a baseline saved by save_baseline()."""
+    return json.loads(Path(path).read_text())
+
+
+def save_baseline(path, results):
+    """Save results as a baseline for later runs."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True))
+
+
+def format_results(results):
+    """
+    Format results as a plain-text table.
+
+    Args:
+        results (dict): Scenario name -> result
+
+    Returns:
+        str: Report text
+    """
+    def fmt(value, spec=".2f"):
+        return "-" if value is None else format(value, spec)
+
+    header = f"{'scenario':<10} {'sent':>7} {'lost':>6} {'rate/s':>8} {'p50 ms':>8} {'p99 ms':>8} " \
+             f"{'max ms':>8} {'cpu %':>6} {'rss MB':>7}"
+    lines = [header, "-" * len(header)]
+    for name, result in results.items():
+        latency = result.get("latency_ms", {})
+        lines.append(
+            f"{name:<10} {result['sent']:>7} {result['lost']:>6} {fmt(result.get('throughput'), '.1f'):>8} "
+            f"{fmt(latency.get('p50')):>8} {fmt(latency.get('p99')):>8} {fmt(latency.get('max')):>8} "
+            f"{fmt(result.get('cpu_avg_percent'), '.0f'):>6} {fmt(result.get('rss_peak_mb'), '.1f'):>7}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,81 @@
+"""
+Run PPTServer headless with a fake keystroke sink, for benchmarking.
+
+Usage:
+    python -m benchmarks.serve --port 5050 [--inject-delay 0.002] [--profile low-latency]
+"""
+
+import argparse
+import logging
+
+from src import config
+
+
+class HeadlessOverlay:
+    """Stand-in for LaserPointerOverlay that keeps the last position instead of drawing."""
+
+    def __init__(self):
+        self.enabled = False
+        self.position = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def update_position(self, x, y):
+        self.position = (x, y)
+
+    def ink_stroke(self, slide, stroke_id, points, color, width):
+        return self.enabled
+
+    def ink_undo(self, slide):
+        pass
+
+    def ink_clear(self, slide):
+        pass
+
+    def ink_show(self, slide):
+        pass
+
+
+def create_server(inject_delay=0.0):
+    """
+    Create a server that injects no keystrokes and opens no windows.
+
+    Args:
+        inject_delay (float): Simulated cost of each keystroke in seconds
+
+    Returns:
+        PPTServer: Server ready to start()
+    """
+    # Imported here so that settings loaded by main() are seen by the server modules
+    from src.server.injection import NullInjector
+    from src.server.socket_server import PPTServer
+
+    return PPTServer(
+        injector=NullInjector(inject_delay),
+        laser_overlay=HeadlessOverlay(),
+        impress_enabled=False,
+        discovery_enabled=False
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a headless PPT server for benchmarks")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--inject-delay", type=float, default=0.0,
+                        help="simulated keystroke injection time in seconds")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--profile", choices=sorted(config.PROFILES), help="performance profile to benchmark")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level)
+    # Only the profile and PPT_* variables: the user's settings file must not skew benchmarks
+    config.load_settings(args.profile, read_file=False)
+    create_server(args.inject_delay).start(args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Fast-start build: a onedir PyInstaller bundle with a trimmed import graph.
+
+A onefile executable unpacks its whole archive to a temporary directory on
+every launch; a onedir bundle runs straight from its folder. The bundle
+also leaves out modules that a real session never imports, and the modules
+it keeps are compiled with optimization level 1 at build time.
+
+Usage:
+    python build_fast.py trace      # run the app, use it as in a talk, close it
+    python build_fast.py build      # build dist/fast/PPTCommandExecutor and measure it
+    python build_fast.py measure    # only re-measure an existing build
+
+Each trace is merged into build/imports.txt, so several sessions (e.g. with
+and without LibreOffice) can be combined. The build prints the bundle size
+and launch times and compares them with the previous build's report.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import build_web
+from build_spec import APP_NAME, MAIN_SCRIPT, ICON_FILE, WINDOWED, IS_WINDOWS, IS_MACOS
+
+BUILD_DIR = Path("build")
+DIST_DIR = Path("dist/fast")
+TRACE_FILE = BUILD_DIR / "imports.txt"
+REPORT_FILE = BUILD_DIR / "fast-start-report.json"
+SPEC_FILE = Path(f"{APP_NAME}-fast.spec")
+LAUNCH_RUNS = 5
+REGRESSION_TOLERANCE = 0.1  # warn when size or launch time grows by more than 10%
+
+# Modules that PyInstaller hooks or optional imports tend to pull in. Each is
+# excluded unless the traced session imported it (or one of its submodules).
+EXCLUDE_CANDIDATES = (
+    "IPython", "PyQt5", "PyQt6", "PySide2", "PySide6", "matplotlib", "scipy", "pandas", "tornado",
+    "setuptools", "pkg_resources", "distutils", "pip", "lib2to3", "pydoc", "pydoc_data",
+    "doctest", "unittest", "test", "tkinter.test", "idlelib", "turtle", "turtledemo", "pdb",
+    "sqlite3", "xmlrpc", "ftplib", "imaplib", "poplib", "smtplib", "mailbox", "curses",
+    "numpy.distutils", "numpy.f2py", "numpy.testing", "PIL.ImageQt", "gevent.tests", "gevent.testing",
+    "engineio.async_drivers.aiohttp", "engineio.async_drivers.asgi", "engineio.async_drivers.tornado",
+    "engineio.async_drivers.sanic", "psutil",
+)
+
+DATAS = [("assets", "assets"), ("src/web/dist", "src/web/dist")]
+
+
+def read_trace(path=TRACE_FILE):
+    """
+    Read a traced import set.
+
+    Returns:
+        set: Module names
+    """
+    if not path.exists():
+        return set()
+    return {line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()}
+
+
+def trace():
+    """Run the app from source and merge the modules it imported into TRACE_FILE."""
+    BUILD_DIR.mkdir(exist_ok=True)
+    session_file = BUILD_DIR / "imports-session.txt"
+    print("Starting the app. Use it as in a real talk (connect a phone, laser, ink, ...), then close it.")
+    subprocess.run([sys.executable, MAIN_SCRIPT, "--trace-imports", str(session_file)], check=True)
+
+    session = read_trace(session_file)
+    merged = read_trace() | session
+    TRACE_FILE.write_text("\n".join(sorted(merged)) + "\n", encoding="utf-8")
+    session_file.unlink()
+    print(f"✓ {len(session)} modules traced, {len(merged)} in {TRACE_FILE}")
+
+
+def plan_imports(traced):
+    """
+    Derive PyInstaller excludes and hidden imports from a traced import set.
+
+    Returns:
+        tuple: (excludes, hiddenimports) as sorted lists
+    """
+    def used(name):
+        return name in traced or any(module.startswith(name + ".") for module in traced)
+
+    excludes = sorted(name for name in EXCLUDE_CANDIDATES if not used(name))
+    # Modules imported dynamically (e.g. engineio's async driver) are invisible
+    # to PyInstaller's static analysis; the trace makes them explicit.
+    stdlib = sys.stdlib_module_names
+    hiddenimports = sorted(
+        module for module in traced
+        if module.split(".")[0] not in stdlib and module not in ("__main__", "main")
+        and not module.startswith(("_pyi", "_distutils_hack"))
+    )
+    return excludes, hiddenimports
+
+
+def generate_spec(excludes, hiddenimports):
+    """Write the onedir spec file."""
+    icon = f"icon={ICON_FILE!r}," if Path(ICON_FILE).exists() else ""
+    bundle = f"""
+app = BUNDLE(
+    coll,
+    name={APP_NAME + '.app'!r},
+    {icon}
+    bundle_identifier="com.pptcommandexecutor.app",
+    info_plist={{"NSHighResolutionCapable": "True", "LSUIElement": "0"}},
+)
+""" if IS_MACOS else ""
+
+    SPEC_FILE.write_text(f"""# -*- mode: python ; coding: utf-8 -*-
+# Fast-start onedir spec for {APP_NAME}, generated by build_fast.py from {TRACE_FILE}
+
+a = Analysis(
+    [{MAIN_SCRIPT!r}],
+    datas={DATAS!r},
+    hiddenimports={hiddenimports!r},
+    excludes={excludes!r},
+    noarchive=False,
+    optimize=1,
+)
+
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name={APP_NAME!r},
+    strip=False,
+    upx=False,  # UPX-compressed libraries are decompressed on every launch
+    console={not WINDOWED},
+    {icon}
+)
+
+coll = COLLECT(exe, a.binaries, a.datas, strip=False, upx=False, name={APP_NAME!r})
+{bundle}""")
+
+
+def executable():
+    """Path of the built onedir executable."""
+    return DIST_DIR / APP_NAME / (APP_NAME + (".exe" if IS_WINDOWS else ""))
+
+
+def measure_launch(command, runs=LAUNCH_RUNS):
+    """
+    Time `<command> --startup-check` from process start to exit.
+
+    Returns:
+        dict: cold_ms (first run) and warm_ms (median of the rest)
+    """
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command + ["--startup-check"], check=True, capture_output=True, timeout=120)
+        times.append((time.perf_counter() - started) * 1000)
+    return {"cold_ms": round(times[0], 1), "warm_ms": round(statistics.median(times[1:] or times), 1)}
+
+
+def measure():
+    """
+    Measure the bundle size and launch time, print them and compare with the previous report.
+
+    Returns:
+        dict: The new report
+    """
+    bundle_dir = DIST_DIR / APP_NAME
+    files = [path for path in bundle_dir.rglob("*") if path.is_file()]
+    report = {
+        "size_bytes": sum(path.stat().st_size for path in files),
+        "files": len(files),
+        "launch": measure_launch([str(executable())]),
+    }
+
+    # A onefile build from the other build scripts, for comparison
+    onefile = Path("dist") / (APP_NAME + (".exe" if IS_WINDOWS else ""))
+    if onefile.is_file():
+        report["onefile_launch"] = measure_launch([str(onefile)])
+
+    print(f"\nBundle:  {report['size_bytes'] / 1e6:.1f} MB in {report['files']} files")
+    print(f"Launch:  cold {report['launch']['cold_ms']} ms, warm {report['launch']['warm_ms']} ms")
+    if "onefile_launch" in report:
+        print(f"Onefile: cold {report['onefile_launch']['cold_ms']} ms, warm {report['onefile_launch']['warm_ms']} ms")
+
+    if REPORT_FILE.exists():
+        previous = json.loads(REPORT_FILE.read_text())
+        for label, old, new in (
+            ("size", previous["size_bytes"], report["size_bytes"]),
+            ("warm launch", previous["launch"]["warm_ms"], report["launch"]["warm_ms"]),
+        ):
+            change = (new - old) / old if old else 0.0
+            flag = "  REGRESSION" if change > REGRESSION_TOLERANCE else ""
+            print(f"  {label}: {change:+.1%} vs previous build{flag}")
+
+    BUILD_DIR.mkdir(exist_ok=True)
+    REPORT_FILE.write_text(json.dumps(report, indent=2))
+    return report
+
+
+def build():
+    """Build the onedir bundle from the traced import set and measure it."""
+    traced = read_trace()
+    if not traced:
+        print(f"ERROR: {TRACE_FILE} not found; run 'python build_fast.py trace' first")
+        sys.exit(1)
+
+    excludes, hiddenimports = plan_imports(traced)
+    print(f"Excluding {len(excludes)} unused modules, {len(hiddenimports)} traced imports pinned")
+
+    build_web.build()
+    generate_spec(excludes, hiddenimports)
+    print(f"✓ Generated {SPEC_FILE}\n")
+
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "PyInstaller", str(SPEC_FILE), "--distpath", str(DIST_DIR), "--noconfirm", "--clean"],
+            check=True
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"\nERROR: Build failed: {e}")
+        sys.exit(1)
+
+    print(f"\n✓ Built {DIST_DIR / APP_NAME}")
+    measure()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fast-start onedir build")
+    parser.add_argument("step", choices=("trace", "build", "measure"))
+    args = parser.parse_args()
+    {"trace": trace, "build": build, "measure": measure}[args.step]()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ import sys
 import subprocess
 from pathlib import Path
 
+import build_web
+
 # Build configuration
 APP_NAME = "PPTCommandExecutor"
 MAIN_SCRIPT = "main.py"
@@ -24,6 +26,7 @@ PYINSTALLER_ARGS = [
     "--onefile",  # Single executable file
     "--windowed",  # Create .app bundle
     "--add-data", "assets:assets",  # Include assets folder (macOS/Linux syntax)
+    "--add-data", "src/web/dist:src/web/dist",  # Built by build_web.py
     "--hidden-import", "flask",
     "--hidden-import", "flask_cors",
     "--hidden-import", "socketio",
@@ -109,6 +112,9 @@ def build():
     if not check_requirements():
         sys.exit(1)
 
+    # Fingerprint and precompress the web controller
+    build_web.build()
+
     # Try to create icon if needed
     create_icns_from_png()
 
@@ -12,6 +12,8 @@ import sys
 import platform
 from pathlib import Path
 
+import build_web
+
 # Detect platform
 PLATFORM = platform.system().lower()
 IS_WINDOWS = PLATFORM == "windows"
@@ -47,7 +49,7 @@ a = Analysis(
     ['{MAIN_SCRIPT}'],
     pathex=[],
     binaries=[],
-    datas=[('assets', 'assets')],
+    datas=[('assets', 'assets'), ('src/web/dist', 'src/web/dist')],
     hiddenimports=[
         'flask',
         'flask_cors',
@@ -135,6 +137,9 @@ def generate_spec():
         if IS_MACOS:
             print("  To create .icns: sips -s format icns assets/favicon.png --out assets/favicon.icns")
 
+    # Fingerprint and precompress the web controller bundled into the spec
+    build_web.build()
+
     # Write spec file
     spec_file.write_text(SPEC_CONTENT)
     print(f"\n✓ Generated {spec_file}")
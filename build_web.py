@@ -0,0 +1,45 @@
+"""
+Build script for the bundled web controller.
+
+Fingerprints the client assets with content hashes and precompresses them
+(gzip, plus brotli when the 'brotli' package is installed) so the server can
+serve them straight from memory with long-lived cache headers.
+
+Usage:
+    python build_web.py
+"""
+
+import sys
+from pathlib import Path
+
+from src.config import WEB_CLIENT_SOURCE_DIR, WEB_CLIENT_DIST_DIR
+from src.web.assets import build_bundle, write_bundle, brotli
+
+
+def build():
+    """Build the web client bundle."""
+    print("=" * 60)
+    print(f"Building web client into {WEB_CLIENT_DIST_DIR}")
+    print("=" * 60)
+
+    if not Path(WEB_CLIENT_SOURCE_DIR).exists():
+        print(f"ERROR: {WEB_CLIENT_SOURCE_DIR} not found")
+        sys.exit(1)
+
+    if brotli is None:
+        print("WARNING: 'brotli' not installed, only gzip variants will be built")
+
+    bundle = build_bundle(WEB_CLIENT_SOURCE_DIR)
+    write_bundle(bundle, WEB_CLIENT_DIST_DIR)
+
+    for route, asset in sorted(bundle.items()):
+        sizes = [f"{len(asset.identity)} B"]
+        if asset.gzip is not None:
+            sizes.append(f"gzip {len(asset.gzip)} B")
+        if asset.br is not None:
+            sizes.append(f"br {len(asset.br)} B")
+        print(f"✓ /{route:<40} {', '.join(sizes)}")
+
+
+if __name__ == "__main__":
+    build()
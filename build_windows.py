@@ -12,6 +12,8 @@ import sys
 import subprocess
 from pathlib import Path
 
+import build_web
+
 # Build configuration
 APP_NAME = "PPTCommandExecutor"
 MAIN_SCRIPT = "main.py"
@@ -25,6 +27,7 @@ PYINSTALLER_ARGS = [
     "--windowed",  # No console window
     "--icon", ICON_FILE,
     "--add-data", "assets;assets",  # Include assets folder (Windows syntax)
+    "--add-data", "src/web/dist;src/web/dist",  # Built by build_web.py
     "--hidden-import", "flask",
     "--hidden-import", "flask_cors",
     "--hidden-import", "socketio",
@@ -84,6 +87,9 @@ def build():
     if not check_requirements():
         sys.exit(1)
 
+    # Fingerprint and precompress the web controller
+    build_web.build()
+
     # Run PyInstaller
     print("Running PyInstaller...\n")
     try:
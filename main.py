@@ -1,23 +1,98 @@
 """PPT Command Executor - Entry point for the application."""
 
-import customtkinter as ctk
+import argparse
+import atexit
 import logging
+import sys
+import time
 
-from src.config import LOG_FORMAT, LOG_DATE_FORMAT
-from src.app import App
+_STARTED = time.perf_counter()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format=LOG_FORMAT,
-    datefmt=LOG_DATE_FORMAT
-)
+from src import config
 
 logger = logging.getLogger(__name__)
 
 
-def main():
+def parse_args(argv=None):
+    """
+    Parse the command line.
+
+    Args:
+        argv (list): Arguments (default: sys.argv[1:])
+
+    Returns:
+        argparse.Namespace: Parsed arguments; 'overrides' maps setting names to raw values
+    """
+    parser = argparse.ArgumentParser(description=config.APP_NAME)
+    parser.add_argument("--profile", choices=sorted(config.PROFILES),
+                        help="performance profile applied before the settings file")
+    parser.add_argument("--config", help=f"settings file (default: {config.SETTINGS_FILE})")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="override a setting, e.g. --set LASER_RADIUS=16 (repeatable)")
+    parser.add_argument("--list-settings", action="store_true",
+                        help="print the effective settings and where they came from, then exit")
+    parser.add_argument("--trace-imports", metavar="FILE",
+                        help="on exit, write every imported module to FILE (input for build_fast.py)")
+    parser.add_argument("--startup-check", action="store_true",
+                        help="import the whole app, print the time taken and exit without opening a window")
+    args = parser.parse_args(argv)
+
+    args.overrides = {}
+    for item in args.set:
+        name, sep, value = item.partition("=")
+        if not sep:
+            parser.error(f"--set expects NAME=VALUE, got '{item}'")
+        args.overrides[name.strip()] = value.strip()
+    return args
+
+
+def _write_imports(path):
+    """Write the names of all imported modules, one per line."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(sorted(sys.modules)) + "\n")
+
+
+def main(argv=None):
     """Main entry point for the application."""
+    args = parse_args(argv)
+    if args.trace_imports:
+        atexit.register(_write_imports, args.trace_imports)
+
+    # Resolve settings before importing the app: modules bind config values at import time
+    try:
+        sources = config.load_settings(args.profile, args.config, args.overrides)
+    except ValueError as e:
+        print(f"Configuration error: {e}", file=sys.stderr)
+        return 2
+
+    if args.list_settings:
+        for name in config.TUNABLE_SETTINGS:
+            print(f"{name} = {getattr(config, name)!r}  ({sources.get(name, 'default')})")
+        return 0
+
+    import customtkinter as ctk
+    from src.logging_setup import setup_logging
+    from src.app import App
+
+    if args.startup_check:
+        if sys.stdout is not None:  # None in windowed builds
+            print(f"startup_ms={(time.perf_counter() - _STARTED) * 1000:.1f} modules={len(sys.modules)}")
+        return 0
+
+    # Configure logging (queued; formatting and I/O run on a background thread)
+    setup_logging(
+        level=config.LOG_LEVEL,
+        log_format=config.LOG_FORMAT,
+        date_format=config.LOG_DATE_FORMAT,
+        log_file=config.LOG_FILE,
+        max_bytes=config.LOG_MAX_BYTES,
+        backup_count=config.LOG_BACKUP_COUNT,
+        rate_limit_interval=config.LOG_RATE_LIMIT_INTERVAL,
+        rate_limit_burst=config.LOG_RATE_LIMIT_BURST
+    )
+    for name, source in sources.items():
+        logger.info("Setting %s = %r (from %s)", name, getattr(config, name), source)
+
     # Set appearance mode
     ctk.set_appearance_mode("dark")
 
@@ -26,7 +101,8 @@ def main():
     app = App()
     app.mainloop()
     logger.info("PPT Command Executor closed")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -4,11 +4,12 @@ import customtkinter as ctk
 import threading
 import logging
 import sys
+import time
 from PIL import Image, ImageTk
 
 from .config import (
     APP_NAME, WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_BG_COLOR,
-    FAVICON_PNG, FAVICON_ICO, ASSETS_DIR
+    FAVICON_PNG, FAVICON_ICO, ASSETS_DIR, DEFAULT_START_PORT, DEFAULT_MAX_PORT
 )
 from .platform import get_platform_handler
 from .network.utils import get_local_ip, check_network_connection, find_free_port
@@ -37,7 +38,7 @@ class App(ctk.CTk):
 
         # Initialize platform handler
         self.platform_handler = get_platform_handler()
-        logger.info(f"Running on platform: {self.platform_handler.get_platform_name()}")
+        logger.info("Running on platform: %s", self.platform_handler.get_platform_name())
 
         # Check admin privileges if required
         if self.platform_handler.requires_admin and not self.platform_handler.is_admin():
@@ -87,7 +88,7 @@ class App(ctk.CTk):
             self.iconphoto(True, icon_photo)
             logger.info("Window icon loaded successfully (PNG)")
         except Exception as e:
-            logger.warning(f"Failed to load PNG favicon: {e}")
+            logger.warning("Failed to load PNG favicon: %s", e)
 
     def show_screen(self, screen_name):
         """
@@ -100,14 +101,14 @@ class App(ctk.CTk):
         for screen in self.screens.values():
             screen.pack_forget()
         self.screens[screen_name].pack(fill="both", expand=True)
-        logger.info(f"Showing screen: {screen_name}")
+        logger.info("Showing screen: %s", screen_name)
 
     def _validate_assets(self):
         """Validate that required assets exist."""
         all_exist, missing = validate_asset_paths(ASSETS_DIR, FAVICON_PNG)
 
         if not all_exist:
-            logger.warning(f"Some assets are missing: {missing}")
+            logger.warning("Some assets are missing: %s", missing)
             logger.info("Application will continue with limited functionality")
 
     def start_server(self):
@@ -139,9 +140,9 @@ class App(ctk.CTk):
         try:
             # Find a free port
             try:
-                self.port = find_free_port()
+                self.port = find_free_port(DEFAULT_START_PORT, DEFAULT_MAX_PORT)
             except RuntimeError as e:
-                logger.error(f"Port exhaustion: {e}")
+                logger.error("Port exhaustion: %s", e)
                 self.status_var.set("Error: No available ports")
                 ErrorDialog.show(self, "Failed to find an available port. Please close some applications and try again.")
                 return
@@ -149,28 +150,28 @@ class App(ctk.CTk):
             # Create firewall rule
             success, error_msg = self.platform_handler.create_firewall_rule(self.port)
             if not success and self.platform_handler.requires_admin:
-                logger.error(f"Failed to create firewall rule: {error_msg}")
+                logger.error("Failed to create firewall rule: %s", error_msg)
                 self.status_var.set(f"Firewall error: {error_msg}")
                 return
 
             # Build server URL
             local_ip = get_local_ip()
-            self.url = f"{local_ip}:{self.port}"
-            logger.info(f"Server URL: {self.url}")
+            self.url = f"http://{local_ip}:{self.port}/"
+            logger.info("Server URL: %s", self.url)
 
             # Start the server
             self.server.start(self.port)
 
         except ValueError as e:
             # Invalid port
-            logger.error(f"Port validation error: {e}")
+            logger.error("Port validation error: %s", e)
             self.status_var.set(f"Configuration error: {e}")
         except RuntimeError as e:
             # Server already running or other runtime error
-            logger.error(f"Runtime error starting server: {e}")
+            logger.error("Runtime error starting server: %s", e)
             self.status_var.set(f"Error: {e}")
         except Exception as e:
-            logger.error(f"Unexpected error starting server: {e}", exc_info=True)
+            logger.error("Unexpected error starting server: %s", e, exc_info=True)
             self.status_var.set(f"Error: {e}")
         finally:
             self.server_starting = False
@@ -202,22 +203,40 @@ class App(ctk.CTk):
         """
         return self.server.is_client_connected()
 
+    def get_latency_percentiles(self):
+        """
+        Get command latency percentiles.
+
+        Returns:
+            tuple: (p50, p99) in milliseconds, None where unknown
+        """
+        return self.server.get_latency_percentiles()
+
+    def _remove_firewall_rule(self):
+        """Remove the firewall rule created at server start (called in a background thread)."""
+        logger.info("Removing firewall rule")
+        started = time.perf_counter()
+        try:
+            success, error_msg = self.platform_handler.remove_firewall_rule()
+            if success:
+                logger.info("Firewall rule removed in %.0f ms", (time.perf_counter() - started) * 1000)
+            else:
+                logger.warning("Failed to remove firewall rule: %s", error_msg)
+        except Exception as e:
+            logger.error("Error removing firewall rule: %s", e)
+
     def destroy(self):
         """Clean up and close the application."""
         logger.info("Initiating application shutdown")
+        started = time.perf_counter()
+
+        # netsh/iptables/ufw run as separate processes. The window does not wait for them;
+        # the thread is not a daemon, so the process still removes the rule before it exits.
+        threading.Thread(target=self._remove_firewall_rule, name="firewall-cleanup").start()
 
         # Stop the server
         if self.server:
             self.server.stop()
 
-        # Remove firewall rule
-        logger.info("Removing firewall rule")
-        try:
-            success, error_msg = self.platform_handler.remove_firewall_rule()
-            if not success:
-                logger.warning(f"Failed to remove firewall rule: {error_msg}")
-        except Exception as e:
-            logger.error(f"Error removing firewall rule: {e}")
-
-        logger.info("Application shutdown complete")
+        logger.info("Application shutdown complete in %.0f ms", (time.perf_counter() - started) * 1000)
         super().destroy()
@@ -1,5 +1,6 @@
 """Configuration constants for the PPT Command Executor."""
 
+import json
 import os
 from pathlib import Path
 
@@ -19,6 +20,108 @@ BANNER_IMAGE = ASSETS_DIR / "banner_image.png"
 # Server configuration
 DEFAULT_START_PORT = 5000
 DEFAULT_MAX_PORT = 5100
+PROTOCOL_VERSION = 1  # advertised to clients; bump on incompatible event changes
+FIREWALL_RULE_TAG = "ppt-command-executor"  # comment marking the Linux firewall rules this app owns
+COMMAND_KEY_PAUSE = 0.5  # seconds pyautogui pauses after each keystroke
+
+# DNS-SD (mDNS) advertisement; needs the optional zeroconf package
+DISCOVERY_ENABLED = True
+DISCOVERY_SERVICE_TYPE = "_pptcontrol._tcp.local."
+
+# LibreOffice Impress UNO backend (soffice --accept="socket,host=localhost,port=2002;urp;")
+IMPRESS_UNO_ENABLED = True
+IMPRESS_UNO_HOST = "localhost"
+IMPRESS_UNO_PORT = 2002
+IMPRESS_RECONNECT_INTERVAL = 5.0  # seconds between failed connection attempts
+
+# Slide thumbnails
+THUMBNAIL_CACHE_DIR = Path(
+    os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+) / "ppt-command-executor" / "thumbnails"
+THUMBNAIL_CACHE_MAX_BYTES = 256 * 1024 * 1024
+THUMBNAIL_SIZES = {"small": 320, "medium": 640, "large": 1280}  # max width in pixels
+THUMBNAIL_FORMATS = ("webp", "jpeg")
+THUMBNAIL_MAX_AGE = 31536000  # seconds; URLs are content-addressed so responses never change
+
+# Command latency tracing
+TRACE_BUFFER_SIZE = 1024  # most recent commands kept for /debug/traces
+
+# Per-client rate limits: event -> (sustained events per second, burst).
+# Excess laser moves are coalesced to the latest position, excess commands are
+# rejected, other excess events are dropped. Unlisted events are not limited.
+RATE_LIMITS = {
+    "command": (10.0, 20),
+    "laser_pointer_move": (120.0, 30),
+    "laser_pointer_toggle": (5.0, 10),
+    "open_presentation": (1.0, 3),
+    "mirror_subscribe": (2.0, 5),
+    "mirror_unsubscribe": (2.0, 5),
+    "mirror_ack": (60.0, 60),
+    "ink_stroke": (60.0, 60),
+    "ink_undo": (5.0, 10),
+    "ink_clear": (5.0, 10),
+    "time_sync": (5.0, 10),
+    "timer_control": (5.0, 10),
+    "state_resync": (2.0, 5),
+}
+
+# Hub blocking monitor: report any call that keeps the server's event loop
+# busy for longer than this many seconds, with its stack (0 disables it)
+HUB_MONITOR_THRESHOLD = 0.0
+
+# Shutdown
+SHUTDOWN_ACK_TIMEOUT = 0.15  # seconds to wait for the controller to acknowledge server_shutdown
+SHUTDOWN_TIMEOUT = 1.0  # seconds after which shutdown steps still running are abandoned
+
+# Presentation state sync
+STATE_COALESCE_WINDOW = 0.05  # seconds changes are merged into one delta
+STATE_HISTORY = 64  # deltas kept for resyncing clients; older gaps get a full snapshot
+
+# Ink annotations
+INK_COLOR = "#ffeb3b"
+INK_WIDTH = 4  # pixels
+INK_MAX_WIDTH = 32
+INK_SIMPLIFY_TOLERANCE = 0.001  # fraction of the screen size (about 2 px at 1920 wide)
+INK_MAX_BATCH_POINTS = 512  # points per ink_stroke event
+INK_MAX_POINTS_PER_SLIDE = 20000  # older strokes are dropped beyond this
+INK_MAX_POINTS_PER_STROKE = 2000  # longer strokes continue in a new segment
+INK_MAX_SLIDES = 50  # slides whose ink is kept
+INK_MAX_PENDING_OPS = 1024  # queued ink ops beyond which new stroke batches are dropped (undo/clear never are)
+
+# Resumable controller sessions
+SESSION_TTL = 30.0  # seconds a disconnected controller can resume its session
+SESSION_MAX = 16  # sessions kept in memory
+
+# Liveness checks. Engine.IO pings every client at a fixed rate; the app-level
+# heartbeat only pings a quiet controller, quickly during a talk and rarely when idle.
+ENGINEIO_PING_INTERVAL = 25  # seconds
+ENGINEIO_PING_TIMEOUT = 10  # seconds
+HEARTBEAT_ACTIVE_INTERVAL = 2.0  # silence before a heartbeat while commands/laser moves arrive
+HEARTBEAT_IDLE_INTERVAL = 15.0  # silence before a heartbeat while idle
+HEARTBEAT_IDLE_AFTER = 60.0  # seconds without commands/laser moves before the client is idle
+HEARTBEAT_TIMEOUT = 3.0  # seconds to answer a heartbeat before the controller slot is released
+
+# Session recording (opt-in; replay with python -m benchmarks.replay FILE)
+EVENT_RECORDING_FILE = os.environ.get("PPT_RECORD_EVENTS") or None
+EVENT_RECORDING_BUFFER = 64 * 1024  # bytes buffered before writing to disk
+
+# Speaker notes
+NOTES_MAX_CHARS = 4000  # per slide; longer notes are truncated
+NOTES_CACHE_DECKS = 4  # parsed decks kept in memory
+
+# Bundled web controller (build with build_web.py)
+WEB_CLIENT_SOURCE_DIR = ROOT_DIR / "src" / "web" / "client"
+WEB_CLIENT_DIST_DIR = ROOT_DIR / "src" / "web" / "dist"
+WEB_ASSET_MAX_AGE = 31536000  # seconds; fingerprinted names change with content
+
+# Screen mirroring
+MIRROR_TILE_SIZE = 64  # pixels, after scaling
+MIRROR_SCALE = 0.5
+MIRROR_FORMAT = "jpeg"
+MIRROR_QUALITY = 60
+MIRROR_MIN_INTERVAL = 0.05  # seconds; caps the frame rate at 20 fps
+MIRROR_MAX_INTERVAL = 1.0
+MIRROR_IDLE_INTERVAL = 1.0  # capture interval while the screen is static
 
 # GUI configuration
 WINDOW_WIDTH = 500
@@ -28,6 +131,10 @@ BUTTON_COLOR = "#61AFEF"
 CONNECTED_COLOR = "#44FF00"
 DISCONNECTED_COLOR = "white"
 
+# Laser pointer overlay
+LASER_FRAME_INTERVAL = 16  # milliseconds between overlay redraws
+LASER_RADIUS = 10  # pixels
+
 # QR Code configuration
 QR_CODE_SIZE = 200
 QR_CODE_BOX_SIZE = 8
@@ -36,6 +143,200 @@ QR_CODE_BORDER = 2
 # Logging configuration
 LOG_FORMAT = '%(asctime)s [%(levelname)s] %(message)s'
 LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+LOG_LEVEL = "INFO"
+LOG_FILE = Path(
+    os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+) / "ppt-command-executor" / "ppt-command-executor.log"
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+LOG_RATE_LIMIT_INTERVAL = 10.0  # seconds
+LOG_RATE_LIMIT_BURST = 5  # records per message template and interval
 
 # Status update interval (milliseconds)
 STATUS_UPDATE_INTERVAL = 1000
+
+# Macro commands: name -> steps, run as one command. Steps are keys ("right"),
+# key combinations ("alt+p"), {"wait": seconds} and {"type": "text"}. Usually
+# defined under "macros" in the settings file, e.g.
+#   "macros": {"BLACKOUT_NEXT": ["b", {"wait": 2.0}, "b", "right"]}
+MACROS = {}
+MACRO_MAX_STEPS = 64  # keystrokes per macro
+MACRO_MAX_DURATION = 30.0  # seconds of waits per macro
+
+# Layered settings. The values above are the defaults; each tunable setting can
+# be overridden, in increasing order of precedence, by a named profile, the
+# user settings file, PPT_<NAME> environment variables and --set NAME=VALUE.
+SETTINGS_FILE = Path(
+    os.environ.get("APPDATA") or os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+) / "ppt-command-executor" / "settings.json"
+
+TUNABLE_SETTINGS = {
+    "DEFAULT_START_PORT": int,
+    "DEFAULT_MAX_PORT": int,
+    "COMMAND_KEY_PAUSE": float,
+    "DISCOVERY_ENABLED": bool,
+    "IMPRESS_UNO_ENABLED": bool,
+    "IMPRESS_UNO_PORT": int,
+    "ENGINEIO_PING_INTERVAL": float,
+    "ENGINEIO_PING_TIMEOUT": float,
+    "HEARTBEAT_ACTIVE_INTERVAL": float,
+    "HEARTBEAT_IDLE_INTERVAL": float,
+    "HEARTBEAT_IDLE_AFTER": float,
+    "HEARTBEAT_TIMEOUT": float,
+    "SESSION_TTL": float,
+    "MIRROR_SCALE": float,
+    "MIRROR_QUALITY": int,
+    "MIRROR_MIN_INTERVAL": float,
+    "MIRROR_IDLE_INTERVAL": float,
+    "INK_WIDTH": int,
+    "INK_SIMPLIFY_TOLERANCE": float,
+    "THUMBNAIL_CACHE_MAX_BYTES": int,
+    "LASER_FRAME_INTERVAL": int,
+    "LASER_RADIUS": int,
+    "STATUS_UPDATE_INTERVAL": int,
+    "LOG_LEVEL": str,
+    "HUB_MONITOR_THRESHOLD": float,
+    "SHUTDOWN_ACK_TIMEOUT": float,
+    "SHUTDOWN_TIMEOUT": float,
+}
+
+PROFILES = {
+    # Snappiest response: no pause after keystrokes, 120 Hz overlay, fast liveness checks
+    "low-latency": {
+        "COMMAND_KEY_PAUSE": 0.05,
+        "LASER_FRAME_INTERVAL": 8,
+        "HEARTBEAT_ACTIVE_INTERVAL": 1.0,
+        "HEARTBEAT_TIMEOUT": 2.0,
+        "MIRROR_MIN_INTERVAL": 0.033,
+        "STATUS_UPDATE_INTERVAL": 500,
+    },
+    # Fewer wakeups on the laptop and the phone
+    "battery-saver": {
+        "LASER_FRAME_INTERVAL": 33,
+        "ENGINEIO_PING_INTERVAL": 45,
+        "HEARTBEAT_ACTIVE_INTERVAL": 5.0,
+        "HEARTBEAT_IDLE_INTERVAL": 30.0,
+        "MIRROR_SCALE": 0.35,
+        "MIRROR_MIN_INTERVAL": 0.2,
+        "MIRROR_IDLE_INTERVAL": 3.0,
+        "STATUS_UPDATE_INTERVAL": 2000,
+    },
+    # Big rooms: visible pointer and ink, tolerant of congested Wi-Fi
+    "large-audience": {
+        "LASER_RADIUS": 20,
+        "INK_WIDTH": 8,
+        "ENGINEIO_PING_TIMEOUT": 20,
+        "HEARTBEAT_TIMEOUT": 6.0,
+        "SESSION_TTL": 120.0,
+        "LOG_LEVEL": "WARNING",
+    },
+}
+
+ENV_PREFIX = "PPT_"
+
+
+def _coerce(name, value):
+    """Convert a raw setting value (from JSON, the environment or the CLI) to its declared type."""
+    kind = TUNABLE_SETTINGS[name]
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        if str(value).strip().lower() in ("1", "true", "yes", "on"):
+            return True
+        if str(value).strip().lower() in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"{name}: expected a boolean, got {value!r}")
+    if kind is int and isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"{name}: expected an integer, got {value!r}")
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name}: expected {kind.__name__}, got {value!r}") from None
+
+
+def _read_settings_file(path):
+    """Read the user settings file; returns {} if it does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Cannot read settings file {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Settings file {path} must contain a JSON object")
+    return data
+
+
+def load_settings(profile=None, settings_file=None, cli_overrides=None, environ=None, read_file=True):
+    """
+    Resolve the layered settings and apply them to this module.
+
+    Must run before other modules import values from here, since they bind
+    them at import time.
+
+    Args:
+        profile (str): Profile name from the command line; overrides PPT_PROFILE
+            and the settings file's "profile" key
+        settings_file (Path): Settings file (default: SETTINGS_FILE)
+        cli_overrides (dict): Setting name -> raw value from the command line
+        environ (dict): Environment (default: os.environ)
+        read_file (bool): Whether to read the settings file at all
+
+    Returns:
+        dict: Setting name -> source ('profile:<name>', 'file', 'env' or 'cli') of every overridden setting
+
+    Raises:
+        ValueError: If a layer names an unknown setting or profile, or the result fails validation
+    """
+    from .utils import validate_config
+    from .server.command_handler import BUILTIN_COMMANDS
+    from .server.macros import MacroError, compile_macros
+
+    environ = os.environ if environ is None else environ
+    file_settings = _read_settings_file(settings_file or SETTINGS_FILE) if read_file else {}
+    file_profile = file_settings.pop("profile", None)
+    macros = file_settings.pop("macros", None)
+
+    env_settings = {
+        key[len(ENV_PREFIX):]: value for key, value in environ.items()
+        if key.startswith(ENV_PREFIX) and key[len(ENV_PREFIX):] in TUNABLE_SETTINGS
+    }
+
+    profile = profile or environ.get(ENV_PREFIX + "PROFILE") or file_profile
+    if profile is not None and profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}' (choose from {', '.join(PROFILES)})")
+
+    layers = (
+        (f"profile:{profile}", PROFILES.get(profile, {})),
+        ("file", file_settings),
+        ("env", env_settings),
+        ("cli", cli_overrides or {}),
+    )
+
+    overrides = {}
+    sources = {}
+    for source, values in layers:
+        for name, value in values.items():
+            name = name.upper()
+            if name not in TUNABLE_SETTINGS:
+                raise ValueError(f"Unknown setting '{name}' ({source})")
+            overrides[name] = _coerce(name, value)
+            sources[name] = source
+
+    effective = {name: globals()[name] for name in TUNABLE_SETTINGS}
+    effective.update(overrides)
+    is_valid, errors = validate_config(effective)
+    if not is_valid:
+        raise ValueError("; ".join(errors))
+
+    if macros is not None:
+        try:
+            compile_macros(macros, BUILTIN_COMMANDS, MACRO_MAX_STEPS, MACRO_MAX_DURATION)
+        except MacroError as e:
+            raise ValueError(str(e)) from e
+        overrides["MACROS"] = macros
+        sources["MACROS"] = "file"
+
+    globals().update(overrides)
+    return sources
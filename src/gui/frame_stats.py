@@ -0,0 +1,141 @@
+"""Frame pacing statistics for the laser pointer overlay."""
+
+from collections import deque
+
+# Upper bounds of the frame time histogram buckets in milliseconds
+FRAME_BUCKETS_MS = (8.0, 12.0, 16.7, 20.0, 25.0, 33.3, 50.0, 100.0, float("inf"))
+
+
+def _summary(samples):
+    """
+    Summarize durations in seconds as milliseconds.
+
+    Returns:
+        dict: count, and mean, p50, p90, p99 and max if there are samples
+    """
+    values = sorted(samples)
+    summary = {"count": len(values)}
+    if not values:
+        return summary
+    summary["mean"] = sum(values) / len(values) * 1000.0
+    for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        summary[name] = values[min(len(values) - 1, int(q * len(values)))] * 1000.0
+    summary["max"] = values[-1] * 1000.0
+    return summary
+
+
+class FrameStats:
+    """
+    Frame times, position latency and dropped frames of the overlay's animation loop.
+
+    Positions are reported from the server thread and frames from the Tk
+    thread; each side only does a counter increment and a deque append.
+    A frame counts as:
+    - missed for every whole frame interval it came late,
+    - duplicate if no new position arrived since the previous frame.
+    A position is superseded if a newer one arrived before it was drawn.
+    """
+
+    def __init__(self, frame_interval, history=3600):
+        """
+        Initialize the statistics.
+
+        Args:
+            frame_interval (float): Target seconds between frames
+            history (int): Samples kept per series (3600 is one minute at 60 fps)
+        """
+        self.frame_interval = frame_interval
+        self.frame_times = deque(maxlen=history)  # Seconds between consecutive frames
+        self.latencies = deque(maxlen=history)  # Seconds from position received to drawn
+        self.draw_times = deque(maxlen=history)  # Seconds spent updating the canvas per frame
+        self.reset()
+
+    def reset(self):
+        """Clear all counters and samples."""
+        self.frames = 0
+        self.missed = 0
+        self.duplicate = 0
+        self.positions = 0
+        self.superseded = 0
+        self.frame_times.clear()
+        self.latencies.clear()
+        self.draw_times.clear()
+        self.pause()
+
+    def pause(self):
+        """Forget the last frame, so the gap while the overlay is hidden is not counted as missed."""
+        self._last_frame = None
+        self._pending = None  # perf_counter() when the newest undrawn position arrived
+
+    def position_received(self, now):
+        """
+        Record a new laser position.
+
+        Args:
+            now (float): time.perf_counter() at arrival
+        """
+        self.positions += 1
+        if self._pending is not None:
+            self.superseded += 1
+        self._pending = now
+
+    def frame_drawn(self, started, finished):
+        """
+        Record a frame.
+
+        Args:
+            started (float): time.perf_counter() when the frame began
+            finished (float): time.perf_counter() when the canvas was updated
+        """
+        self.frames += 1
+        if self._last_frame is not None:
+            interval = started - self._last_frame
+            self.frame_times.append(interval)
+            self.missed += max(0, int(interval / self.frame_interval + 0.5) - 1)
+        self._last_frame = started
+
+        pending, self._pending = self._pending, None
+        if pending is None:
+            self.duplicate += 1
+        else:
+            self.latencies.append(finished - pending)
+        self.draw_times.append(finished - started)
+
+    def histogram(self):
+        """
+        Bucket the recorded frame times.
+
+        Returns:
+            dict: Upper bound in ms ('+Inf' for the last bucket) -> frames
+        """
+        counts = [0] * len(FRAME_BUCKETS_MS)
+        for interval in self.frame_times:
+            milliseconds = interval * 1000.0
+            for index, bound in enumerate(FRAME_BUCKETS_MS):
+                if milliseconds <= bound:
+                    counts[index] += 1
+                    break
+        return {
+            "+Inf" if bound == float("inf") else f"{bound:g}": count
+            for bound, count in zip(FRAME_BUCKETS_MS, counts)
+        }
+
+    def snapshot(self):
+        """
+        Get the statistics.
+
+        Returns:
+            dict: frames, missed, duplicate, positions and superseded counts; frame_ms,
+                latency_ms and draw_ms summaries; and the frame time histogram
+        """
+        return {
+            "frames": self.frames,
+            "missed": self.missed,
+            "duplicate": self.duplicate,
+            "positions": self.positions,
+            "superseded": self.superseded,
+            "frame_ms": _summary(self.frame_times),
+            "latency_ms": _summary(self.latencies),
+            "draw_ms": _summary(self.draw_times),
+            "histogram": self.histogram(),
+        }
@@ -0,0 +1,208 @@
+"""Freehand ink annotations: stroke simplification and a per-slide bitmap layer."""
+
+from array import array
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw
+
+
+def simplify(points, tolerance):
+    """
+    Simplify a polyline with the Douglas-Peucker algorithm.
+
+    Args:
+        points (list): Flat coordinates [x0, y0, x1, y1, ...]
+        tolerance (float): Maximum distance of a dropped point from the simplified line
+
+    Returns:
+        list: Flat coordinates of the kept points; the endpoints are always kept
+    """
+    count = len(points) // 2
+    if count <= 2:
+        return list(points[:count * 2])
+
+    keep = bytearray(count)
+    keep[0] = keep[-1] = 1
+    tolerance_squared = tolerance * tolerance
+    stack = [(0, count - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        x1, y1 = points[2 * first], points[2 * first + 1]
+        dx, dy = points[2 * last] - x1, points[2 * last + 1] - y1
+        length_squared = dx * dx + dy * dy
+
+        farthest, farthest_distance = None, tolerance_squared
+        for i in range(first + 1, last):
+            px, py = points[2 * i] - x1, points[2 * i + 1] - y1
+            if length_squared:
+                cross = px * dy - py * dx
+                distance = cross * cross / length_squared
+            else:
+                distance = px * px + py * py
+            if distance > farthest_distance:
+                farthest, farthest_distance = i, distance
+
+        if farthest is not None:
+            keep[farthest] = 1
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+
+    simplified = []
+    for i in range(count):
+        if keep[i]:
+            simplified.append(points[2 * i])
+            simplified.append(points[2 * i + 1])
+    return simplified
+
+
+class Stroke:
+    """One ink stroke in normalized (0.0-1.0) screen coordinates."""
+
+    __slots__ = ("id", "color", "width", "points")
+
+    def __init__(self, stroke_id, color, width):
+        self.id = stroke_id
+        self.color = color
+        self.width = width
+        self.points = array("f")
+
+
+class InkLayer:
+    """
+    Ink of every slide, rendered into a single RGBA bitmap for the current slide.
+
+    New points are drawn onto the bitmap incrementally, so the cost of a
+    batch depends only on its own size. The full bitmap is redrawn only on
+    undo, on a slide change, or when a slide exceeds its point budget and
+    its oldest strokes are dropped. A long stroke is split into segments of
+    at most max_points_per_stroke points, so even a single endless scribble
+    drops old segments (and redraws) only once per segment, not per batch.
+    Not thread-safe: use it from the Tk thread only.
+    """
+
+    def __init__(self, max_points_per_slide=20000, max_slides=50, max_points_per_stroke=2000):
+        """
+        Initialize the layer.
+
+        Args:
+            max_points_per_slide (int): Points kept per slide; older strokes are dropped beyond it
+            max_slides (int): Slides whose ink is kept; least recently drawn are dropped beyond it
+            max_points_per_stroke (int): Points per stroke segment; longer strokes continue in a new one
+        """
+        self.max_points_per_slide = max_points_per_slide
+        self.max_points_per_stroke = max(2, min(max_points_per_stroke, max_points_per_slide))
+        self.max_slides = max_slides
+        self.slide = None
+        self.image = None
+        self.version = 0  # Incremented whenever the bitmap changes
+
+        self._slides = OrderedDict()  # slide -> list of Stroke
+        self._point_counts = {}  # slide -> number of points
+        self._size = None
+        self._draw = None
+
+    def resize(self, width, height):
+        """Allocate the bitmap for a screen size and render the current slide into it."""
+        self._size = (width, height)
+        self._redraw()
+
+    def release(self):
+        """Free the bitmap (the strokes are kept)."""
+        self.image = None
+        self._draw = None
+
+    def show(self, slide):
+        """Switch the bitmap to a slide's ink."""
+        if slide != self.slide:
+            self.slide = slide
+            self._redraw()
+
+    def stroke(self, slide, stroke_id, points, color, width):
+        """
+        Add points to a stroke, continuing the slide's last stroke if the id matches.
+
+        Args:
+            slide: Slide the ink belongs to
+            stroke_id: Client stroke id; batches of the same stroke share it
+            points (list): Flat normalized coordinates
+            color (str): Ink color, e.g. '#ffeb3b'
+            width (int): Line width in pixels
+        """
+        if not points:
+            return
+        self.show(slide)
+
+        strokes = self._slides.get(slide)
+        if strokes is None:
+            strokes = self._slides[slide] = []
+            while len(self._slides) > self.max_slides:
+                evicted, _ = self._slides.popitem(last=False)
+                self._point_counts.pop(evicted, None)
+        self._slides.move_to_end(slide)
+
+        last = strokes[-1] if strokes else None
+        if last is not None and stroke_id is not None and last.id == stroke_id:
+            stroke = last
+            start = max(0, len(stroke.points) - 2)  # Join to the previous batch's last point
+            if (len(stroke.points) + len(points)) // 2 > self.max_points_per_stroke:
+                # Close the segment and continue the stroke in a new one from its last point
+                stroke = Stroke(stroke_id, last.color, last.width)
+                stroke.points.extend(last.points[-2:])
+                strokes.append(stroke)
+                self._point_counts[slide] = self._point_counts.get(slide, 0) + 1
+                start = 0
+        else:
+            stroke = Stroke(stroke_id, color, width)
+            strokes.append(stroke)
+            start = 0
+        stroke.points.extend(points)
+        self._point_counts[slide] = self._point_counts.get(slide, 0) + len(points) // 2
+
+        if self._point_counts[slide] > self.max_points_per_slide:
+            while len(strokes) > 1 and self._point_counts[slide] > self.max_points_per_slide:
+                self._point_counts[slide] -= len(strokes.pop(0).points) // 2
+            self._redraw()
+        else:
+            self._render(stroke, start)
+
+    def undo(self, slide):
+        """Remove the last stroke of a slide."""
+        strokes = self._slides.get(slide)
+        if not strokes:
+            return
+        self._point_counts[slide] -= len(strokes.pop().points) // 2
+        if slide == self.slide:
+            self._redraw()
+
+    def clear(self, slide):
+        """Remove all ink of a slide."""
+        self._slides.pop(slide, None)
+        self._point_counts.pop(slide, None)
+        if slide == self.slide:
+            self._redraw()
+
+    def _render(self, stroke, start):
+        """Draw a stroke's points from a flat index onward."""
+        if self._draw is None:
+            return
+        width, height = self._size
+        points = stroke.points
+        xy = [(points[i] * width, points[i + 1] * height) for i in range(start, len(points) - 1, 2)]
+        if len(xy) == 1:
+            x, y = xy[0]
+            r = stroke.width / 2
+            self._draw.ellipse((x - r, y - r, x + r, y + r), fill=stroke.color)
+        else:
+            self._draw.line(xy, fill=stroke.color, width=stroke.width, joint="curve")
+        self.version += 1
+
+    def _redraw(self):
+        """Render the current slide's ink from scratch."""
+        if self._size is None:
+            return
+        self.image = Image.new("RGBA", self._size, (0, 0, 0, 0))
+        self._draw = ImageDraw.Draw(self.image)
+        for stroke in self._slides.get(self.slide, ()):
+            self._render(stroke, 0)
+        self.version += 1
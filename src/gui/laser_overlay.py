@@ -4,6 +4,16 @@ import tkinter as tk
 import time
 import platform
 import logging
+from collections import deque
+
+from PIL import ImageTk
+
+from .frame_stats import FrameStats
+from .ink import InkLayer
+from ..config import (
+    INK_MAX_POINTS_PER_SLIDE, INK_MAX_POINTS_PER_STROKE, INK_MAX_SLIDES, INK_MAX_PENDING_OPS,
+    LASER_FRAME_INTERVAL, LASER_RADIUS
+)
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +29,18 @@ class LaserPointerOverlay:
         self.dot = None
         self.current_x = 100
         self.current_y = 100
-        self.last_update_time = time.time()
+        self.last_update_time = time.perf_counter()
+        self.frame_stats = FrameStats(LASER_FRAME_INTERVAL / 1000)
+
+        # Ink annotations: ops are queued from the server thread and applied in _animate
+        self.ink = InkLayer(INK_MAX_POINTS_PER_SLIDE, INK_MAX_SLIDES, INK_MAX_POINTS_PER_STROKE)
+        # Unbounded so undo/clear/show are never lost; stroke batches are dropped instead once full
+        self._ink_ops = deque()
+        self.ink_batches_dropped = 0  # Stroke batches dropped because the queue was full
+        self._ink_dropping = False
+        self._ink_item = None
+        self._ink_photo = None
+        self._ink_version = None
 
     def enable(self):
         """Create and show overlay window."""
@@ -46,8 +67,13 @@ class LaserPointerOverlay:
             )
             self.canvas.pack(fill=tk.BOTH, expand=True)
 
-            # Create laser dot (red circle, 20px diameter)
-            radius = 10
+            # Ink bitmap below the laser dot
+            self.ink.resize(screen_width, screen_height)
+            self._ink_item = self.canvas.create_image(0, 0, anchor=tk.NW)
+            self._ink_version = None
+
+            # Create laser dot (red circle)
+            radius = LASER_RADIUS
             self.dot = self.canvas.create_oval(
                 self.current_x - radius,
                 self.current_y - radius,
@@ -61,10 +87,11 @@ class LaserPointerOverlay:
                 self._setup_windows_clickthrough()
 
             self.enabled = True
+            self.frame_stats.pause()
             self._animate()
             logger.info("Laser pointer overlay enabled")
         except Exception as e:
-            logger.error(f"Failed to enable laser pointer overlay: {e}")
+            logger.error("Failed to enable laser pointer overlay: %s", e)
             if self.root:
                 self.root.destroy()
                 self.root = None
@@ -79,11 +106,15 @@ class LaserPointerOverlay:
             self.root.destroy()
             self.root = None
             self.canvas = None
+            self._log_frame_stats()
             self.dot = None
+            self._ink_item = None
+            self._ink_photo = None
+            self.ink.release()
             self.enabled = False
             logger.info("Laser pointer overlay disabled")
         except Exception as e:
-            logger.error(f"Error disabling laser pointer overlay: {e}")
+            logger.error("Error disabling laser pointer overlay: %s", e)
 
     def update_position(self, x, y):
         """
@@ -104,8 +135,60 @@ class LaserPointerOverlay:
             # Convert normalized coordinates to pixel coordinates
             self.current_x = x * screen_width
             self.current_y = y * screen_height
+            self.frame_stats.position_received(time.perf_counter())
         except Exception as e:
-            logger.error(f"Error updating laser pointer position: {e}")
+            logger.error("Error updating laser pointer position: %s", e)
+
+    def ink_stroke(self, slide, stroke_id, points, color, width):
+        """
+        Queue (already simplified) stroke points for drawing.
+
+        Args:
+            slide: Slide the ink belongs to
+            stroke_id: Client stroke id shared by all batches of a stroke
+            points (list): Flat normalized coordinates [x0, y0, x1, y1, ...]
+            color (str): Ink color
+            width (int): Line width in pixels
+
+        Returns:
+            bool: False if the overlay is not shown or too far behind to queue the batch
+        """
+        if not self.enabled:
+            return False
+        if len(self._ink_ops) >= INK_MAX_PENDING_OPS:
+            self.ink_batches_dropped += 1
+            if not self._ink_dropping:
+                self._ink_dropping = True
+                logger.warning("Ink queue full (%s ops); dropping stroke batches", INK_MAX_PENDING_OPS)
+            return False
+        self._ink_ops.append(("stroke", (slide, stroke_id, points, color, width)))
+        return True
+
+    def ink_undo(self, slide):
+        """Queue removal of a slide's last stroke."""
+        self._ink_ops.append(("undo", (slide,)))
+
+    def ink_clear(self, slide):
+        """Queue removal of all ink on a slide."""
+        self._ink_ops.append(("clear", (slide,)))
+
+    def ink_show(self, slide):
+        """Queue a switch to a slide's ink, e.g. after navigation."""
+        self._ink_ops.append(("show", (slide,)))
+
+    def _apply_ink(self):
+        """Apply queued ink ops and push the bitmap to the canvas if it changed."""
+        ops = self._ink_ops
+        while ops:
+            op, args = ops.popleft()
+            getattr(self.ink, op)(*args)
+        self._ink_dropping = False
+
+        if self.ink.image is not None and self.ink.version != self._ink_version:
+            # At most one bitmap upload per frame, regardless of how much was drawn
+            self._ink_photo = ImageTk.PhotoImage(self.ink.image)
+            self.canvas.itemconfigure(self._ink_item, image=self._ink_photo)
+            self._ink_version = self.ink.version
 
     def _animate(self):
         """Animation loop for smooth rendering at 60 FPS."""
@@ -113,13 +196,13 @@ class LaserPointerOverlay:
             return
 
         try:
-            current_time = time.time()
+            current_time = time.perf_counter()
             elapsed = current_time - self.last_update_time
 
-            # Target 60 FPS (16.67ms per frame)
-            if elapsed >= 0.016:
+            # Redraw at most once per frame interval (16 ms = 60 FPS by default)
+            if elapsed >= LASER_FRAME_INTERVAL / 1000:
                 # Update dot position on canvas
-                radius = 10
+                radius = LASER_RADIUS
                 self.canvas.coords(
                     self.dot,
                     self.current_x - radius,
@@ -127,13 +210,27 @@ class LaserPointerOverlay:
                     self.current_x + radius,
                     self.current_y + radius
                 )
+                self._apply_ink()
                 self.last_update_time = current_time
+                self.frame_stats.frame_drawn(current_time, time.perf_counter())
 
             # Schedule next frame
             if self.root:
-                self.root.after(16, self._animate)
+                self.root.after(LASER_FRAME_INTERVAL, self._animate)
         except Exception as e:
-            logger.error(f"Error in laser pointer animation loop: {e}")
+            logger.error("Error in laser pointer animation loop: %s", e)
+
+    def _log_frame_stats(self):
+        """Log a summary of the frame pacing since the overlay was created."""
+        stats = self.frame_stats.snapshot()
+        if not stats["frame_ms"]["count"]:
+            return
+        logger.info(
+            "Laser overlay: %d frames (p50 %.1f ms, p99 %.1f ms), %d missed, %d duplicate, "
+            "position latency p99 %.1f ms",
+            stats["frames"], stats["frame_ms"]["p50"], stats["frame_ms"]["p99"], stats["missed"],
+            stats["duplicate"], stats["latency_ms"].get("p99", 0.0)
+        )
 
     def _setup_windows_clickthrough(self):
         """Windows-specific: Make window click-through using Win32 API."""
@@ -162,4 +259,4 @@ class LaserPointerOverlay:
             )
             logger.debug("Windows click-through enabled for laser pointer overlay")
         except Exception as e:
-            logger.warning(f"Could not enable Windows click-through: {e}")
+            logger.warning("Could not enable Windows click-through: %s", e)
@@ -168,6 +168,15 @@ class SecondScreen(ctk.CTkFrame):
         )
         self.url_label.pack(padx=20, pady=10)
 
+        # Command latency panel
+        self.latency_label = ctk.CTkLabel(
+            self.center_frame,
+            text="",
+            text_color="white",
+            font=("Arial", 12)
+        )
+        self.latency_label.pack(pady=10)
+
         # Start status update loop
         self.after(STATUS_UPDATE_INTERVAL, self.update_status)
 
@@ -188,4 +197,9 @@ class SecondScreen(ctk.CTkFrame):
         if url:
             self.qr_widget.update_qr_code(url)
 
+        # Update command latency
+        p50, p99 = self.controller.get_latency_percentiles()
+        if p50 is not None:
+            self.latency_label.configure(text=f"Command latency  p50 {p50:.1f} ms  ·  p99 {p99:.1f} ms")
+
         self.after(STATUS_UPDATE_INTERVAL, self.update_status)
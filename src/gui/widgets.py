@@ -73,7 +73,7 @@ class QRCodeWidget(ctk.CTkFrame):
                         outline=""
                     )
         except Exception as e:
-            logger.error(f"Error generating QR code: {e}")
+            logger.error("Error generating QR code: %s", e)
 
 
 class ErrorDialog:
@@ -150,7 +150,7 @@ class ImageWidget(ctk.CTkLabel):
             )
             super().__init__(parent, image=image, text="", **kwargs)
         except Exception as e:
-            logger.error(f"Failed to load image from {image_path}: {e}")
+            logger.error("Failed to load image from %s: %s", image_path, e)
             # Create label with error message instead
             super().__init__(
                 parent,
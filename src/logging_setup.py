@@ -0,0 +1,123 @@
+"""Non-blocking logging setup with rate limiting for repeated messages."""
+
+import atexit
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+from .utils import ensure_directory_exists
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let through at most `burst` records per message template every `interval` seconds.
+
+    Records are keyed by logger name and the unformatted message, so with
+    %-style logging every call site is limited separately regardless of its
+    arguments. The first record after a quiet window reports how many were
+    suppressed. Errors from a 60 Hz event handler thus cost one log line per
+    window instead of sixty per second.
+    """
+
+    MAX_KEYS = 1024
+
+    def __init__(self, interval=10.0, burst=5):
+        """
+        Initialize the filter.
+
+        Args:
+            interval (float): Window length in seconds
+            burst (int): Records allowed per template and window
+        """
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._windows = {}  # (logger, template) -> [window start, count, suppressed]
+
+    def filter(self, record):
+        if record.levelno >= logging.CRITICAL:
+            return True
+
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        window = self._windows.get(key)
+
+        if window is None or now - window[0] >= self.interval:
+            if len(self._windows) >= self.MAX_KEYS:
+                self._windows.clear()
+            suppressed = window[2] if window else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.msg = f"{record.msg} [{suppressed} similar messages suppressed]"
+            return True
+
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+
+        window[2] += 1
+        return False
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves all formatting to the listener thread.
+
+    The stock QueueHandler formats each record before enqueueing it, which
+    puts the formatting cost back on the calling thread.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level="INFO", log_format=None, date_format=None, log_file=None,
+                  max_bytes=1024 * 1024, backup_count=3, rate_limit_interval=10.0, rate_limit_burst=5):
+    """
+    Route all logging through a queue drained by a background listener.
+
+    Callers only pay for a filter check and a queue put; formatting and
+    console/file I/O happen on the listener thread.
+
+    Args:
+        level (str or int): Root log level
+        log_format (str): Record format
+        date_format (str): Timestamp format
+        log_file (Path): Rotating log file, or None for console only
+        max_bytes (int): Size at which the log file is rotated
+        backup_count (int): Rotated files kept
+        rate_limit_interval (float): Rate limit window in seconds
+        rate_limit_burst (int): Records allowed per template and window
+
+    Returns:
+        QueueListener: The running listener (stopped automatically at exit)
+    """
+    formatter = logging.Formatter(log_format, date_format)
+    handlers = [logging.StreamHandler()]
+
+    if log_file is not None:
+        log_file = Path(log_file)
+        if ensure_directory_exists(log_file.parent):
+            handlers.append(RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+            ))
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(rate_limit_interval, rate_limit_burst))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,146 @@
+"""DNS-SD (mDNS) advertisement of the running server, so clients can find it without the QR code."""
+
+import logging
+import socket
+import threading
+
+try:
+    from zeroconf import IPVersion, ServiceInfo, Zeroconf
+    ZEROCONF_AVAILABLE = True
+except ImportError:
+    IPVersion = ServiceInfo = Zeroconf = None
+    ZEROCONF_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _service_name(instance, service_type):
+    """Build a DNS-SD instance name; labels are limited to 63 bytes."""
+    label = instance.replace(".", "-").encode("utf-8")[:63].decode("utf-8", "ignore")
+    return f"{label}.{service_type}"
+
+
+class ServiceAdvertiser:
+    """
+    Publishes one DNS-SD service record over multicast DNS.
+
+    Registration probes the network for name conflicts, which takes about a
+    second, so it runs on a background thread and start() returns at once.
+    stop() sends goodbye packets so browsers drop the record immediately
+    instead of waiting for its TTL.
+    """
+
+    def __init__(self, service_type, instance, port, properties, address=None, interfaces=None):
+        """
+        Initialize the advertiser.
+
+        Args:
+            service_type (str): DNS-SD type, e.g. '_pptcontrol._tcp.local.'
+            instance (str): Human-readable instance name
+            port (int): Advertised TCP port
+            properties (dict): TXT record entries (values are converted to str)
+            address (str): Advertised IPv4 address
+            interfaces (list): Interface addresses to answer on (default: all)
+        """
+        self.service_type = service_type
+        self.name = _service_name(instance, service_type)
+        self.port = port
+        self.properties = {key: str(value) for key, value in properties.items()}
+        self.address = address
+        self.interfaces = interfaces
+
+        self._zeroconf = None
+        self._info = None
+        self._lock = threading.Lock()
+        self._registered = threading.Event()
+        self._registering = False  # register_service() is running (outside the lock)
+        self._stopped = False
+
+    def start(self):
+        """
+        Begin advertising in the background.
+
+        Returns:
+            bool: False if zeroconf is not installed
+        """
+        if not ZEROCONF_AVAILABLE:
+            logger.warning("zeroconf is not installed (pip install zeroconf); DNS-SD advertisement disabled")
+            return False
+        threading.Thread(target=self._register, name="dns-sd", daemon=True).start()
+        return True
+
+    def wait_registered(self, timeout=None):
+        """Wait until the record is published; returns False on timeout."""
+        return self._registered.wait(timeout)
+
+    def _register(self):
+        host = socket.gethostname().split(".")[0] or "ppt-host"
+        info = ServiceInfo(
+            self.service_type,
+            self.name,
+            addresses=[socket.inet_aton(self.address)] if self.address else None,
+            port=self.port,
+            properties=self.properties,
+            server=f"{host}.local.",
+        )
+        with self._lock:
+            if self._stopped:
+                return
+            try:
+                kwargs = {"ip_version": IPVersion.V4Only}
+                if self.interfaces:
+                    kwargs["interfaces"] = self.interfaces
+                self._zeroconf = Zeroconf(**kwargs)
+            except OSError as e:
+                logger.warning("Cannot open the mDNS socket: %s", e)
+                return
+            self._registering = True
+
+        try:
+            # Renames the instance ("... (2)") if another host already uses the name
+            self._zeroconf.register_service(info, allow_name_change=True)
+        except Exception as e:
+            logger.warning("DNS-SD registration of %s failed: %s", self.name, e)
+            with self._lock:
+                self._registering = False
+                self._close()
+            return
+
+        with self._lock:
+            self._registering = False
+            if self._stopped:
+                self._withdraw(info)
+                return
+            self._info = info
+            self.name = info.name
+        self._registered.set()
+        logger.info("Advertising %s on port %s", self.name, self.port)
+
+    def stop(self):
+        """Withdraw the record and close the mDNS socket."""
+        with self._lock:
+            self._stopped = True
+            info, self._info = self._info, None
+            if info is not None:
+                self._withdraw(info)
+            elif self._registering:
+                # Still probing: _register() withdraws once registration returns
+                return
+            else:
+                self._close()
+
+    def _close(self):
+        """Close the mDNS socket, if open. Call with the lock held."""
+        if self._zeroconf is not None:
+            self._zeroconf.close()
+            self._zeroconf = None
+
+    def _withdraw(self, info):
+        try:
+            self._zeroconf.unregister_service(info)
+            logger.info("Withdrew DNS-SD record %s", info.name)
+        except Exception as e:
+            logger.warning("Error withdrawing DNS-SD record %s: %s", info.name, e)
+        finally:
+            self._close()
+
@@ -18,9 +18,9 @@ def get_local_ip():
         # Connect to a dummy address to get the local IP
         s.connect(('10.255.255.255', 1))
         ip = s.getsockname()[0]
-        logger.info(f"Detected local IP: {ip}")
+        logger.info("Detected local IP: %s", ip)
     except Exception as e:
-        logger.warning(f"Failed to detect local IP: {e}. Using localhost.")
+        logger.warning("Failed to detect local IP: %s. Using localhost.", e)
         ip = '127.0.0.1'
     finally:
         s.close()
@@ -36,7 +36,7 @@ def check_network_connection():
     """
     ip = get_local_ip()
     is_connected = ip != '127.0.0.1'
-    logger.info(f"Network connection status: {is_connected}")
+    logger.info("Network connection status: %s", is_connected)
     return is_connected
 
 
@@ -59,7 +59,7 @@ def find_free_port(start_port=5000, max_port=5100):
             s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             s.bind(('0.0.0.0', port))
             s.close()
-            logger.info(f"Found free port: {port}")
+            logger.info("Found free port: %s", port)
             return port
         except OSError:
             continue
@@ -19,6 +19,6 @@ def get_platform_handler():
         from .darwin import DarwinPlatform
         return DarwinPlatform()
     else:
-        logger.warning(f"Unsupported platform: {system}, using base implementation")
+        logger.warning("Unsupported platform: %s, using base implementation", system)
         from .base import BasePlatform
         return BasePlatform()
@@ -16,7 +16,7 @@ class BasePlatform(ABC):
 
     def is_admin(self):
         """Check if the application is running with administrator/root privileges."""
-        logger.info(f"Admin check not implemented for {self.platform_name}")
+        logger.info("Admin check not implemented for %s", self.platform_name)
         return True  # Default to True for platforms that don't require it
 
     def create_firewall_rule(self, port):
@@ -29,7 +29,7 @@ class BasePlatform(ABC):
         Returns:
             tuple: (success: bool, error_message: str or None)
         """
-        logger.info(f"Firewall rule creation not implemented for {self.platform_name}")
+        logger.info("Firewall rule creation not implemented for %s", self.platform_name)
         return True, None
 
     def remove_firewall_rule(self):
@@ -39,7 +39,7 @@ class BasePlatform(ABC):
         Returns:
             tuple: (success: bool, error_message: str or None)
         """
-        logger.info(f"Firewall rule removal not implemented for {self.platform_name}")
+        logger.info("Firewall rule removal not implemented for %s", self.platform_name)
         return True, None
 
     def get_platform_name(self):
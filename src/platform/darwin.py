@@ -21,7 +21,7 @@ class DarwinPlatform(BasePlatform):
         try:
             return os.geteuid() == 0
         except Exception as e:
-            logger.error(f"Error checking admin status on macOS: {e}")
+            logger.error("Error checking admin status on macOS: %s", e)
             return False
 
     def create_firewall_rule(self, port):
@@ -37,7 +37,7 @@ class DarwinPlatform(BasePlatform):
         Returns:
             tuple: (success: bool, error_message: str or None)
         """
-        logger.info(f"Firewall configuration on macOS is manual. Please ensure port {port} is accessible.")
+        logger.info("Firewall configuration on macOS is manual. Please ensure port %s is accessible.", port)
         return True, None
 
     def remove_firewall_rule(self):
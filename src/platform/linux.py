@@ -1,9 +1,10 @@
 """Linux-specific platform implementation."""
 
 import os
-import subprocess
 import logging
 from .base import BasePlatform
+from .linux_firewall import LinuxFirewall, FirewallError
+from ..config import FIREWALL_RULE_TAG
 
 logger = logging.getLogger(__name__)
 
@@ -15,18 +16,22 @@ class LinuxPlatform(BasePlatform):
         super().__init__()
         self.platform_name = "Linux"
         self.requires_admin = False  # Optional on Linux
+        self.firewall = LinuxFirewall(FIREWALL_RULE_TAG)
 
     def is_admin(self):
         """Check if the application is running with root privileges on Linux."""
         try:
             return os.geteuid() == 0
         except Exception as e:
-            logger.error(f"Error checking admin status on Linux: {e}")
+            logger.error("Error checking admin status on Linux: %s", e)
             return False
 
     def create_firewall_rule(self, port):
         """
-        Attempt to create a firewall rule on Linux using iptables or ufw.
+        Attempt to allow the port through ufw or iptables.
+
+        Rules left behind by a previous run that crashed are removed in the
+        same update, and an existing rule for the port is kept as is.
 
         Note: This is optional on Linux. The application will work without it
         if the firewall is already configured or disabled.
@@ -37,83 +42,36 @@ class LinuxPlatform(BasePlatform):
         Returns:
             tuple: (success: bool, error_message: str or None)
         """
-        # Check if ufw is available
-        try:
-            result = subprocess.run(
-                ['which', 'ufw'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                return self._create_ufw_rule(port)
-        except Exception:
-            pass
-
-        # Check if iptables is available
-        try:
-            result = subprocess.run(
-                ['which', 'iptables'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                return self._create_iptables_rule(port)
-        except Exception:
-            pass
-
-        logger.info("No firewall management tool found (ufw/iptables). Skipping firewall configuration.")
-        return True, None
-
-    def _create_ufw_rule(self, port):
-        """Create a firewall rule using ufw."""
-        try:
-            subprocess.run(
-                ['ufw', 'allow', str(port)],
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            logger.info(f"UFW firewall rule created for port {port}")
+        if self.firewall.backend is None:
+            logger.info("No firewall management tool found (ufw/iptables). Skipping firewall configuration.")
             return True, None
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Failed to create UFW rule (continuing anyway): {e.stderr}")
-            return True, None  # Don't fail if firewall can't be configured
-        except Exception as e:
-            logger.warning(f"Error creating UFW rule (continuing anyway): {str(e)}")
+        if not self.is_admin():
+            logger.info("Not running as root. Skipping firewall configuration.")
             return True, None
 
-    def _create_iptables_rule(self, port):
-        """Create a firewall rule using iptables."""
         try:
-            subprocess.run(
-                [
-                    'iptables', '-A', 'INPUT',
-                    '-p', 'tcp',
-                    '--dport', str(port),
-                    '-j', 'ACCEPT'
-                ],
-                check=True,
-                capture_output=True,
-                text=True
-            )
-            logger.info(f"iptables firewall rule created for port {port}")
-            return True, None
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Failed to create iptables rule (continuing anyway): {e.stderr}")
-            return True, None  # Don't fail if firewall can't be configured
-        except Exception as e:
-            logger.warning(f"Error creating iptables rule (continuing anyway): {str(e)}")
-            return True, None
+            self.firewall.allow(port)
+        except FirewallError as e:
+            logger.warning("Failed to create firewall rule (continuing anyway): %s", e)
+        return True, None  # Don't fail if firewall can't be configured
 
     def remove_firewall_rule(self):
         """
-        Remove the firewall rule on Linux.
+        Remove every firewall rule this application created.
 
         Returns:
             tuple: (success: bool, error_message: str or None)
         """
-        logger.info("Firewall rule cleanup not implemented on Linux (manual cleanup may be needed)")
-        return True, None
+        if self.firewall.backend is None or not self.is_admin():
+            return True, None
+
+        try:
+            self.firewall.remove()
+            return True, None
+        except FirewallError as e:
+            error_msg = f"Failed to remove firewall rule: {e}"
+            logger.warning(error_msg)
+            return False, error_msg
 
     def get_admin_message(self):
         """Get the appropriate message for requesting admin privileges on Linux."""
@@ -0,0 +1,190 @@
+"""Idempotent iptables/ufw rule management that only ever touches its own tagged rules."""
+
+import logging
+import re
+import shlex
+import shutil
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+COMMAND_TIMEOUT = 10  # seconds
+
+
+class FirewallError(RuntimeError):
+    """A firewall tool failed."""
+
+
+def _run(args, stdin=None):
+    """
+    Run a firewall command.
+
+    Returns:
+        str: Its standard output
+
+    Raises:
+        FirewallError: If the command fails or cannot be started
+    """
+    try:
+        result = subprocess.run(args, input=stdin, capture_output=True, text=True, timeout=COMMAND_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise FirewallError(f"{args[0]}: {e}") from e
+    if result.returncode != 0:
+        raise FirewallError(f"{' '.join(args)}: {result.stderr.strip() or f'exit status {result.returncode}'}")
+    return result.stdout
+
+
+class IptablesRules:
+    """
+    Accept rules in the INPUT chain, tagged with an iptables comment.
+
+    All changes go through a single `iptables-restore --noflush` call, so
+    deleting leftovers and adding the new rule is one atomic update.
+    """
+
+    name = "iptables"
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    @staticmethod
+    def available():
+        return shutil.which("iptables") is not None and shutil.which("iptables-restore") is not None
+
+    def owned(self):
+        """
+        List this app's rules.
+
+        Returns:
+            list: (port, rule spec as printed by `iptables -S` without the leading '-A') tuples
+        """
+        rules = []
+        for line in _run(["iptables", "-w", "-S", "INPUT"]).splitlines():
+            args = shlex.split(line)
+            if args[:2] != ["-A", "INPUT"] or "--comment" not in args:
+                continue
+            if args[args.index("--comment") + 1] != self.tag or "--dport" not in args:
+                continue
+            rules.append((int(args[args.index("--dport") + 1]), args[1:]))
+        return rules
+
+    def apply(self, add=(), delete=()):
+        """
+        Insert rules for some ports and delete some owned rules, in one transaction.
+
+        Args:
+            add (iterable): Ports to accept
+            delete (iterable): Rule specs from owned()
+        """
+        lines = ["*filter"]
+        lines += ["-D " + shlex.join(spec) for spec in delete]
+        lines += [
+            f"-I INPUT -p tcp -m tcp --dport {port} -m comment --comment {shlex.quote(self.tag)} -j ACCEPT"
+            for port in add
+        ]
+        if len(lines) == 1:
+            return
+        lines.append("COMMIT")
+        _run(["iptables-restore", "-w", "--noflush"], stdin="\n".join(lines) + "\n")
+
+
+class UfwRules:
+    """
+    ufw allow rules, tagged with a ufw rule comment.
+
+    ufw has no batch mode, so each change is one ufw call; owned rules are
+    read from a single `ufw status` call first and unchanged rules are left alone.
+    """
+
+    name = "ufw"
+
+    def __init__(self, tag):
+        self.tag = tag
+        self._pattern = re.compile(r"^(\d+)/tcp\s.*ALLOW IN.*#\s*" + re.escape(tag) + r"\s*$")
+
+    @staticmethod
+    def available():
+        return shutil.which("ufw") is not None
+
+    def owned(self):
+        """
+        List this app's rules.
+
+        Returns:
+            list: (port, ufw rule arguments that delete it) tuples; IPv4 and IPv6 share one rule
+        """
+        rules = []
+        for line in _run(["ufw", "status", "verbose"]).splitlines():
+            match = self._pattern.match(line.strip())
+            if match:
+                port = int(match.group(1))
+                rule = (port, ["allow", "in", f"{port}/tcp"])
+                if rule not in rules:
+                    rules.append(rule)
+        return rules
+
+    def apply(self, add=(), delete=()):
+        for rule in delete:
+            _run(["ufw", "delete"] + rule)
+        for port in add:
+            _run(["ufw", "allow", "in", f"{port}/tcp", "comment", self.tag])
+
+
+class LinuxFirewall:
+    """
+    Opens one TCP port and cleans up after itself, including after a crash.
+
+    Rules are tagged, so the app can recognize its own rules, including
+    ones left behind by a crashed run. allow() keeps a matching rule instead
+    of adding a duplicate and removes leftovers in the same update; remove()
+    deletes every tagged rule and nothing else.
+    """
+
+    def __init__(self, tag):
+        """
+        Initialize the manager.
+
+        Args:
+            tag (str): Comment identifying this app's rules
+        """
+        self.tag = tag
+        self.backend = None
+        for backend in (UfwRules, IptablesRules):
+            if backend.available():
+                self.backend = backend(tag)
+                break
+
+    def allow(self, port):
+        """
+        Make sure exactly one tagged rule exists, accepting the port.
+
+        Args:
+            port (int): TCP port to accept
+
+        Raises:
+            FirewallError: If the firewall tool fails
+        """
+        owned = self.backend.owned()
+        matching = [rule for owned_port, rule in owned if owned_port == port]
+        stale = [rule for owned_port, rule in owned if owned_port != port] + matching[1:]
+        add = [] if matching else [port]
+        self.backend.apply(add=add, delete=stale)
+        if stale:
+            logger.info("Removed %d leftover %s rule(s) tagged '%s'", len(stale), self.backend.name, self.tag)
+        if add:
+            logger.info("%s rule created for port %s", self.backend.name, port)
+        else:
+            logger.info("%s rule for port %s already present", self.backend.name, port)
+
+    def remove(self):
+        """
+        Delete every tagged rule.
+
+        Raises:
+            FirewallError: If the firewall tool fails
+        """
+        owned = self.backend.owned()
+        self.backend.apply(delete=[rule for _, rule in owned])
+        if owned:
+            ports = sorted({port for port, _ in owned})
+            logger.info("Removed %s rule(s) for port(s) %s", self.backend.name, ", ".join(map(str, ports)))
@@ -21,7 +21,7 @@ class WindowsPlatform(BasePlatform):
         try:
             return ctypes.windll.shell32.IsUserAnAdmin()
         except Exception as e:
-            logger.error(f"Error checking admin status on Windows: {e}")
+            logger.error("Error checking admin status on Windows: %s", e)
             return False
 
     def create_firewall_rule(self, port):
@@ -48,7 +48,7 @@ class WindowsPlatform(BasePlatform):
                 capture_output=True,
                 text=True
             )
-            logger.info(f"Windows firewall rule '{self.firewall_rule_name}' created for port {port}")
+            logger.info("Windows firewall rule '%s' created for port %s", self.firewall_rule_name, port)
             return True, None
         except subprocess.CalledProcessError as e:
             error_msg = f"Failed to add firewall rule: {e.stderr}"
@@ -76,7 +76,7 @@ class WindowsPlatform(BasePlatform):
                 capture_output=True,
                 text=True
             )
-            logger.info(f"Windows firewall rule '{self.firewall_rule_name}' removed")
+            logger.info("Windows firewall rule '%s' removed", self.firewall_rule_name)
             return True, None
         except Exception as e:
             error_msg = f"Error removing firewall rule: {str(e)}"
@@ -1,29 +1,38 @@
 """Command handler for PowerPoint presentation control."""
 
-import sys
-import subprocess
 import logging
-from functools import wraps
+import time
+from functools import partial, wraps
 
-# Linux-specific: Enable X11 access for pyautogui on Wayland
-# Must run before importing pyautogui
-if sys.platform == 'linux':
-    try:
-        subprocess.run(['xhost', '+local:'], capture_output=True, check=False)
-    except FileNotFoundError:
-        pass
-    except Exception:
-        pass
-
-import pyautogui
+from .impress import ImpressUnavailableError
+from .injection import InjectionAbortedError, PyAutoGUIInjector
+from .macros import compile_macros, run_macro
 
 logger = logging.getLogger(__name__)
 
+# Built-in command name -> CommandHandler method; macros may not reuse these names
+BUILTIN_COMMANDS = {
+    "NEXT_SLIDE": "next_slide",
+    "FORWARD": "next_slide",
+    "PREV_SLIDE": "previous_slide",
+    "BACK": "previous_slide",
+    "START_SLIDESHOW": "start_slideshow",
+    "END_SLIDESHOW": "end_slideshow",
+    "HOME": "go_to_first_slide",
+    "END": "go_to_last_slide",
+    "GOTO_SLIDE": "go_to_slide",
+    "PLAY_VIDEO": "play_video",
+    "PAUSE_VIDEO": "pause_video",
+}
+
 
 def safe_keypress(func):
     """
     Decorator to safely execute keyboard commands with error handling.
 
+    Also records when the action started and how long it took in
+    ``last_injection_started`` and ``last_injection_seconds``.
+
     Args:
         func: The function to wrap
 
@@ -31,61 +40,81 @@ def safe_keypress(func):
         Wrapped function with error handling
     """
     @wraps(func)
-    def wrapper(*args, **kwargs):
+    def wrapper(self, *args, **kwargs):
+        started = self.last_injection_started = time.perf_counter()
         try:
-            return func(*args, **kwargs)
-        except pyautogui.FailSafeException as e:
-            logger.error(f"PyAutoGUI failsafe triggered: {e}")
+            return func(self, *args, **kwargs)
+        except InjectionAbortedError as e:
+            logger.error("%s", e)
             raise
         except Exception as e:
-            logger.error(f"Error executing keyboard command in {func.__name__}: {e}")
+            logger.error("Error executing keyboard command in %s: %s", func.__name__, e)
             raise
+        finally:
+            self.last_injection_seconds = time.perf_counter() - started
     return wrapper
 
 
 class CommandHandler:
     """Handles commands for controlling PowerPoint presentations."""
 
-    def __init__(self, command_timeout=0.5):
+    def __init__(self, command_timeout=0.5, impress=None, injector=None, macros=None, sleep=time.sleep,
+                 macro_max_steps=64, macro_max_duration=30.0):
         """
         Initialize the command handler.
 
         Args:
-            command_timeout (float): Timeout for command execution in seconds
+            command_timeout (float): Pause after each keystroke in seconds (default injector only)
+            impress (ImpressController): Optional UNO backend used before falling back to keystrokes
+            injector (KeyInjector): Keystroke backend; defaults to PyAutoGUIInjector
+            macros (dict): Macro name -> steps, registered as extra commands (see macros.compile_macro)
+            sleep (callable): Sleep used for waits inside macros
+            macro_max_steps (int): Maximum keystrokes per macro
+            macro_max_duration (float): Maximum total wait per macro in seconds
+
+        Raises:
+            MacroError: If a macro is invalid or shadows a built-in command
         """
-        # Configure PyAutoGUI
-        pyautogui.PAUSE = command_timeout  # Add pause between actions
-        pyautogui.FAILSAFE = True  # Enable failsafe (move mouse to corner to abort)
-
-        self.command_map = {
-            "NEXT_SLIDE": self.next_slide,
-            "FORWARD": self.next_slide,
-            "PREV_SLIDE": self.previous_slide,
-            "BACK": self.previous_slide,
-            "START_SLIDESHOW": self.start_slideshow,
-            "END_SLIDESHOW": self.end_slideshow,
-            "HOME": self.go_to_first_slide,
-            "END": self.go_to_last_slide,
-            "PLAY_VIDEO": self.play_video,
-            "PAUSE_VIDEO": self.pause_video,
-        }
+        self.impress = impress
+        self.injector = injector if injector is not None else PyAutoGUIInjector(pause=command_timeout)
+        self.slide_state = None  # Slide state reported by the last command, if known
+        self.last_command = None  # (command, argument) of the last handled command
+        self.last_injection_started = 0.0  # perf_counter() at the start of the last keystroke/backend action
+        self.last_injection_seconds = 0.0  # Duration of that action
+
+        self.command_map = {name: getattr(self, method) for name, method in BUILTIN_COMMANDS.items()}
+
+        # Macros are compiled once here, so running one is a plain loop over its steps
+        self.macros = compile_macros(macros or {}, self.command_map, macro_max_steps, macro_max_duration)
+        self.sleep = sleep
+        for name, macro in self.macros.items():
+            self.command_map[name] = partial(self.run_macro, macro)
+        if self.macros:
+            logger.info("Registered macros: %s", ", ".join(self.macros))
 
     def handle_command(self, command):
         """
         Execute the appropriate action for the given command.
 
+        Commands may carry an argument after a colon, e.g. "GOTO_SLIDE:5".
+
         Args:
             command (str): The command to execute
 
         Returns:
             bool: True if command was handled successfully, False otherwise
         """
+        self.slide_state = None
+        self.last_command = None
+
         # Normalize command
         if not isinstance(command, str):
-            logger.error(f"Invalid command type: {type(command)}")
+            logger.error("Invalid command type: %s", type(command))
             return False
 
-        command = command.strip().upper()
+        command, _, argument = command.strip().upper().partition(":")
+        command = command.strip()
+        argument = argument.strip()
 
         if not command:
             logger.warning("Empty command received")
@@ -95,64 +124,135 @@ class CommandHandler:
 
         if handler:
             try:
-                logger.info(f"Executing command: {command}")
-                handler()
-                logger.debug(f"Command '{command}' executed successfully")
+                logger.debug("Executing command: %s", command)
+                if argument:
+                    handler(argument)
+                else:
+                    handler()
+                logger.debug("Command '%s' executed successfully", command)
+                self.last_command = (command, argument)
                 return True
-            except pyautogui.FailSafeException:
-                logger.error("PyAutoGUI failsafe triggered - aborting command execution")
+            except InjectionAbortedError:
+                logger.error("Keystroke injection aborted - aborting command execution")
+                return False
+            except (TypeError, ValueError) as e:
+                logger.warning("Invalid argument for command '%s': %s", command, e)
                 return False
             except Exception as e:
-                logger.error(f"Failed to execute command '{command}': {e}")
+                logger.error("Failed to execute command '%s': %s", command, e)
                 return False
         else:
-            logger.warning(f"Unknown command received: {command}")
+            logger.warning("Unknown command received: %s", command)
+            return False
+
+    def _impress_call(self, method, *args):
+        """
+        Try to perform an action through the Impress UNO backend.
+
+        Args:
+            method (str): Name of the ImpressController method
+            *args: Arguments for the method
+
+        Returns:
+            bool: True if the backend handled the action
+        """
+        if self.impress is None:
+            return False
+
+        try:
+            self.slide_state = getattr(self.impress, method)(*args)
+            logger.debug("Impress backend handled %s: %s", method, self.slide_state)
+            return True
+        except ImpressUnavailableError as e:
+            logger.debug("Impress backend unavailable, falling back to keystrokes: %s", e)
             return False
 
     @safe_keypress
     def next_slide(self):
         """Move to the next slide."""
+        if self._impress_call("next_slide"):
+            return
         logger.debug("Pressing 'right' key for next slide")
-        pyautogui.press("right")
+        self.injector.press("right")
 
     @safe_keypress
     def previous_slide(self):
         """Move to the previous slide."""
+        if self._impress_call("previous_slide"):
+            return
         logger.debug("Pressing 'left' key for previous slide")
-        pyautogui.press("left")
+        self.injector.press("left")
 
     @safe_keypress
     def start_slideshow(self):
         """Start the slideshow presentation."""
+        if self._impress_call("start_slideshow"):
+            return
         logger.debug("Pressing 'F5' to start slideshow")
-        pyautogui.press("f5")
+        self.injector.press("f5")
 
     @safe_keypress
     def end_slideshow(self):
         """End the slideshow presentation."""
+        if self._impress_call("end_slideshow"):
+            return
         logger.debug("Pressing 'ESC' to end slideshow")
-        pyautogui.press("esc")
+        self.injector.press("esc")
 
     @safe_keypress
     def go_to_first_slide(self):
         """Go to the first slide."""
+        if self._impress_call("goto_slide", 1):
+            return
         logger.debug("Pressing 'Home' key for first slide")
-        pyautogui.press("home")
+        self.injector.press("home")
 
     @safe_keypress
     def go_to_last_slide(self):
         """Go to the last slide."""
+        if self._impress_call("goto_slide", -1):
+            return
         logger.debug("Pressing 'End' key for last slide")
-        pyautogui.press("end")
+        self.injector.press("end")
+
+    @safe_keypress
+    def go_to_slide(self, number):
+        """
+        Jump to a slide by number.
+
+        Args:
+            number (str or int): 1-based slide number
+        """
+        number = int(number)
+        if number < 1:
+            raise ValueError(f"Slide number must be positive, got {number}")
+
+        if self._impress_call("goto_slide", number):
+            return
+        # PowerPoint and Impress both jump when a slide number is typed during a slideshow
+        logger.debug("Typing '%s' + 'Enter' to jump to slide", number)
+        self.injector.write(str(number))
+        self.injector.press("enter")
+
+    @safe_keypress
+    def run_macro(self, macro):
+        """
+        Run a compiled macro as one command.
+
+        Args:
+            macro (Macro): Macro from self.macros
+        """
+        logger.debug("Running macro %s (%d keystrokes over %.2f s)", macro.name, len(macro.steps), macro.duration)
+        run_macro(macro, self.injector, self.sleep)
 
     @safe_keypress
     def play_video(self):
         """Play video in presentation using Alt+P."""
         logger.debug("Pressing 'Alt+P' to play video")
-        pyautogui.hotkey('alt', 'p')
+        self.injector.hotkey('alt', 'p')
 
     @safe_keypress
     def pause_video(self):
         """Pause video in presentation using Alt+P."""
         logger.debug("Pressing 'Alt+P' to pause video")
-        pyautogui.hotkey('alt', 'p')
+        self.injector.hotkey('alt', 'p')
@@ -0,0 +1,92 @@
+"""Ordered processing of the controller's events without a greenlet per event."""
+
+import logging
+from collections import deque
+
+import gevent
+
+logger = logging.getLogger(__name__)
+
+
+class EventLane:
+    """
+    Runs one client's events strictly in arrival order.
+
+    While the lane is idle, a cheap event runs inline on the greenlet that
+    received it, so the common case (laser moves between commands) costs no
+    queueing or spawning at all. Slow events (commands) and anything that
+    arrives behind them are queued and drained by a single worker greenlet,
+    spawned per burst rather than per event. Consecutive queued events of a
+    coalescing type (laser moves) collapse into the newest one, so a
+    toggle followed by moves is still handled toggle first.
+    """
+
+    def __init__(self, coalesce=(), on_coalesced=None):
+        """
+        Initialize the lane.
+
+        Args:
+            coalesce (iterable): Events where only the newest of consecutive queued ones matters
+            on_coalesced (callable): Called with the event name for each event superseded in the queue
+        """
+        self.coalesce = frozenset(coalesce)
+        self.on_coalesced = on_coalesced
+        self._queue = deque()  # [event, handler, args]
+        self._worker = None
+
+    @property
+    def busy(self):
+        """True while queued events are being drained."""
+        return self._worker is not None
+
+    def __len__(self):
+        return len(self._queue)
+
+    def submit(self, event, handler, args, slow=False):
+        """
+        Handle an event now if nothing is ahead of it, otherwise queue it.
+
+        Args:
+            event (str): Event name
+            handler (callable): Handler, called as handler(*args)
+            args (tuple): Handler arguments
+            slow (bool): The handler blocks (e.g. injects keystrokes); never run it inline
+
+        Returns:
+            The handler's return value if it ran inline, otherwise None
+        """
+        if self._worker is None and not slow:
+            return handler(*args)
+
+        queue = self._queue
+        if event in self.coalesce and queue and queue[-1][0] == event:
+            queue[-1][2] = args
+            if self.on_coalesced is not None:
+                self.on_coalesced(event)
+        else:
+            queue.append([event, handler, args])
+        if self._worker is None:
+            self._worker = gevent.spawn(self._drain)
+        return None
+
+    def clear(self):
+        """Drop queued events, e.g. when their client disconnects; the running one completes."""
+        self._queue.clear()
+
+    def join(self, timeout=None):
+        """Wait until the queue is drained."""
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def _drain(self):
+        queue = self._queue
+        try:
+            while queue:
+                event, handler, args = queue.popleft()
+                try:
+                    handler(*args)
+                except Exception as e:
+                    logger.error("Error handling '%s' in event lane: %s", event, e)
+        finally:
+            self._worker = None
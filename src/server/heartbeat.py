@@ -0,0 +1,155 @@
+"""Adaptive application-level heartbeat for fast dead-controller detection."""
+
+import itertools
+import logging
+import time
+
+import gevent
+from gevent.event import Event
+
+logger = logging.getLogger(__name__)
+
+
+class _Liveness:
+    """Heartbeat state of one watched client."""
+
+    __slots__ = ("last_seen", "last_activity", "pending", "rtt", "stopped", "wake")
+
+    def __init__(self):
+        now = time.monotonic()
+        self.last_seen = now
+        self.last_activity = now
+        self.pending = None  # (heartbeat id, monotonic send time)
+        self.rtt = None  # Smoothed round-trip time in seconds
+        self.stopped = False
+        self.wake = Event()
+
+
+class HeartbeatMonitor:
+    """
+    Pings a client only when it has gone quiet, and drops it if it stops answering.
+
+    Any inbound event counts as proof of life, so a streaming laser pointer
+    needs no extra heartbeats. While the talk is active (commands or laser
+    moves recently) the client is pinged after a short silence; once idle,
+    pings become rare to save the phone's radio and battery.
+    """
+
+    RTT_SMOOTHING = 0.2
+
+    def __init__(self, emit, on_dead, active_interval=2.0, idle_interval=15.0, idle_after=60.0,
+                 timeout=3.0, activity_events=("command", "laser_pointer_move", "ink_stroke"), rtt_observer=None,
+                 clock=None):
+        """
+        Initialize the monitor.
+
+        Args:
+            emit (callable): emit(event, data, to=sid, callback=fn), e.g. PPTServer._emit
+            on_dead (callable): Called with the sid of a client that stopped answering
+            active_interval (float): Silence before a heartbeat while the talk is active
+            idle_interval (float): Silence before a heartbeat while idle
+            idle_after (float): Seconds without activity events before the client counts as idle
+            timeout (float): Seconds to wait for a heartbeat reply
+            activity_events (tuple): Events that mark the talk as active
+            rtt_observer (callable): Called with each measured round-trip time in seconds
+            clock (callable): Server clock in ms; if given, heartbeats carry it as 't' so
+                clients can check their clock offset without an extra round trip
+        """
+        self.emit = emit
+        self.on_dead = on_dead
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.idle_after = idle_after
+        self.timeout = timeout
+        self.activity_events = frozenset(activity_events)
+        self.rtt_observer = rtt_observer
+        self.clock = clock
+
+        self._clients = {}  # sid -> _Liveness
+        self._ids = itertools.count(1)
+
+    def watch(self, sid):
+        """Start monitoring a client. Must be called from the server's event loop."""
+        self.unwatch(sid)
+        state = self._clients[sid] = _Liveness()
+        gevent.spawn(self._run, sid, state)
+
+    def unwatch(self, sid=None):
+        """Stop monitoring a client, or all clients if sid is None."""
+        sids = list(self._clients) if sid is None else [sid]
+        for key in sids:
+            state = self._clients.pop(key, None)
+            if state is not None:
+                state.stopped = True
+                if sid is not None:
+                    state.wake.set()  # Only safe from the server's own event loop
+
+    def seen(self, sid, event):
+        """Note an inbound event from a client."""
+        state = self._clients.get(sid)
+        if state is None:
+            return
+        state.last_seen = time.monotonic()
+        if event in self.activity_events:
+            state.last_activity = state.last_seen
+
+    def rtt(self, sid):
+        """
+        Get a client's smoothed round-trip time.
+
+        Returns:
+            float or None: Seconds, or None before the first heartbeat reply
+        """
+        state = self._clients.get(sid)
+        return state.rtt if state is not None else None
+
+    def _interval(self, state, now):
+        if now - state.last_activity < self.idle_after:
+            return self.active_interval
+        return self.idle_interval
+
+    def _run(self, sid, state):
+        """Heartbeat loop of one client; exits when the client is unwatched."""
+        while not state.stopped:
+            now = time.monotonic()
+
+            if state.pending is not None:
+                # Other traffic after the heartbeat also proves the client is alive
+                delay = max(state.pending[1], state.last_seen) + self.timeout - now
+                if delay <= 0:
+                    logger.warning("Client %s silent for %.1f s after a heartbeat, disconnecting",
+                                   sid, now - state.last_seen)
+                    self.unwatch(sid)
+                    self.on_dead(sid)
+                    return
+            else:
+                delay = self._interval(state, now) - (now - state.last_seen)
+                if delay <= 0:
+                    self._send(sid, state, now)
+                    delay = self.timeout
+
+            state.wake.wait(timeout=delay)
+
+    def _send(self, sid, state, now):
+        heartbeat_id = next(self._ids)
+        state.pending = (heartbeat_id, now)
+
+        def reply(*args):
+            self._on_reply(state, heartbeat_id)
+
+        data = {"id": heartbeat_id}
+        if self.clock is not None:
+            data["t"] = self.clock()
+        self.emit("hb", data, to=sid, callback=reply)
+
+    def _on_reply(self, state, heartbeat_id):
+        pending = state.pending
+        if pending is None or pending[0] != heartbeat_id:
+            return
+        now = time.monotonic()
+        sample = now - pending[1]
+        state.pending = None
+        state.last_seen = now
+        state.rtt = sample if state.rtt is None else state.rtt + self.RTT_SMOOTHING * (sample - state.rtt)
+        if self.rtt_observer is not None:
+            self.rtt_observer(sample)
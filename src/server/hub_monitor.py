@@ -0,0 +1,133 @@
+"""Opt-in detection of calls that block the gevent hub, with the offending stack."""
+
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+import gevent
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _blocking_site(stack):
+    """
+    Name the innermost application frame of a stack, e.g. 'server/injection.py:_run'.
+
+    Args:
+        stack (traceback.StackSummary): Stack of the blocked thread
+
+    Returns:
+        str: The site, or 'unknown' if no frame is in this package
+    """
+    for frame in reversed(stack):
+        path = os.path.abspath(frame.filename)
+        if path.startswith(PACKAGE_DIR + os.sep) and path != os.path.abspath(__file__):
+            return f"{os.path.relpath(path, PACKAGE_DIR).replace(os.sep, '/')}:{frame.name}"
+    return "unknown"
+
+
+class HubMonitor:
+    """
+    Watches the server thread's hub from a native thread.
+
+    A greenlet on the hub records a tick every half threshold. A native
+    watchdog thread (real, since nothing is monkey-patched) notices when
+    ticks stop and captures the hub thread's current stack with
+    sys._current_frames(); that is whatever code is holding the hub. When
+    the hub comes back, the tick greenlet measures how late it woke up and
+    reports the block with the captured stack.
+    """
+
+    def __init__(self, threshold, on_block=None, max_sites=50, stack_limit=25):
+        """
+        Initialize the monitor.
+
+        Args:
+            threshold (float): Seconds the hub may be unresponsive before it counts as blocked
+            on_block (callable): on_block(duration, site) for each block, e.g. to record metrics
+            max_sites (int): Distinct sites reported; further ones are reported as 'other'
+            stack_limit (int): Frames kept per captured stack
+        """
+        self.threshold = threshold
+        self.on_block = on_block
+        self.max_sites = max_sites
+        self.stack_limit = stack_limit
+        self.blocks = 0
+
+        self._interval = threshold / 2
+        self._thread_id = None
+        self._ticks = 0
+        self._last_tick = time.monotonic()
+        self._captured = None  # (tick number, site, formatted stack), written by the watchdog
+        self._sites = set()
+        self._stopped = threading.Event()
+        self._ticker = None
+        self._watchdog = None
+
+    def start(self):
+        """Start monitoring the hub of the calling thread."""
+        self._thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._last_tick = time.monotonic()
+        self._ticker = gevent.spawn(self._tick)
+        self._watchdog = threading.Thread(target=self._watch, name="hub-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info("Hub monitor started (threshold %.0f ms)", self.threshold * 1000)
+
+    def stop(self):
+        """Stop monitoring. Must be called from the monitored thread."""
+        self._stopped.set()
+        if self._ticker is not None:
+            self._ticker.kill(block=False)
+            self._ticker = None
+
+    def _tick(self):
+        """Hub side: tick, and measure how late each wakeup is."""
+        while not self._stopped.is_set():
+            self._ticks += 1
+            self._last_tick = time.monotonic()
+            gevent.sleep(self._interval)
+            late = time.monotonic() - self._last_tick - self._interval
+            if late >= self.threshold:
+                self._report(late)
+
+    def _watch(self):
+        """Watchdog side: capture the hub thread's stack while ticks are overdue."""
+        while not self._stopped.wait(self._interval / 2):
+            ticks = self._ticks
+            overdue = time.monotonic() - self._last_tick - self._interval
+            if overdue < self.threshold or (self._captured is not None and self._captured[0] == ticks):
+                continue
+
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame, limit=self.stack_limit)
+            del frame
+            self._captured = (ticks, _blocking_site(stack), "".join(stack.format()))
+
+    def _report(self, duration):
+        captured = self._captured
+        if captured is not None and captured[0] == self._ticks:
+            _, site, stack = captured
+        else:
+            site, stack = "unknown", ""  # Ended before the watchdog looked
+
+        if site not in self._sites:
+            if len(self._sites) >= self.max_sites:
+                site = "other"
+            else:
+                self._sites.add(site)
+
+        self.blocks += 1
+        if stack:
+            logger.warning("Hub blocked for %.0f ms at %s:\n%s", duration * 1000, site, stack.rstrip())
+        else:
+            logger.warning("Hub blocked for %.0f ms (stack not captured)", duration * 1000)
+        if self.on_block is not None:
+            self.on_block(duration, site)
@@ -0,0 +1,211 @@
+"""LibreOffice Impress slideshow control over a UNO socket."""
+
+import logging
+import threading
+import time
+
+try:
+    import uno
+    from com.sun.star.connection import NoConnectException
+    from com.sun.star.lang import DisposedException
+    from com.sun.star.uno import RuntimeException as UnoRuntimeException
+    UNO_AVAILABLE = True
+except ImportError:
+    uno = None
+    NoConnectException = DisposedException = UnoRuntimeException = Exception
+    UNO_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PRESENTATION_SERVICE = "com.sun.star.presentation.PresentationDocument"
+
+
+class ImpressUnavailableError(RuntimeError):
+    """Raised when no Impress presentation can be reached over UNO."""
+
+
+class ImpressController:
+    """
+    Drives a running LibreOffice Impress slideshow through its UNO API.
+
+    A single UNO bridge is opened lazily and reused for every call. If the
+    bridge or document goes away, the cached objects are dropped and the call
+    is retried once on a fresh connection.
+    """
+
+    def __init__(self, host="localhost", port=2002, reconnect_interval=5.0):
+        """
+        Initialize the controller.
+
+        Args:
+            host (str): Host of the soffice UNO acceptor
+            port (int): Port of the soffice UNO acceptor
+            reconnect_interval (float): Minimum seconds between failed connection attempts
+        """
+        self.url = f"uno:socket,host={host},port={port};urp;StarOffice.ComponentContext"
+        self.reconnect_interval = reconnect_interval
+
+        self._lock = threading.Lock()
+        self._desktop = None
+        self._document = None
+        self._last_failure = 0.0
+
+    def is_available(self):
+        """
+        Check whether UNO bindings are importable.
+
+        Returns:
+            bool: True if pyuno is installed
+        """
+        return UNO_AVAILABLE
+
+    def _connect(self):
+        """Open (or reuse) the UNO bridge and return the desktop object."""
+        if self._desktop is not None:
+            return self._desktop
+
+        now = time.monotonic()
+        if now - self._last_failure < self.reconnect_interval:
+            raise ImpressUnavailableError("UNO connection recently failed")
+
+        try:
+            local_context = uno.getComponentContext()
+            resolver = local_context.ServiceManager.createInstanceWithContext(
+                "com.sun.star.bridge.UnoUrlResolver", local_context
+            )
+            context = resolver.resolve(self.url)
+            self._desktop = context.ServiceManager.createInstanceWithContext(
+                "com.sun.star.frame.Desktop", context
+            )
+            logger.info("Connected to LibreOffice over UNO (%s)", self.url)
+            return self._desktop
+        except (NoConnectException, UnoRuntimeException) as e:
+            self._last_failure = now
+            raise ImpressUnavailableError(f"Cannot connect to soffice: {e}") from e
+
+    def _reset(self):
+        """Drop cached UNO objects so the next call reconnects."""
+        self._desktop = None
+        self._document = None
+
+    def _find_document(self):
+        """Return the presentation document, preferring the cached one."""
+        if self._document is not None:
+            return self._document
+
+        desktop = self._connect()
+        current = desktop.getCurrentComponent()
+        if current is not None and current.supportsService(PRESENTATION_SERVICE):
+            self._document = current
+            return current
+
+        components = desktop.getComponents().createEnumeration()
+        while components.hasMoreElements():
+            component = components.nextElement()
+            if component.supportsService(PRESENTATION_SERVICE):
+                self._document = component
+                return component
+
+        raise ImpressUnavailableError("No Impress presentation is open")
+
+    def _call(self, action):
+        """
+        Run an action against the presentation, reconnecting once if the bridge died.
+
+        Args:
+            action (callable): Function taking the presentation document
+
+        Returns:
+            dict: Slide state after the action
+
+        Raises:
+            ImpressUnavailableError: If UNO is not installed or soffice is unreachable
+        """
+        if not UNO_AVAILABLE:
+            raise ImpressUnavailableError("pyuno is not installed")
+
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    document = self._find_document()
+                    action(document)
+                    return self._read_state(document)
+                except (DisposedException, UnoRuntimeException) as e:
+                    logger.warning("UNO bridge lost (attempt %s): %s", attempt + 1, e)
+                    self._reset()
+            raise ImpressUnavailableError("UNO bridge unavailable after reconnect")
+
+    def _controller(self, document, wait=0.0):
+        """Return the running slideshow controller, optionally waiting for it to appear."""
+        presentation = document.getPresentation()
+        deadline = time.monotonic() + wait
+        while True:
+            controller = presentation.getController()
+            if controller is not None or time.monotonic() >= deadline:
+                return controller
+            time.sleep(0.02)
+
+    def _read_state(self, document):
+        """Build the slide state dictionary for a document."""
+        controller = self._controller(document)
+        if controller is None:
+            return {
+                "running": False,
+                "current": None,
+                "total": document.getDrawPages().getCount(),
+            }
+        return {
+            "running": True,
+            "current": controller.getCurrentSlideIndex() + 1,
+            "total": controller.getSlideCount(),
+        }
+
+    def _require_controller(self, document):
+        controller = self._controller(document)
+        if controller is None:
+            raise ImpressUnavailableError("Slideshow is not running")
+        return controller
+
+    def get_state(self):
+        """
+        Get the current slide state.
+
+        Returns:
+            dict: {'running': bool, 'current': int or None, 'total': int}
+        """
+        return self._call(lambda document: None)
+
+    def next_slide(self):
+        """Advance the running slideshow."""
+        return self._call(lambda document: self._require_controller(document).gotoNextSlide())
+
+    def previous_slide(self):
+        """Go back one slide in the running slideshow."""
+        return self._call(lambda document: self._require_controller(document).gotoPreviousSlide())
+
+    def goto_slide(self, number):
+        """
+        Jump to a slide.
+
+        Args:
+            number (int): 1-based slide number; negative values count from the end
+        """
+        def action(document):
+            controller = self._require_controller(document)
+            total = controller.getSlideCount()
+            index = number - 1 if number > 0 else total + number
+            controller.gotoSlideIndex(max(0, min(index, total - 1)))
+        return self._call(action)
+
+    def start_slideshow(self):
+        """Start the slideshow and wait briefly for its controller."""
+        def action(document):
+            presentation = document.getPresentation()
+            if not presentation.isRunning():
+                presentation.start()
+                self._controller(document, wait=1.0)
+        return self._call(action)
+
+    def end_slideshow(self):
+        """End the running slideshow."""
+        return self._call(lambda document: document.getPresentation().end())
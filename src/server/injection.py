@@ -0,0 +1,128 @@
+"""Keystroke injection backends used by CommandHandler."""
+
+from abc import ABC, abstractmethod
+import logging
+import subprocess
+import sys
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class InjectionAbortedError(RuntimeError):
+    """Raised when the user aborts keystroke injection (e.g. the PyAutoGUI failsafe)."""
+
+
+class KeyInjector(ABC):
+    """Interface for sending keystrokes to the foreground presentation."""
+
+    @abstractmethod
+    def press(self, key):
+        """Press and release a single key."""
+
+    @abstractmethod
+    def hotkey(self, *keys):
+        """Press a key combination, e.g. hotkey('alt', 'p')."""
+
+    @abstractmethod
+    def write(self, text):
+        """Type a string."""
+
+
+def _enable_x11_access():
+    """Allow local X11 clients; needed for pyautogui under Wayland. Must run before importing it."""
+    try:
+        subprocess.run(['xhost', '+local:'], capture_output=True, check=False)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        pass
+
+
+class PyAutoGUIInjector(KeyInjector):
+    """Sends real keystrokes through pyautogui."""
+
+    def __init__(self, pause=0.5, failsafe=True):
+        """
+        Initialize the injector. pyautogui is imported here, not at module load,
+        so headless tools can use the other backends without a display.
+
+        Args:
+            pause (float): Pause after each pyautogui action in seconds
+            failsafe (bool): Abort when the mouse is moved to a screen corner
+        """
+        if sys.platform == 'linux':
+            _enable_x11_access()
+
+        import pyautogui
+
+        pyautogui.PAUSE = pause
+        pyautogui.FAILSAFE = failsafe
+        self._pyautogui = pyautogui
+
+    def _run(self, action, *args):
+        try:
+            action(*args)
+        except self._pyautogui.FailSafeException as e:
+            raise InjectionAbortedError(f"PyAutoGUI failsafe triggered: {e}") from e
+
+    def press(self, key):
+        self._run(self._pyautogui.press, key)
+
+    def hotkey(self, *keys):
+        self._run(self._pyautogui.hotkey, *keys)
+
+    def write(self, text):
+        self._run(self._pyautogui.write, text)
+
+
+class NullInjector(KeyInjector):
+    """
+    Discards keystrokes, for benchmarks and headless runs.
+
+    An optional fixed delay stands in for the cost of real injection.
+    """
+
+    def __init__(self, delay=0.0):
+        """
+        Initialize the injector.
+
+        Args:
+            delay (float): Seconds to block per action
+        """
+        self.delay = delay
+        self.count = 0
+
+    def _inject(self, action, args):
+        self.count += 1
+        if self.delay:
+            time.sleep(self.delay)
+
+    def press(self, key):
+        self._inject("press", (key,))
+
+    def hotkey(self, *keys):
+        self._inject("hotkey", keys)
+
+    def write(self, text):
+        self._inject("write", (text,))
+
+
+class RecordingInjector(NullInjector):
+    """Discards keystrokes but keeps (perf_counter time, action, args) of the most recent ones."""
+
+    def __init__(self, delay=0.0, maxlen=10000):
+        """
+        Initialize the injector.
+
+        Args:
+            delay (float): Seconds to block per action
+            maxlen (int): Number of recorded actions kept
+        """
+        super().__init__(delay)
+        self.actions = deque(maxlen=maxlen)
+
+    def _inject(self, action, args):
+        self.actions.append((time.perf_counter(), action, args))
+        super()._inject(action, args)
@@ -0,0 +1,166 @@
+"""User-defined macro commands, validated and compiled into flat keystroke schedules at startup."""
+
+import re
+import time
+
+# Key names accepted in macros (a subset of pyautogui.KEYBOARD_KEYS that is
+# portable across Windows, macOS and X11)
+KEY_NAMES = frozenset(
+    [chr(c) for c in range(ord("a"), ord("z") + 1)]
+    + [str(d) for d in range(10)]
+    + [f"f{n}" for n in range(1, 25)]
+    + list("`-=[]\\;',./")
+    + [
+        "alt", "altleft", "altright", "backspace", "capslock", "ctrl", "ctrlleft", "ctrlright",
+        "command", "del", "delete", "down", "end", "enter", "esc", "escape", "home", "insert",
+        "left", "option", "pagedown", "pageup", "pgdn", "pgup", "pause", "playpause", "printscreen",
+        "return", "right", "shift", "shiftleft", "shiftright", "space", "tab", "up", "volumedown",
+        "volumemute", "volumeup", "win", "winleft", "winright",
+    ]
+)
+
+MACRO_NAME_PATTERN = re.compile(r"^[A-Z][A-Z0-9_]{0,31}$")
+
+
+class MacroError(ValueError):
+    """A macro definition is invalid."""
+
+
+class Macro:
+    """
+    A compiled macro: keystroke actions at fixed offsets from its start.
+
+    Waits are folded into the offsets, so running a macro is a single loop
+    over (offset, action, args) without any parsing.
+    """
+
+    __slots__ = ("name", "steps", "duration")
+
+    def __init__(self, name, steps):
+        self.name = name
+        self.steps = tuple(steps)  # (seconds from start, injector method name, args)
+        self.duration = self.steps[-1][0] if self.steps else 0.0
+
+
+def _compile_step(step):
+    """
+    Compile one step.
+
+    Returns:
+        tuple: (wait seconds or None, injector method name or None, args)
+    """
+    if isinstance(step, str):
+        keys = [key.strip().lower() for key in step.split("+")]
+        unknown = [key for key in keys if key not in KEY_NAMES]
+        if unknown or not all(keys):
+            raise MacroError(f"unknown key in '{step}'")
+        if len(keys) == 1:
+            return None, "press", (keys[0],)
+        return None, "hotkey", tuple(keys)
+
+    if isinstance(step, dict) and len(step) == 1:
+        (kind, value), = step.items()
+        if kind == "wait":
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise MacroError(f"wait must be a non-negative number of seconds, got {value!r}")
+            return float(value), None, ()
+        if kind == "type":
+            if not isinstance(value, str) or not value.isprintable() or not value:
+                raise MacroError(f"type needs printable text, got {value!r}")
+            return None, "write", (value,)
+
+    raise MacroError(f"invalid step {step!r} (expected a key, 'ctrl+key', {{'wait': s}} or {{'type': text}})")
+
+
+def compile_macro(name, steps, max_steps=64, max_duration=30.0):
+    """
+    Validate a macro definition and compile it.
+
+    Args:
+        name (str): Command name, e.g. 'BLACKOUT_NEXT'
+        steps (list): Keys ('right'), key combinations ('alt+p'),
+            {'wait': seconds} and {'type': text}
+        max_steps (int): Maximum number of keystroke actions
+        max_duration (float): Maximum total wait in seconds
+
+    Returns:
+        Macro: The compiled macro
+
+    Raises:
+        MacroError: If the definition is invalid
+    """
+    if not isinstance(steps, list) or not steps:
+        raise MacroError(f"macro {name}: steps must be a non-empty list")
+
+    offset = 0.0
+    compiled = []
+    for index, step in enumerate(steps):
+        try:
+            wait, action, args = _compile_step(step)
+        except MacroError as e:
+            raise MacroError(f"macro {name}, step {index + 1}: {e}") from None
+        if wait is not None:
+            offset += wait
+        else:
+            compiled.append((offset, action, args))
+
+    if not compiled:
+        raise MacroError(f"macro {name}: no keystrokes")
+    if len(compiled) > max_steps:
+        raise MacroError(f"macro {name}: {len(compiled)} keystrokes exceed the limit of {max_steps}")
+    if offset > max_duration:
+        raise MacroError(f"macro {name}: waits total {offset:g} s, over the limit of {max_duration:g} s")
+    return Macro(name, compiled)
+
+
+def compile_macros(definitions, reserved=(), max_steps=64, max_duration=30.0):
+    """
+    Compile a macro registry.
+
+    Args:
+        definitions (dict): Macro name -> steps
+        reserved (iterable): Built-in command names that macros may not shadow
+        max_steps (int): Maximum keystroke actions per macro
+        max_duration (float): Maximum total wait per macro in seconds
+
+    Returns:
+        dict: Upper-case name -> Macro
+
+    Raises:
+        MacroError: If any definition is invalid
+    """
+    if not isinstance(definitions, dict):
+        raise MacroError("macros must be an object mapping names to step lists")
+
+    reserved = set(reserved)
+    macros = {}
+    for name, steps in definitions.items():
+        key = name.upper() if isinstance(name, str) else name
+        if not isinstance(key, str) or not MACRO_NAME_PATTERN.match(key):
+            raise MacroError(f"invalid macro name {name!r} (letters, digits and '_', starting with a letter)")
+        if key in reserved:
+            raise MacroError(f"macro {key} would shadow a built-in command")
+        if key in macros:
+            raise MacroError(f"macro {key} is defined twice")
+        macros[key] = compile_macro(key, steps, max_steps, max_duration)
+    return macros
+
+
+def run_macro(macro, injector, sleep=time.sleep):
+    """
+    Play a compiled macro, keeping each keystroke on its offset from the start.
+
+    Time spent injecting (e.g. pyautogui's pause) is absorbed by the following
+    wait instead of accumulating.
+
+    Args:
+        macro (Macro): The macro to run
+        injector (KeyInjector): Keystroke backend
+        sleep (callable): Sleep function; gevent.sleep when running on the event loop
+    """
+    started = time.perf_counter()
+    for offset, action, args in macro.steps:
+        delay = started + offset - time.perf_counter()
+        if delay > 0:
+            sleep(delay)
+        getattr(injector, action)(*args)
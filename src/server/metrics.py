@@ -0,0 +1,263 @@
+"""Minimal Prometheus-style metrics with a text exposition endpoint."""
+
+import gc
+import math
+from bisect import bisect_left
+
+from greenlet import greenlet
+
+# Latency buckets in seconds, from sub-millisecond handler work to slow keystroke injection
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Event loop stalls, from just noticeable to frozen
+BLOCK_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames, labelvalues, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing counter, optionally split by label values."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        Initialize the counter.
+
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            labelnames (tuple): Label names; inc() takes values in the same order
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def inc(self, *labelvalues, amount=1):
+        """Increment the counter for the given label values."""
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues):
+        """Get the current value for the given label values."""
+        return self._values.get(labelvalues, 0)
+
+    def samples(self):
+        for labelvalues, value in sorted(self._values.items()):
+            yield self.name, _format_labels(self.labelnames, labelvalues), value
+
+
+class Gauge(Counter):
+    """Value that can go up and down, or be computed at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        """
+        Initialize the gauge.
+
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            labelnames (tuple): Label names
+            function (callable): Optional callable returning {labelvalues tuple: value},
+                evaluated on every scrape instead of stored values
+        """
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def set(self, value, *labelvalues):
+        """Set the gauge for the given label values."""
+        self._values[labelvalues] = value
+
+    def samples(self):
+        if self.function is not None:
+            self._values = self.function()
+        return super().samples()
+
+
+class Histogram:
+    """Distribution of observations in fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        """
+        Initialize the histogram.
+
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            labelnames (tuple): Label names
+            buckets (tuple): Sorted upper bounds; +Inf is implied
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}  # labelvalues -> [per-bucket counts..., +Inf count, sum]
+
+    def observe(self, value, *labelvalues):
+        """Record one observation for the given label values."""
+        state = self._values.get(labelvalues)
+        if state is None:
+            state = self._values[labelvalues] = [0] * (len(self.buckets) + 2)
+        # Counts are stored per bucket and accumulated only when rendering
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def snapshot(self, *labelvalues):
+        """
+        Get cumulative bucket counts, total count and sum.
+
+        Returns:
+            tuple: (list of (upper bound, cumulative count), count, sum)
+        """
+        state = self._values.get(labelvalues) or [0] * (len(self.buckets) + 2)
+        cumulative = []
+        running = 0
+        for bound, count in zip(self.buckets + (math.inf,), state[:-1]):
+            running += count
+            cumulative.append((bound, running))
+        return cumulative, running, state[-1]
+
+    def samples(self):
+        for labelvalues in sorted(self._values):
+            buckets, count, total = self.snapshot(*labelvalues)
+            for bound, cumulative in buckets:
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, labelvalues, le), cumulative
+            yield f"{self.name}_count", _format_labels(self.labelnames, labelvalues), count
+            yield f"{self.name}_sum", _format_labels(self.labelnames, labelvalues), total
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered in the Prometheus text format.
+
+    Recording is a dictionary update with no locking; metrics are recorded
+    from the server's event loop, so the cost per event stays negligible.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics = []
+
+    def register(self, metric):
+        """Add a metric and return it."""
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), function=None):
+        return self.register(Gauge(name, documentation, labelnames, function))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        """
+        Render all metrics.
+
+        Returns:
+            str: Prometheus text exposition format (version 0.0.4)
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+def count_greenlets():
+    """Count live greenlets. Walks the heap, so only call this at scrape time."""
+    return {(): sum(1 for obj in gc.get_objects() if isinstance(obj, greenlet))}
+
+
+class ServerMetrics:
+    """Metrics recorded by PPTServer."""
+
+    def __init__(self, state_function, lane_depth_function=None):
+        """
+        Initialize the server metrics.
+
+        Args:
+            state_function (callable): Returns the current ServerState
+            lane_depth_function (callable): Returns the number of events queued in the controller's lane
+        """
+        self.registry = MetricsRegistry()
+        r = self.registry
+
+        self.events_received = r.counter(
+            "ppt_events_received_total", "Socket.IO events received, by event type.", ("event",))
+        self.command_duration = r.histogram(
+            "ppt_command_duration_seconds", "Time spent handling a command event, by command.", ("command",))
+        self.injection_duration = r.histogram(
+            "ppt_injection_duration_seconds", "Time spent injecting keystrokes or calling the presentation backend.")
+        self.laser_events = r.counter(
+            "ppt_laser_events_total", "Laser pointer move events applied to the overlay.")
+        self.laser_dropped = r.counter(
+            "ppt_laser_dropped_total", "Laser pointer move events dropped, by reason.", ("reason",))
+        self.ink_points = r.counter(
+            "ppt_ink_points_total", "Ink points by stage: received, drawn after simplification, "
+            "dropped while the overlay was behind, or in invalid batches.", ("stage",))
+        self.connects = r.counter(
+            "ppt_client_connects_total", "Client connections accepted.")
+        self.disconnects = r.counter(
+            "ppt_client_disconnects_total", "Client disconnections.")
+        self.rate_limited = r.counter(
+            "ppt_rate_limited_total", "Events over the per-client rate limit, by event and action "
+            "(coalesced, rejected or dropped).", ("event", "action"))
+        self.sessions_resumed = r.counter(
+            "ppt_sessions_resumed_total", "Reconnects that resumed an existing session.")
+        self.duplicate_commands = r.counter(
+            "ppt_duplicate_commands_total", "Resent commands skipped by sequence number.")
+        self.heartbeat_rtt = r.histogram(
+            "ppt_heartbeat_rtt_seconds", "Round-trip time of application heartbeats.")
+        self.dead_clients = r.counter(
+            "ppt_dead_clients_total", "Controllers disconnected for not answering heartbeats.")
+        self.lane_coalesced = r.counter(
+            "ppt_lane_coalesced_total", "Controller events superseded while queued behind a command, by event.",
+            ("event",))
+        self.hub_blocks = r.counter(
+            "ppt_hub_blocks_total", "Event loop stalls over HUB_MONITOR_THRESHOLD, by blocking site.", ("site",))
+        self.hub_block_duration = r.histogram(
+            "ppt_hub_block_seconds", "Duration of event loop stalls.", buckets=BLOCK_BUCKETS)
+        self.state_deltas = r.counter(
+            "ppt_state_deltas_total", "Coalesced presentation state deltas sent to clients.")
+        self.emit_failures = r.counter(
+            "ppt_emit_failures_total", "Failed Socket.IO emits, by event.", ("event",))
+
+        def server_state():
+            current = state_function()
+            return {(state.value,): int(state is current) for state in type(current)}
+
+        r.gauge("ppt_server_state", "Current server state (1 for the active state).", ("state",),
+                function=server_state)
+        r.gauge("ppt_greenlets", "Live greenlets in the process.", function=count_greenlets)
+        if lane_depth_function is not None:
+            r.gauge("ppt_lane_depth", "Controller events queued behind a running command.",
+                    function=lambda: {(): lane_depth_function()})
+
+    def render(self):
+        """Render all server metrics in the Prometheus text format."""
+        return self.registry.render()
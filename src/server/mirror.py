@@ -0,0 +1,252 @@
+"""Screen mirroring stream that sends only the tiles that changed."""
+
+import io
+import logging
+import time
+
+import gevent
+import numpy as np
+from gevent.event import Event
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FORMATS = {"jpeg": "JPEG", "webp": "WEBP"}
+
+
+class FrameDiffer:
+    """Captures the screen and finds dirty tiles against the previous frame."""
+
+    def __init__(self, tile_size=64, scale=0.5, fmt="jpeg", quality=60):
+        """
+        Initialize the differ.
+
+        Args:
+            tile_size (int): Tile edge length in (scaled) pixels
+            scale (float): Capture downscale factor (0.1-1.0)
+            fmt (str): Tile image format ('jpeg' or 'webp')
+            quality (int): Encoder quality (1-100)
+        """
+        self.tile_size = tile_size
+        self.scale = scale
+        self.fmt = fmt if fmt in IMAGE_FORMATS else "jpeg"
+        self.quality = quality
+        self._previous = None
+
+    def reset(self):
+        """Forget the previous frame so the next one is sent in full."""
+        self._previous = None
+
+    def _grab(self):
+        """Capture the screen as an RGB array padded to whole tiles."""
+        from PIL import ImageGrab
+
+        image = ImageGrab.grab().convert("RGB")
+        if self.scale != 1.0:
+            size = (max(1, int(image.width * self.scale)), max(1, int(image.height * self.scale)))
+            image = image.resize(size, Image.BILINEAR)
+
+        frame = np.asarray(image)
+        t = self.tile_size
+        pad_h = -frame.shape[0] % t
+        pad_w = -frame.shape[1] % t
+        if pad_h or pad_w:
+            frame = np.pad(frame, ((0, pad_h), (0, pad_w), (0, 0)))
+        return frame, image.width, image.height
+
+    def _dirty_tiles(self, frame):
+        """Return a boolean grid (rows x cols) of tiles that changed."""
+        t = self.tile_size
+        rows, cols = frame.shape[0] // t, frame.shape[1] // t
+        if self._previous is None or self._previous.shape != frame.shape:
+            return np.ones((rows, cols), dtype=bool)
+        changed = frame != self._previous
+        return changed.reshape(rows, t, cols, t, 3).any(axis=(1, 3, 4))
+
+    def next_frame(self):
+        """
+        Capture, diff and encode one frame. Runs in a worker thread.
+
+        Horizontally adjacent dirty tiles are merged into one rectangle so a
+        full-screen change is sent as one image per tile row.
+
+        Returns:
+            dict or None: Frame payload, or None if nothing changed
+        """
+        frame, width, height = self._grab()
+        dirty = self._dirty_tiles(frame)
+        self._previous = frame
+
+        if not dirty.any():
+            return None
+
+        t = self.tile_size
+        tiles = []
+        for row in np.flatnonzero(dirty.any(axis=1)):
+            cols = np.flatnonzero(dirty[row])
+            # Split the dirty columns into consecutive runs
+            runs = np.split(cols, np.flatnonzero(np.diff(cols) != 1) + 1)
+            for run in runs:
+                x, y = int(run[0]) * t, int(row) * t
+                w = min(len(run) * t, width - x)
+                h = min(t, height - y)
+                if w <= 0 or h <= 0:
+                    continue
+                buffer = io.BytesIO()
+                Image.fromarray(frame[y:y + h, x:x + w]).save(
+                    buffer, IMAGE_FORMATS[self.fmt], quality=self.quality
+                )
+                tiles.append({"x": x, "y": y, "w": w, "h": h, "data": buffer.getvalue()})
+
+        return {
+            "width": width,
+            "height": height,
+            "format": self.fmt,
+            "keyframe": bool(dirty.all()),
+            "tiles": tiles,
+        }
+
+
+class ScreenMirror:
+    """
+    Streams dirty screen tiles to one subscriber, paced by its acknowledgements.
+
+    Only one frame is in flight at a time. The frame interval follows the
+    measured acknowledgement round trip, and backs off towards the idle
+    interval while the screen is static.
+    """
+
+    def __init__(self, emit, min_interval=0.05, max_interval=1.0, idle_interval=1.0,
+                 ack_timeout=2.0, **differ_options):
+        """
+        Initialize the mirror.
+
+        Args:
+            emit (callable): emit(event, data, to=sid) used to send frames
+            min_interval (float): Shortest time between frames in seconds
+            max_interval (float): Longest time between frames while the screen changes
+            idle_interval (float): Capture interval while the screen is static
+            ack_timeout (float): Seconds to wait for a frame acknowledgement
+            **differ_options: Passed to FrameDiffer
+        """
+        self.emit = emit
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_interval = idle_interval
+        self.ack_timeout = ack_timeout
+        self.differ_options = differ_options
+
+        self.sid = None
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self._differ = None
+        self._generation = 0  # Bumped on every (un)subscribe to retire the running loop
+        self._frame_id = 0
+        self._acked_id = 0
+        self._ack_event = Event()
+        self._interval = min_interval
+
+    @property
+    def active(self):
+        """bool: True while a subscriber is being streamed to."""
+        return self.sid is not None
+
+    def subscribe(self, sid, options=None):
+        """
+        Start streaming to a client, replacing any previous subscriber.
+
+        Args:
+            sid (str): Socket.IO session id
+            options (dict): Optional 'format', 'quality' and 'scale' overrides
+        """
+        options = options if isinstance(options, dict) else {}
+        differ_options = dict(self.differ_options)
+        if options.get("format") in IMAGE_FORMATS:
+            differ_options["fmt"] = options["format"]
+        if isinstance(options.get("quality"), int):
+            differ_options["quality"] = max(1, min(options["quality"], 95))
+        if isinstance(options.get("scale"), (int, float)):
+            differ_options["scale"] = max(0.1, min(float(options["scale"]), 1.0))
+
+        self.stop()
+        self.sid = sid
+        self._differ = FrameDiffer(**differ_options)
+        self._interval = self.min_interval
+        self._acked_id = self._frame_id
+        gevent.spawn(self._run, sid, self._generation)
+        logger.info("Screen mirroring started for %s", sid)
+
+    def ack(self, sid, frame_id):
+        """
+        Record a frame acknowledgement from the subscriber.
+
+        Args:
+            sid (str): Socket.IO session id
+            frame_id (int): Id of the acknowledged frame
+        """
+        if sid == self.sid and isinstance(frame_id, int) and frame_id > self._acked_id:
+            self._acked_id = frame_id
+            self._ack_event.set()
+
+    def request_keyframe(self, sid):
+        """Send the whole screen with the next frame, e.g. after a client reload."""
+        differ = self._differ
+        if sid == self.sid and differ is not None:
+            differ.reset()
+
+    def stop(self, sid=None):
+        """
+        Stop streaming.
+
+        Args:
+            sid (str): Only stop if this is the current subscriber; None stops unconditionally
+        """
+        if sid is not None and sid != self.sid:
+            return
+        # The capture loop exits on its own once the generation changes
+        if self.sid is not None:
+            logger.info("Screen mirroring stopped for %s", self.sid)
+        self._generation += 1
+        self.sid = None
+        self._differ = None
+        self._ack_event.set()
+
+    def _run(self, sid, generation):
+        """Capture loop; capture and encoding run in the hub's thread pool."""
+        threadpool = gevent.get_hub().threadpool
+        differ = self._differ
+        while self._generation == generation:
+            started = time.monotonic()
+            try:
+                frame = threadpool.apply(differ.next_frame)
+            except Exception as e:
+                logger.error("Screen capture failed, stopping mirror: %s", e)
+                self.emit("error", {"message": "Screen mirroring unavailable"}, to=sid)
+                if self._generation == generation:
+                    self.stop()
+                return
+
+            if frame is None:
+                # Static screen: back off towards the idle interval
+                self._interval = min(self.idle_interval, self._interval * 1.5)
+                gevent.sleep(self._interval)
+                continue
+
+            self._frame_id += 1
+            frame["id"] = self._frame_id
+            self._ack_event.clear()
+            self.emit("mirror_frame", frame, to=sid)
+            self.frames_sent += 1
+            self.bytes_sent += sum(len(tile["data"]) for tile in frame["tiles"])
+
+            acked = self._ack_event.wait(self.ack_timeout) and self._acked_id >= frame["id"]
+            round_trip = time.monotonic() - started
+            if acked:
+                # Smooth towards the observed round trip
+                target = max(self.min_interval, min(round_trip, self.max_interval))
+                self._interval = 0.7 * self._interval + 0.3 * target
+            else:
+                logger.debug("Mirror frame %s not acknowledged in time", frame['id'])
+                self._interval = self.max_interval
+
+            gevent.sleep(max(0.0, self._interval - (time.monotonic() - started)))
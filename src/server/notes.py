@@ -0,0 +1,168 @@
+"""Speaker notes and slide titles extracted from .pptx files."""
+
+import logging
+import posixpath
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from xml.etree import ElementTree
+
+from ..utils import hash_file
+
+logger = logging.getLogger(__name__)
+
+NS = {
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+NOTES_SLIDE_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide"
+TITLE_PLACEHOLDERS = {"title", "ctrTitle"}
+
+
+def _read_rels(archive, part):
+    """Map relationship ids to (type, absolute part name) for a package part."""
+    directory, name = posixpath.split(part)
+    rels_part = posixpath.join(directory, "_rels", f"{name}.rels")
+    try:
+        root = ElementTree.fromstring(archive.read(rels_part))
+    except KeyError:
+        return {}
+
+    rels = {}
+    for rel in root.findall("rel:Relationship", NS):
+        target = rel.get("Target", "")
+        # Absolute targets ("/ppt/notesSlides/...") are relative to the package root
+        if target.startswith("/"):
+            target = target.lstrip("/")
+        else:
+            target = posixpath.join(directory, target)
+        rels[rel.get("Id")] = (rel.get("Type"), posixpath.normpath(target))
+    return rels
+
+
+def _placeholder_text(root, placeholder_types, separator):
+    """Join the text of shapes whose placeholder type is in placeholder_types."""
+    texts = []
+    for shape in root.iter(f"{{{NS['p']}}}sp"):
+        placeholder = shape.find("p:nvSpPr/p:nvPr/p:ph", NS)
+        if placeholder is None or placeholder.get("type") not in placeholder_types:
+            continue
+        for paragraph in shape.iter(f"{{{NS['a']}}}p"):
+            line = "".join(t.text or "" for t in paragraph.iter(f"{{{NS['a']}}}t"))
+            if line.strip():
+                texts.append(line.strip())
+    return separator.join(texts)
+
+
+def parse_pptx(path, max_chars=4000):
+    """
+    Extract titles and speaker notes from a .pptx file.
+
+    Args:
+        path (str or Path): Presentation file
+        max_chars (int): Notes longer than this are truncated
+
+    Returns:
+        tuple: One (title, notes) tuple per slide, in presentation order
+
+    Raises:
+        ValueError: If the file is not a readable .pptx package
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            presentation_part = "ppt/presentation.xml"
+            presentation = ElementTree.fromstring(archive.read(presentation_part))
+            presentation_rels = _read_rels(archive, presentation_part)
+
+            slides = []
+            for slide_id in presentation.findall("p:sldIdLst/p:sldId", NS):
+                rel = presentation_rels.get(slide_id.get(f"{{{NS['r']}}}id"))
+                if rel is None:
+                    continue
+                slide_part = rel[1]
+                title = _placeholder_text(ElementTree.fromstring(archive.read(slide_part)), TITLE_PLACEHOLDERS, " ")
+
+                notes = ""
+                for rel_type, target in _read_rels(archive, slide_part).values():
+                    if rel_type == NOTES_SLIDE_REL:
+                        notes = _placeholder_text(ElementTree.fromstring(archive.read(target)), {"body"}, "\n")
+                        break
+
+                if len(notes) > max_chars:
+                    notes = notes[:max_chars - 1] + "…"
+                slides.append((title, notes))
+            return tuple(slides)
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise ValueError(f"Not a valid .pptx file: {e}") from e
+
+
+class NotesLibrary:
+    """
+    Bounded cache of parsed notes indexes.
+
+    Files are looked up by (path, mtime, size) first, so unchanged decks are
+    never re-read; a content hash lets renamed or touched copies reuse an
+    existing index. At most max_decks indexes are kept in memory.
+    """
+
+    def __init__(self, max_decks=4, max_chars=4000):
+        """
+        Initialize the library.
+
+        Args:
+            max_decks (int): Number of indexes kept in memory
+            max_chars (int): Per-slide notes length limit
+        """
+        self.max_decks = max_decks
+        self.max_chars = max_chars
+        self._lock = threading.Lock()
+        self._by_stat = {}  # (path, mtime_ns, size) -> content hash
+        self._indexes = OrderedDict()  # content hash -> slides tuple
+
+    def load(self, path):
+        """
+        Load the notes index of a deck, parsing it only if it is not cached.
+
+        Blocking; callers on an event loop should run this off-loop.
+
+        Args:
+            path (str or Path): Presentation file
+
+        Returns:
+            tuple: One (title, notes) tuple per slide
+
+        Raises:
+            ValueError: If the file is missing or not a .pptx package
+        """
+        path = Path(path).expanduser()
+        if path.suffix.lower() != ".pptx" or not path.is_file():
+            raise ValueError(f"Not a .pptx file: {path}")
+
+        stat = path.stat()
+        stat_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            digest = self._by_stat.get(stat_key)
+            if digest in self._indexes:
+                self._indexes.move_to_end(digest)
+                return self._indexes[digest]
+
+        digest = hash_file(path)
+        with self._lock:
+            self._by_stat[stat_key] = digest
+            if digest in self._indexes:
+                self._indexes.move_to_end(digest)
+                return self._indexes[digest]
+
+        slides = parse_pptx(path, self.max_chars)
+        logger.info("Indexed notes for %s slides of %s", len(slides), path.name)
+
+        with self._lock:
+            self._indexes[digest] = slides
+            while len(self._indexes) > self.max_decks:
+                evicted, _ = self._indexes.popitem(last=False)
+                self._by_stat = {k: v for k, v in self._by_stat.items() if v != evicted}
+        return slides
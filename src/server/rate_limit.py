@@ -0,0 +1,103 @@
+"""Per-client token-bucket rate limiting for Socket.IO events."""
+
+import time
+
+
+class TokenBucket:
+    """Classic token bucket: refills at `rate` tokens per second up to `capacity`."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Maximum tokens (the allowed burst)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def consume(self):
+        """
+        Take one token if available.
+
+        Returns:
+            bool: True if the event is within the limit
+        """
+        self._refill(time.monotonic())
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def wait_time(self):
+        """
+        Get the time until a token is available.
+
+        Returns:
+            float: Seconds (0 if a token is available now)
+        """
+        self._refill(time.monotonic())
+        return max(0.0, (1.0 - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """Token buckets per client sid and event type, created on first use."""
+
+    def __init__(self, limits):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits (dict): Event name -> (events per second, burst); other events are unlimited
+        """
+        self.limits = dict(limits)
+        self._buckets = {}  # sid -> {event: TokenBucket}
+
+    def _bucket(self, sid, event):
+        buckets = self._buckets.get(sid)
+        if buckets is None:
+            buckets = self._buckets[sid] = {}
+        bucket = buckets.get(event)
+        if bucket is None:
+            rate, burst = self.limits[event]
+            bucket = buckets[event] = TokenBucket(rate, burst)
+        return bucket
+
+    def allow(self, sid, event):
+        """
+        Check an event against its client's bucket, consuming a token if allowed.
+
+        Args:
+            sid (str): Client session id
+            event (str): Event name
+
+        Returns:
+            bool: True if the event may be handled now
+        """
+        if event not in self.limits:
+            return True
+        return self._bucket(sid, event).consume()
+
+    def wait_time(self, sid, event):
+        """
+        Get the time until the client may send the event again.
+
+        Returns:
+            float: Seconds
+        """
+        if event not in self.limits:
+            return 0.0
+        return self._bucket(sid, event).wait_time()
+
+    def forget(self, sid):
+        """Drop the buckets of a disconnected client."""
+        self._buckets.pop(sid, None)
@@ -0,0 +1,113 @@
+"""Compact binary recording of inbound Socket.IO events, for replaying live sessions."""
+
+import json
+import logging
+import struct
+import time
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"PPTREC1\n"
+# Record header: payload length, seconds since recording start, sid length, event length
+RECORD_HEADER = struct.Struct("<IdBB")
+
+
+class EventRecorder:
+    """
+    Appends every inbound event to a file as a length-prefixed binary record.
+
+    Each record holds the monotonic time since recording start, the client
+    sid, the event name and the JSON-encoded handler arguments. Writes go
+    through a buffered file, so recording costs an encode and a memory copy
+    per event; the buffer reaches the disk in chunks.
+    """
+
+    def __init__(self, path, buffer_size=64 * 1024):
+        """
+        Open a new recording, replacing any existing file.
+
+        Args:
+            path (Path): Recording file
+            buffer_size (int): Write buffer size in bytes
+        """
+        self.path = path
+        self._file = open(path, "wb", buffering=buffer_size)
+        self._file.write(MAGIC)
+        self._start = time.monotonic()
+        self.count = 0
+        logger.info("Recording events to %s", path)
+
+    @staticmethod
+    def _encode_args(event, args):
+        if event == "connect" and args:
+            # The WSGI environ is neither serializable nor needed to replay a connect
+            args = ({"REMOTE_ADDR": args[0].get("REMOTE_ADDR")},) + tuple(args[1:])
+        return json.dumps(args, separators=(",", ":"), default=repr).encode("utf-8")
+
+    def record(self, sid, event, args):
+        """
+        Append one event.
+
+        Args:
+            sid (str): Client session id
+            event (str): Event name
+            args (tuple): Handler arguments after the sid
+        """
+        if self._file is None:
+            return
+        try:
+            payload = self._encode_args(event, args)
+            sid_bytes = sid.encode("utf-8")[:255]
+            event_bytes = event.encode("utf-8")[:255]
+            self._file.write(RECORD_HEADER.pack(
+                len(payload), time.monotonic() - self._start, len(sid_bytes), len(event_bytes)
+            ))
+            self._file.write(sid_bytes)
+            self._file.write(event_bytes)
+            self._file.write(payload)
+            self.count += 1
+        except (OSError, ValueError) as e:
+            logger.error("Event recording stopped: %s", e)
+            self.close()
+
+    def close(self):
+        """Flush and close the recording."""
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+            logger.info("Recorded %s events to %s", self.count, self.path)
+        except OSError as e:
+            logger.error("Error closing event recording: %s", e)
+        finally:
+            self._file = None
+
+
+def read_recording(path):
+    """
+    Read a recording written by EventRecorder.
+
+    Args:
+        path (Path): Recording file
+
+    Yields:
+        tuple: (seconds since recording start, sid, event, args list)
+
+    Raises:
+        ValueError: If the file is not a recording
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not an event recording: {path}")
+
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return  # End of file, or a record cut short by a crash
+            length, timestamp, sid_length, event_length = RECORD_HEADER.unpack(header)
+            body = f.read(sid_length + event_length + length)
+            if len(body) < sid_length + event_length + length:
+                return
+            sid = body[:sid_length].decode("utf-8")
+            event = body[sid_length:sid_length + event_length].decode("utf-8")
+            yield timestamp, sid, event, json.loads(body[sid_length + event_length:])
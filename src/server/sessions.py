@@ -0,0 +1,124 @@
+"""Resumable controller sessions that survive short disconnects."""
+
+import secrets
+import time
+from collections import OrderedDict
+
+
+class Session:
+    """State a controller gets back when it resumes after a reconnect."""
+
+    __slots__ = ("token", "sid", "laser_enabled", "last_seq", "subscriptions", "expires")
+
+    def __init__(self, token, sid):
+        self.token = token
+        self.sid = sid
+        self.laser_enabled = False
+        self.last_seq = 0  # Highest command sequence number handled
+        self.subscriptions = {}  # Stream name -> subscribe options
+        self.expires = None  # Set while detached
+
+
+class SessionStore:
+    """
+    Sessions keyed by an opaque token, kept for a short TTL after their client disconnects.
+
+    Detached sessions are purged lazily whenever a session is created or
+    resumed, so the store needs no timer.
+    """
+
+    def __init__(self, ttl=30.0, max_sessions=16):
+        """
+        Initialize the store.
+
+        Args:
+            ttl (float): Seconds a detached session stays resumable
+            max_sessions (int): Sessions kept; the oldest detached ones are evicted first
+        """
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # token -> Session
+        self._by_sid = {}
+
+    def _purge(self, keep=()):
+        """
+        Drop expired sessions, then evict sessions over max_sessions.
+
+        Detached sessions are evicted before attached ones, oldest first;
+        the sessions in keep are never evicted.
+        """
+        now = time.monotonic()
+        for token, session in list(self._sessions.items()):
+            if session.expires is not None and session.expires <= now:
+                del self._sessions[token]
+
+        excess = len(self._sessions) - self.max_sessions
+        if excess <= 0:
+            return
+        sessions = [session for session in self._sessions.values() if session not in keep]
+        evicted = [session for session in sessions if session.expires is not None]
+        evicted += [session for session in sessions if session.expires is None]
+        for session in evicted[:excess]:
+            del self._sessions[session.token]
+            if self._by_sid.get(session.sid) is session:
+                del self._by_sid[session.sid]
+
+    def create(self, sid, current_sid=None):
+        """
+        Start a new session for a client.
+
+        Args:
+            sid (str): Client session id
+            current_sid (str): Sid of the current controller, whose session is never evicted
+
+        Returns:
+            Session: The new session
+        """
+        self._purge(self._keep(current_sid))
+        session = Session(secrets.token_urlsafe(16), sid)
+        self._sessions[session.token] = session
+        self._by_sid[sid] = session
+        return session
+
+    def resume(self, token, sid, current_sid=None):
+        """
+        Move an existing session to a new client sid.
+
+        Args:
+            token (str): Token from the session's creation
+            sid (str): The reconnected client's sid
+            current_sid (str): Sid of the current controller, whose session is never evicted
+
+        Returns:
+            Session or None: The session, or None if unknown or expired
+        """
+        session = self._sessions.get(token) if isinstance(token, str) else None
+        self._purge(self._keep(current_sid, session))
+        if session is None or self._sessions.get(token) is not session:
+            return None
+
+        if self._by_sid.get(session.sid) is session:
+            del self._by_sid[session.sid]
+        session.sid = sid
+        session.expires = None
+        self._sessions.move_to_end(token)
+        self._by_sid[sid] = session
+        return session
+
+    def _keep(self, current_sid, *sessions):
+        """Sessions _purge() must not evict: the current controller's and the given ones."""
+        keep = {session for session in sessions if session is not None}
+        current = self._by_sid.get(current_sid)
+        if current is not None:
+            keep.add(current)
+        return keep
+
+    def get(self, sid):
+        """Get the session of a connected client, or None."""
+        return self._by_sid.get(sid)
+
+    def detach(self, sid):
+        """Start the TTL of a disconnected client's session."""
+        session = self._by_sid.pop(sid, None)
+        if session is not None:
+            session.expires = time.monotonic() + self.ttl
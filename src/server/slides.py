@@ -0,0 +1,67 @@
+"""Tracking of the slide currently shown by the presentation."""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SlideTracker:
+    """
+    Best-effort tracker of the current slide number.
+
+    Exact positions reported by a presentation backend (see ImpressController)
+    always win. Without one, the position is inferred from the navigation
+    commands that were sent, clamped to the slide count when it is known.
+    """
+
+    def __init__(self):
+        """Initialize the tracker."""
+        self.current = None  # 1-based slide number, None when no slideshow is running
+        self.total = None
+
+    def reset(self, total=None):
+        """
+        Forget the position, e.g. when a new presentation is opened.
+
+        Args:
+            total (int): Slide count of the new presentation, if known
+        """
+        self.current = None
+        self.total = total
+
+    def apply(self, command, argument="", slide_state=None):
+        """
+        Update the position after a successfully executed command.
+
+        Args:
+            command (str): Normalized command name
+            argument (str): Command argument, if any
+            slide_state (dict): Exact state reported by the backend, if any
+
+        Returns:
+            bool: True if the tracked position changed
+        """
+        previous = self.current
+
+        if slide_state is not None:
+            self.current = slide_state.get("current")
+            self.total = slide_state.get("total") or self.total
+            return self.current != previous
+
+        if command in ("NEXT_SLIDE", "FORWARD"):
+            self.current = (self.current or 0) + 1
+        elif command in ("PREV_SLIDE", "BACK"):
+            self.current = max(1, (self.current or 1) - 1)
+        elif command in ("START_SLIDESHOW", "HOME"):
+            self.current = 1
+        elif command == "END":
+            self.current = self.total
+        elif command == "GOTO_SLIDE":
+            self.current = int(argument)
+        elif command == "END_SLIDESHOW":
+            self.current = None
+
+        if self.current is not None and self.total:
+            self.current = min(self.current, self.total)
+
+        return self.current != previous
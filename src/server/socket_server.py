@@ -1,10 +1,20 @@
 """Socket.IO server for handling client connections and commands."""
 
 import logging
+import math
+import os
+import re
+import secrets
+import socket
+import threading
+import time
+from functools import wraps
+
 import gevent
+from gevent.event import Event
 from gevent.lock import Semaphore
 from enum import Enum
-from flask import Flask
+from flask import Flask, Response, jsonify, request, send_file
 from flask_cors import CORS
 import socketio
 from gevent import pywsgi
@@ -12,10 +22,45 @@ from geventwebsocket.handler import WebSocketHandler
 import engineio.async_drivers.gevent
 
 from .command_handler import CommandHandler
+from .event_lane import EventLane
+from .heartbeat import HeartbeatMonitor
+from .hub_monitor import HubMonitor
+from .impress import ImpressController
+from .metrics import ServerMetrics
+from .mirror import ScreenMirror
+from .notes import NotesLibrary
+from .rate_limit import RateLimiter
+from .sessions import SessionStore
+from .recorder import EventRecorder
+from .slides import SlideTracker
+from .state_sync import StateStore
+from .tracing import TraceRing
+from .thumbnails import ThumbnailCache, ThumbnailService, IMAGE_FORMATS
+from .timer import PresentationTimer, server_clock, time_sync_reply
+from ..network.discovery import ServiceAdvertiser
+from ..network.utils import get_local_ip
+from ..web.assets import load_bundle, choose_encoding
+from ..config import (
+    IMPRESS_UNO_ENABLED, IMPRESS_UNO_HOST, IMPRESS_UNO_PORT, IMPRESS_RECONNECT_INTERVAL,
+    THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_MAX_BYTES, THUMBNAIL_SIZES, THUMBNAIL_FORMATS,
+    THUMBNAIL_MAX_AGE, MIRROR_TILE_SIZE, MIRROR_SCALE, MIRROR_FORMAT, MIRROR_QUALITY,
+    MIRROR_MIN_INTERVAL, MIRROR_MAX_INTERVAL, MIRROR_IDLE_INTERVAL,
+    NOTES_MAX_CHARS, NOTES_CACHE_DECKS, TRACE_BUFFER_SIZE, EVENT_RECORDING_FILE, EVENT_RECORDING_BUFFER,
+    RATE_LIMITS, SESSION_TTL, SESSION_MAX, ENGINEIO_PING_INTERVAL, ENGINEIO_PING_TIMEOUT,
+    HEARTBEAT_ACTIVE_INTERVAL, HEARTBEAT_IDLE_INTERVAL, HEARTBEAT_IDLE_AFTER, HEARTBEAT_TIMEOUT,
+    INK_COLOR, INK_WIDTH, INK_MAX_WIDTH, INK_SIMPLIFY_TOLERANCE, INK_MAX_BATCH_POINTS,
+    WEB_CLIENT_SOURCE_DIR, WEB_CLIENT_DIST_DIR, WEB_ASSET_MAX_AGE, COMMAND_KEY_PAUSE,
+    APP_NAME, APP_VERSION, PROTOCOL_VERSION, DISCOVERY_ENABLED, DISCOVERY_SERVICE_TYPE,
+    MACROS, MACRO_MAX_STEPS, MACRO_MAX_DURATION, STATE_COALESCE_WINDOW, STATE_HISTORY, HUB_MONITOR_THRESHOLD,
+    SHUTDOWN_ACK_TIMEOUT, SHUTDOWN_TIMEOUT
+)
+from ..gui.ink import simplify
 from ..gui.laser_overlay import LaserPointerOverlay
 
 logger = logging.getLogger(__name__)
 
+INK_COLOR_PATTERN = re.compile(r"^#[0-9a-fA-F]{6}$")
+
 
 class ServerState(Enum):
     """Server state enumeration."""
@@ -29,16 +74,99 @@ class ServerState(Enum):
 class PPTServer:
     """Socket.IO server for PowerPoint remote control."""
 
-    def __init__(self):
-        """Initialize the server."""
-        self.app = Flask(__name__)
+    def __init__(self, injector=None, laser_overlay=None, impress_enabled=IMPRESS_UNO_ENABLED, recorder=None,
+                 discovery_enabled=DISCOVERY_ENABLED):
+        """
+        Initialize the server.
+
+        Args:
+            injector (KeyInjector): Keystroke backend; defaults to real keystrokes via pyautogui
+            laser_overlay: Overlay receiving laser pointer moves; defaults to LaserPointerOverlay
+            impress_enabled (bool): Try the LibreOffice Impress UNO backend before keystrokes
+            recorder (EventRecorder): Records inbound events; defaults to one writing to
+                EVENT_RECORDING_FILE if that is set
+            discovery_enabled (bool): Advertise the server over DNS-SD while it runs
+        """
+        self.app = Flask(__name__, static_folder=None)
         CORS(self.app)
 
         self.sio = None
-        self.command_handler = CommandHandler()
-        self.laser_overlay = LaserPointerOverlay()
+        self.metrics = ServerMetrics(lambda: self.state, lambda: len(self.lane))
+        self.traces = TraceRing(TRACE_BUFFER_SIZE)
+        self.recorder = recorder
+        if recorder is None and EVENT_RECORDING_FILE:
+            try:
+                self.recorder = EventRecorder(EVENT_RECORDING_FILE, EVENT_RECORDING_BUFFER)
+            except OSError as e:
+                logger.error("Cannot record events to %s: %s", EVENT_RECORDING_FILE, e)
+        self.rate_limiter = RateLimiter(RATE_LIMITS)
+        self.sessions = SessionStore(SESSION_TTL, SESSION_MAX)
+        self.heartbeat = HeartbeatMonitor(
+            self._emit,
+            self._drop_dead_client,
+            active_interval=HEARTBEAT_ACTIVE_INTERVAL,
+            idle_interval=HEARTBEAT_IDLE_INTERVAL,
+            idle_after=HEARTBEAT_IDLE_AFTER,
+            timeout=HEARTBEAT_TIMEOUT,
+            rtt_observer=self.metrics.heartbeat_rtt.observe,
+            clock=server_clock
+        )
+        self._handlers = {}  # event -> unwrapped handler
+        self._coalesced_laser = {}  # sid -> latest laser position held back by the rate limit
+        # The controller's events, in order; laser moves queued behind a command are coalesced
+        self.lane = EventLane(
+            coalesce=('laser_pointer_move',),
+            on_coalesced=lambda event: self.metrics.lane_coalesced.inc(event)
+        )
+        self.impress = None
+        if impress_enabled:
+            self.impress = ImpressController(
+                IMPRESS_UNO_HOST, IMPRESS_UNO_PORT,
+                reconnect_interval=IMPRESS_RECONNECT_INTERVAL
+            )
+        self.command_handler = CommandHandler(
+            command_timeout=COMMAND_KEY_PAUSE,
+            impress=self.impress,
+            injector=injector,
+            macros=MACROS,  # Runs in the thread pool, so waits inside macros are plain sleeps
+            macro_max_steps=MACRO_MAX_STEPS,
+            macro_max_duration=MACRO_MAX_DURATION
+        )
+        self.thumbnails = self._create_thumbnail_service()
+        self.web_assets = load_bundle(WEB_CLIENT_DIST_DIR, WEB_CLIENT_SOURCE_DIR)
+        self.mirror = None
+
+        # Presentation state
+        self.slides = SlideTracker()
+        self.notes_library = NotesLibrary(NOTES_CACHE_DECKS, NOTES_MAX_CHARS)
+        self.notes = None  # (title, notes) per slide of the open presentation
+        self.timer = PresentationTimer(server_clock)
+        # What every client should see; sent as a snapshot on connect, then as deltas
+        self.presentation_state = StateStore(
+            self._emit,
+            initial={
+                "controller": False,
+                "presentation": None,
+                "slideshow": False,
+                "slide": None,
+                "total": None,
+                "laser": False,
+                "timer": self.timer.state(),
+            },
+            coalesce_window=STATE_COALESCE_WINDOW,
+            history=STATE_HISTORY,
+            on_delta=lambda keys: self.metrics.state_deltas.inc()
+        )
+        self.laser_overlay = laser_overlay if laser_overlay is not None else LaserPointerOverlay()
         self.server = None
         self.port = None
+        # Identifies this host across restarts of the server on a new IP or port
+        self.instance_token = secrets.token_urlsafe(12)
+        self.discovery_enabled = discovery_enabled
+        self.advertiser = None
+        self.hub_monitor = None
+        self._hub = None  # Event loop of the server thread while serving
+        self._server_thread_id = None
 
         # Server state
         self.state = ServerState.STOPPED
@@ -51,110 +179,319 @@ class PPTServer:
 
         # Initialize Socket.IO
         self._initialize_socketio()
+        self._register_routes()
+
+    def _create_thumbnail_service(self):
+        """Create the thumbnail service, or None if the cache directory is unusable."""
+        try:
+            cache = ThumbnailCache(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_MAX_BYTES)
+            return ThumbnailService(cache, THUMBNAIL_SIZES, THUMBNAIL_FORMATS)
+        except Exception as e:
+            logger.error("Thumbnail cache unavailable: %s", e)
+            return None
 
     def _initialize_socketio(self):
         """Initialize Socket.IO server with error handling."""
         try:
-            self.sio = socketio.Server(cors_allowed_origins="*", async_mode='gevent')
+            self.sio = socketio.Server(
+                cors_allowed_origins="*",
+                async_mode='gevent',
+                # Handlers run on the connection's reader; the controller's lane keeps them ordered
+                async_handlers=False,
+                ping_interval=ENGINEIO_PING_INTERVAL,
+                ping_timeout=ENGINEIO_PING_TIMEOUT
+            )
+            self.mirror = ScreenMirror(
+                self._emit,
+                min_interval=MIRROR_MIN_INTERVAL,
+                max_interval=MIRROR_MAX_INTERVAL,
+                idle_interval=MIRROR_IDLE_INTERVAL,
+                tile_size=MIRROR_TILE_SIZE,
+                scale=MIRROR_SCALE,
+                fmt=MIRROR_FORMAT,
+                quality=MIRROR_QUALITY
+            )
+            # Engine.IO would otherwise still spawn a greenlet per message
+            self.sio.eio.async_handlers = False
             self.app.wsgi_app = socketio.WSGIApp(self.sio, self.app.wsgi_app)
             self._register_events()
             logger.info("Socket.IO initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize Socket.IO: {e}")
+            logger.error("Failed to initialize Socket.IO: %s", e)
             self.state = ServerState.ERROR
             raise
 
+    def _on(self, event, ordered=False, traced=False):
+        """
+        Decorator registering a Socket.IO handler that counts (and optionally records)
+        received events and applies the per-client rate limit.
+
+        Args:
+            event (str): Event name
+            ordered (bool): Handle the controller's events of this type in its lane, in order
+                with its other ordered events
+            traced (bool): Start a command trace on receipt and pass it to the handler as its last argument
+        """
+        def register(handler):
+            count = self.metrics.events_received.inc
+            allow = self.rate_limiter.allow
+            seen = self.heartbeat.seen
+
+            @wraps(handler)
+            def counted(*args):
+                count(event)
+                seen(args[0], event)
+                if self.recorder is not None:
+                    self.recorder.record(args[0], event, args[1:])
+                if not allow(args[0], event):
+                    return self._rate_limited(event, args)
+                if traced:
+                    args += (self.traces.start(args[1] if len(args) > 1 else None),)
+                if ordered and args[0] == self.current_client_sid:
+                    return self.lane.submit(event, handler, args)
+                return handler(*args)
+
+            self._handlers[event] = handler
+            self.sio.on(event, counted)
+            return handler
+        return register
+
+    def _rate_limited(self, event, args):
+        """
+        Deal with an event over its client's rate limit, as cheaply as possible.
+
+        Laser moves are coalesced so the latest position is applied once the
+        bucket refills; commands are rejected with a negative ack; anything
+        else is dropped.
+
+        Args:
+            event (str): Event name
+            args (tuple): Handler arguments (sid first)
+        """
+        sid = args[0]
+        data = args[1] if len(args) > 1 else None
+
+        if event == 'laser_pointer_move':
+            self.metrics.rate_limited.inc(event, "coalesced")
+            if sid not in self._coalesced_laser:
+                gevent.spawn_later(self.rate_limiter.wait_time(sid, event), self._flush_laser, sid)
+            self._coalesced_laser[sid] = data
+        elif event == 'command':
+            self.metrics.rate_limited.inc(event, "rejected")
+            command, seq = self._parse_command(data)
+            self._emit("command_ack", {"command": command, "seq": seq, "ok": False, "error": "rate_limited"}, to=sid)
+        else:
+            self.metrics.rate_limited.inc(event, "dropped")
+
+    @staticmethod
+    def _parse_command(data):
+        """
+        Split a command payload into the command string and its sequence number.
+
+        Commands are either a plain string or {"command": str, "seq": int}.
+
+        Returns:
+            tuple: (command, seq or None)
+        """
+        if isinstance(data, dict):
+            seq = data.get('seq')
+            return data.get('command'), seq if isinstance(seq, int) and not isinstance(seq, bool) else None
+        return data, None
+
+    def _resume_session(self, sid, session):
+        """
+        Restore a resumed session's state and tell the client where it left off.
+
+        Args:
+            sid (str): The reconnected client's sid
+            session (Session): Its resumed session
+        """
+        logger.info("Client %s resumed session (last command seq %s)", sid, session.last_seq)
+        if session.laser_enabled and not self.laser_overlay.enabled:
+            self.laser_overlay.enable()
+            self.presentation_state.update(laser=True)
+        mirror_options = session.subscriptions.get('mirror', False)
+        if mirror_options is not False:
+            self.mirror.subscribe(sid, mirror_options)
+
+        self._emit("session_resumed", {
+            "token": session.token,
+            "last_seq": session.last_seq,
+            "laser_enabled": session.laser_enabled,
+            "subscriptions": list(session.subscriptions),
+        }, to=sid)
+        if self.command_handler.slide_state is not None:
+            self._emit("slide_state", self.command_handler.slide_state, to=sid)
+        self._push_notes(sid)
+
+    def _drop_dead_client(self, sid):
+        """Disconnect a controller that stopped answering heartbeats, freeing the slot."""
+        self.metrics.dead_clients.inc()
+        try:
+            self.sio.disconnect(sid)
+        except Exception as e:
+            logger.error("Error disconnecting dead client %s: %s", sid, e)
+
+    def _flush_laser(self, sid):
+        """Apply the newest coalesced laser position of a client, or wait for the next token."""
+        if sid not in self._coalesced_laser:
+            return  # Superseded by a move that was within the limit
+        if not self.rate_limiter.allow(sid, 'laser_pointer_move'):
+            gevent.spawn_later(self.rate_limiter.wait_time(sid, 'laser_pointer_move'), self._flush_laser, sid)
+            return
+        args = (sid, self._coalesced_laser.pop(sid))
+        if sid == self.current_client_sid:
+            self.lane.submit('laser_pointer_move', self._handlers['laser_pointer_move'], args)
+        else:
+            self._handlers['laser_pointer_move'](*args)
+
+    def _emit(self, event, data=None, to=None, **kwargs):
+        """
+        Emit an event, logging and counting failures instead of raising.
+
+        Args:
+            event (str): Event name
+            data: Event payload
+            to (str): Recipient sid, or None to broadcast
+
+        Returns:
+            bool: True if the event was handed to the transport
+        """
+        try:
+            self.sio.emit(event, data, to=to, **kwargs)
+            return True
+        except Exception as e:
+            self.metrics.emit_failures.inc(event)
+            logger.error("Error emitting '%s': %s", event, e)
+            return False
+
     def _register_events(self):
         """Register Socket.IO event handlers."""
 
-        @self.sio.event
-        def connect(sid, environ):
-            logger.info(f"Client {sid} connected from {environ.get('REMOTE_ADDR', 'unknown')}")
+        @self._on('connect')
+        def connect(sid, environ, auth=None):
+            logger.info("Client %s connected from %s", sid, environ.get('REMOTE_ADDR', 'unknown'))
 
             # Validate server is in correct state
             if self.state != ServerState.RUNNING:
-                logger.warning(f"Client attempted connection while server in state: {self.state}")
+                logger.warning("Client attempted connection while server in state: %s", self.state)
                 return False
 
+            # A client returning within the session TTL gets its state back
+            token = auth.get('session') if isinstance(auth, dict) else None
+            current = self.current_client_sid
+            session = self.sessions.resume(token, sid, current) if token else None
+            if session is None:
+                session = self.sessions.create(sid, current)
+
             # If there's an existing client, disconnect it
             if self.current_client_sid is not None and self.current_client_sid != sid:
-                logger.info(f"Disconnecting previous client {self.current_client_sid}")
+                logger.info("Disconnecting previous client %s", self.current_client_sid)
                 try:
                     self.sio.disconnect(self.current_client_sid)
                 except Exception as e:
-                    logger.error(f"Error disconnecting previous client: {e}")
+                    logger.error("Error disconnecting previous client: %s", e)
 
             # Set the new client as the current one
             self.current_client_sid = sid
             self.client_connected = True
             self.status = "Connected"
+            self.metrics.connects.inc()
+            self.heartbeat.watch(sid)
 
-            try:
-                self.sio.emit("message", "Welcome to the server!", to=sid)
-            except Exception as e:
-                logger.error(f"Error sending welcome message: {e}")
+            if token and session.token == token:
+                self.metrics.sessions_resumed.inc()
+                self._resume_session(sid, session)
+            else:
+                self._emit("session", {
+                    "token": session.token,
+                    "ttl": self.sessions.ttl,
+                    "instance": self.instance_token,
+                    "protocol": PROTOCOL_VERSION,
+                }, to=sid)
+                self._emit("message", "Welcome to the server!", to=sid)
 
-        @self.sio.event
-        def disconnect(sid):
-            logger.info(f"Client {sid} disconnected")
+            self.presentation_state.update(controller=True)
+            self._emit("state_snapshot", self.presentation_state.snapshot(), to=sid)
+
+        @self._on('disconnect')
+        def disconnect(sid, reason=None):
+            logger.info("Client %s disconnected", sid)
+            self.metrics.disconnects.inc()
+            self.mirror.stop(sid)
+            self.rate_limiter.forget(sid)
+            self._coalesced_laser.pop(sid, None)
+            self.sessions.detach(sid)
+            self.heartbeat.unwatch(sid)
 
             # Only update state if the disconnecting client is the current one
             if sid == self.current_client_sid:
+                self.lane.clear()
+                self.presentation_state.update(controller=False)
                 self.client_connected = False
                 self.status = "Waiting for connection..." if self.state == ServerState.RUNNING else "Server stopped"
                 self.current_client_sid = None
 
-        @self.sio.event
-        def command(sid, data):
-            logger.info(f"Received command from {sid}: {data}")
+        @self._on('command', traced=True)
+        def command(sid, data, trace):
+            logger.debug("Received command from %s: %r", sid, data)
+            data, seq = self._parse_command(data)
 
             # Validate command data
             if not isinstance(data, str):
-                logger.warning(f"Invalid command type from {sid}: {type(data)}")
+                logger.warning("Invalid command type from %s: %s", sid, type(data))
                 return
 
             # Only accept commands from the current client
             if sid != self.current_client_sid:
-                logger.warning(f"Command rejected from unauthorized client {sid}")
+                logger.warning("Command rejected from unauthorized client %s", sid)
                 return
 
-            try:
-                success = self.command_handler.handle_command(data)
-                if not success:
-                    self.sio.emit("error", {"message": f"Unknown command: {data}"}, to=sid)
-            except Exception as e:
-                logger.error(f"Error handling command '{data}': {e}")
-                try:
-                    self.sio.emit("error", {"message": "Command execution failed"}, to=sid)
-                except Exception:
-                    pass
+            # A resumed client resends commands it has no ack for; skip those already handled
+            session = self.sessions.get(sid)
+            if self._is_duplicate(sid, session, data, seq):
+                return
+
+            # Validated on receipt; executed in order with the controller's other events
+            trace.validated = trace.queued = time.perf_counter()
+            self.lane.submit('command', self._execute_command, (sid, session, data, seq, trace), slow=True)
 
-        @self.sio.event
+        @self._on('laser_pointer_toggle', ordered=True)
         def laser_pointer_toggle(sid, data):
             """Handle laser pointer enable/disable."""
             if sid != self.current_client_sid:
-                logger.warning(f"Laser toggle rejected from unauthorized client {sid}")
+                logger.warning("Laser toggle rejected from unauthorized client %s", sid)
                 return
 
             try:
                 enabled = data.get('enabled', False) if isinstance(data, dict) else False
-                logger.info(f"Laser pointer toggle: {enabled}")
+                logger.info("Laser pointer toggle: %s", enabled)
 
                 if enabled:
                     self.laser_overlay.enable()
                 else:
                     self.laser_overlay.disable()
+                self.presentation_state.update(laser=bool(enabled))
+
+                session = self.sessions.get(sid)
+                if session is not None:
+                    session.laser_enabled = enabled
             except Exception as e:
-                logger.error(f"Error handling laser pointer toggle: {e}")
+                logger.error("Error handling laser pointer toggle: %s", e)
 
-        @self.sio.event
+        @self._on('laser_pointer_move', ordered=True)
         def laser_pointer_move(sid, data):
             """Handle laser pointer movement (60 Hz)."""
+            # A position within the limit supersedes any coalesced one
+            self._coalesced_laser.pop(sid, None)
+
             if sid != self.current_client_sid:
+                self.metrics.laser_dropped.inc("unauthorized")
                 return  # Silent reject for high-frequency events
 
             try:
                 if not isinstance(data, dict):
+                    self.metrics.laser_dropped.inc("invalid")
                     return
 
                 x = data.get('x', 0.5)
@@ -163,8 +500,350 @@ class PPTServer:
                 # Update overlay position (non-blocking)
                 if self.laser_overlay.enabled:
                     self.laser_overlay.update_position(x, y)
+                    self.metrics.laser_events.inc()
+                else:
+                    self.metrics.laser_dropped.inc("disabled")
             except Exception as e:
-                logger.error(f"Error handling laser pointer move: {e}")
+                logger.error("Error handling laser pointer move: %s", e)
+
+        @self._on('ink_stroke', ordered=True)
+        def ink_stroke(sid, data):
+            """Draw a batch of stroke points: {"id", "points": [x0, y0, ...], "color", "width"}."""
+            if sid != self.current_client_sid:
+                return
+
+            points = data.get('points') if isinstance(data, dict) else None
+            if (not isinstance(points, list) or len(points) % 2
+                    or len(points) > 2 * INK_MAX_BATCH_POINTS
+                    or not all(isinstance(v, (int, float)) for v in points)):
+                self.metrics.ink_points.inc("invalid")
+                return
+
+            color = data.get('color')
+            if not isinstance(color, str) or not INK_COLOR_PATTERN.match(color):
+                color = INK_COLOR
+            width = data.get('width')
+            if isinstance(width, (int, float)) and math.isfinite(width):
+                width = max(1, min(int(width), INK_MAX_WIDTH))
+            else:
+                width = INK_WIDTH  # Also for NaN/Infinity, which the JSON parser accepts
+
+            kept = simplify([min(1.0, max(0.0, float(v))) for v in points], INK_SIMPLIFY_TOLERANCE)
+            self.metrics.ink_points.inc("received", amount=len(points) // 2)
+            if self.laser_overlay.ink_stroke(self.slides.current or 0, data.get('id'), kept, color, width):
+                self.metrics.ink_points.inc("drawn", amount=len(kept) // 2)
+            elif self.laser_overlay.enabled:
+                self.metrics.ink_points.inc("dropped", amount=len(kept) // 2)
+
+        @self._on('ink_undo', ordered=True)
+        def ink_undo(sid, data=None):
+            """Remove the last stroke on the current slide."""
+            if sid == self.current_client_sid:
+                self.laser_overlay.ink_undo(self.slides.current or 0)
+
+        @self._on('ink_clear', ordered=True)
+        def ink_clear(sid, data=None):
+            """Remove all ink on the current slide."""
+            if sid == self.current_client_sid:
+                self.laser_overlay.ink_clear(self.slides.current or 0)
+
+        @self._on('time_sync')
+        def time_sync(sid, data=None):
+            """Answer a clock probe through the event's ack; see timer.time_sync_reply."""
+            return time_sync_reply(data)
+
+        @self._on('timer_control', ordered=True)
+        def timer_control(sid, data=None):
+            """Start, pause or reset the presentation timer, or set its target."""
+            if sid != self.current_client_sid or not isinstance(data, dict):
+                return
+            try:
+                changed = self.timer.control(data.get('action'), data.get('target'))
+            except ValueError as e:
+                self._emit("error", {"message": str(e)}, to=sid)
+                return
+            # Only changes are sent; clients render the running clock themselves
+            if changed:
+                self.presentation_state.update(timer=self.timer.state())
+
+        @self._on('state_resync')
+        def state_resync(sid, data=None):
+            """Send a client that missed deltas what changed since its version."""
+            since = data.get('version') if isinstance(data, dict) else None
+            event, payload = self.presentation_state.resync(since)
+            self._emit(event, payload, to=sid)
+
+        @self._on('open_presentation')
+        def open_presentation(sid, data):
+            """Index speaker notes (and queue thumbnails) for a deck on this machine."""
+            if sid != self.current_client_sid:
+                logger.warning("Open presentation rejected from unauthorized client %s", sid)
+                return
+
+            path = data.get('path') if isinstance(data, dict) else None
+            if not isinstance(path, str) or not path:
+                self._emit("error", {"message": "Missing presentation path"}, to=sid)
+                return
+
+            # Parsing runs in the thread pool; the handler returns immediately
+            gevent.spawn(self._load_presentation, sid, path)
+
+        @self._on('mirror_subscribe')
+        def mirror_subscribe(sid, data=None):
+            """Start streaming the presenter screen to the client."""
+            if sid != self.current_client_sid:
+                logger.warning("Mirror subscription rejected from unauthorized client %s", sid)
+                return
+            self.mirror.subscribe(sid, data)
+
+            session = self.sessions.get(sid)
+            if session is not None:
+                session.subscriptions['mirror'] = data
+
+        @self._on('mirror_unsubscribe')
+        def mirror_unsubscribe(sid, data=None):
+            """Stop streaming the presenter screen."""
+            self.mirror.stop(sid)
+
+            session = self.sessions.get(sid)
+            if session is not None:
+                session.subscriptions.pop('mirror', None)
+
+        @self._on('mirror_ack')
+        def mirror_ack(sid, data):
+            """Acknowledge a mirror frame; paces the stream."""
+            if isinstance(data, dict):
+                self.mirror.ack(sid, data.get('id'))
+                if data.get('keyframe'):
+                    self.mirror.request_keyframe(sid)
+
+    def _is_duplicate(self, sid, session, data, seq):
+        """
+        Acknowledge a command again if its session has already handled it.
+
+        Args:
+            sid (str): The controller's sid
+            session (Session): The controller's session, or None
+            data (str): Command string
+            seq (int): Client sequence number, or None
+
+        Returns:
+            bool: True if the command was a duplicate and must not run
+        """
+        if seq is None or session is None or seq > session.last_seq:
+            return False
+        logger.debug("Ignoring duplicate command %s (seq %s) from %s", data, seq, sid)
+        self.metrics.duplicate_commands.inc()
+        self._emit("command_ack", {"command": data, "seq": seq, "ok": True, "duplicate": True}, to=sid)
+        return True
+
+    def _execute_command(self, sid, session, data, seq, trace):
+        """
+        Execute a validated command on the lane's worker and acknowledge it.
+
+        The session's last_seq only moves past a command once it has run, so
+        commands dropped from the lane on disconnect are resent on resume.
+
+        Args:
+            sid (str): The controller's sid
+            session (Session): The controller's session, or None
+            data (str): Command string
+            seq (int): Client sequence number, or None
+            trace (CommandTrace): The command's trace, started on receipt
+        """
+        # A resend may have been queued while the original was still running
+        if self._is_duplicate(sid, session, data, seq):
+            return
+
+        trace.handle_start = time.perf_counter()
+        success = False
+        try:
+            # Injection blocks (pyautogui pauses, macro waits), so it runs off the event loop
+            success = gevent.get_hub().threadpool.apply(self.command_handler.handle_command, (data,))
+            if not success:
+                self._emit("error", {"message": f"Unknown command: {data}"}, to=sid)
+                return
+
+            handler = self.command_handler
+            trace.inject_start = handler.last_injection_started
+            trace.inject_end = handler.last_injection_started + handler.last_injection_seconds
+            self.metrics.injection_duration.observe(handler.last_injection_seconds)
+
+            slide_state = handler.slide_state
+            if slide_state is not None:
+                self._emit("slide_state", slide_state, to=sid)
+            if self.slides.apply(*handler.last_command, slide_state):
+                self._push_notes(sid)
+                self.laser_overlay.ink_show(self.slides.current or 0)
+            self.presentation_state.update(
+                slideshow=self.slides.current is not None,
+                slide=self.slides.current,
+                total=self.slides.total
+            )
+        except Exception as e:
+            logger.error("Error handling command '%s': %s", data, e)
+            self._emit("error", {"message": "Command execution failed"}, to=sid)
+        finally:
+            if seq is not None and session is not None:
+                session.last_seq = max(session.last_seq, seq)
+            self._emit("command_ack", {"command": data, "seq": seq, "ok": success}, to=sid)
+            trace.ok = success
+            trace.acked = time.perf_counter()
+
+            last_command = self.command_handler.last_command
+            self.metrics.command_duration.observe(
+                trace.acked - trace.received, last_command[0] if last_command else "invalid"
+            )
+
+    def _load_presentation(self, sid, path):
+        """
+        Load the notes index of a deck off the event loop and push the first notes.
+
+        Args:
+            sid (str): Client that requested the deck
+            path (str): Presentation file on this machine
+        """
+        threadpool = gevent.get_hub().threadpool
+        try:
+            notes = threadpool.apply(self.notes_library.load, (path,))
+        except ValueError as e:
+            logger.warning("Cannot open presentation %s: %s", path, e)
+            self._emit("error", {"message": str(e)}, to=sid)
+            return
+        except Exception as e:
+            logger.error("Error indexing presentation %s: %s", path, e)
+            self._emit("error", {"message": "Failed to read presentation"}, to=sid)
+            return
+
+        self.notes = notes
+        self.slides.reset(total=len(notes))
+        self.presentation_state.update(
+            presentation=os.path.basename(path),
+            slideshow=False,
+            slide=None,
+            total=len(notes)
+        )
+
+        deck = None
+        if self.thumbnails is not None:
+            try:
+                deck = threadpool.apply(self.thumbnails.submit, (path,))["deck"]
+            except Exception as e:
+                logger.warning("Thumbnails unavailable for %s: %s", path, e)
+
+        self._emit("presentation_loaded", {"slides": len(notes), "deck": deck}, to=sid)
+        self._push_notes(sid)
+
+    def _push_notes(self, sid):
+        """
+        Send the notes of the current and next slide to the client.
+
+        Args:
+            sid (str): Client to send to
+        """
+        notes = self.notes
+        current = self.slides.current
+        if not notes or current is None or not 1 <= current <= len(notes):
+            return
+
+        def entry(number):
+            if number > len(notes):
+                return None
+            title, text = notes[number - 1]
+            return {"slide": number, "title": title, "notes": text}
+
+        self._emit("notes", {
+            "total": len(notes),
+            "current": entry(current),
+            "next": entry(current + 1),
+        }, to=sid)
+
+    def _serve_web_asset(self, route):
+        """
+        Serve a bundled web client file from memory.
+
+        Args:
+            route (str): Path relative to the site root
+
+        Returns:
+            Response: The asset, 304 if the client copy is current, or 404
+        """
+        asset = self.web_assets.get(route)
+        if asset is None:
+            return jsonify({"error": "Not found"}), 404
+
+        if request.if_none_match.contains(asset.etag):
+            response = Response(status=304)
+        else:
+            encoding, body = choose_encoding(asset, request.accept_encodings)
+            response = Response(body, content_type=asset.content_type)
+            if encoding:
+                response.content_encoding = encoding
+
+        response.set_etag(asset.etag)
+        response.vary.add("Accept-Encoding")
+        if route:
+            # Fingerprinted asset: the name changes whenever the content does
+            response.cache_control.public = True
+            response.cache_control.max_age = WEB_ASSET_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            # Entry page: always revalidate so new asset names are picked up
+            response.cache_control.no_cache = True
+        return response
+
+    def _register_routes(self):
+        """Register HTTP routes on the Flask app."""
+
+        @self.app.route("/debug/traces")
+        def traces():
+            """Dump recent command traces as JSON, or as a Chrome trace with ?format=chrome."""
+            if request.args.get("format") == "chrome":
+                return Response(self.traces.to_chrome_trace(), content_type="application/json")
+            return Response(self.traces.to_json(), content_type="application/json")
+
+        @self.app.route("/metrics")
+        def metrics():
+            """Expose server metrics in the Prometheus text format."""
+            return Response(self.metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+        @self.app.route("/")
+        def index():
+            """Serve the bundled controller page."""
+            return self._serve_web_asset("")
+
+        @self.app.route("/static/<name>")
+        def static_asset(name):
+            """Serve a fingerprinted controller asset."""
+            return self._serve_web_asset(f"static/{name}")
+
+        @self.app.route("/api/thumbnails/<deck>")
+        def thumbnail_status(deck):
+            """Report rendering status and available variants of a deck."""
+            if self.thumbnails is None:
+                return jsonify({"error": "Thumbnails unavailable"}), 503
+            return jsonify(self.thumbnails.status(deck))
+
+        @self.app.route("/api/thumbnails/<deck>/<size>/<int:slide>.<fmt>")
+        def thumbnail(deck, size, slide, fmt):
+            """Serve one thumbnail variant; URLs are content-addressed and immutable."""
+            if self.thumbnails is None or fmt not in IMAGE_FORMATS:
+                return jsonify({"error": "Not found"}), 404
+
+            path = self.thumbnails.cache.variant_path(deck, slide, size, fmt)
+            if path is None:
+                return jsonify({"error": "Not found"}), 404
+
+            response = send_file(
+                path,
+                mimetype=IMAGE_FORMATS[fmt][1],
+                etag=f"{deck}-{slide}-{size}.{fmt}",
+                conditional=True,
+                max_age=THUMBNAIL_MAX_AGE
+            )
+            response.cache_control.public = True
+            response.cache_control.immutable = True
+            return response
 
     def start(self, port):
         """
@@ -202,7 +881,13 @@ class PPTServer:
                 self.state = ServerState.RUNNING
                 self.status = "Waiting for connection..."
 
-            logger.info(f"Server started successfully on port {port}")
+            self._hub = gevent.get_hub()
+            self._server_thread_id = threading.get_ident()
+            logger.info("Server started successfully on port %s", port)
+            self._advertise(port)
+            if HUB_MONITOR_THRESHOLD > 0:
+                self.hub_monitor = HubMonitor(HUB_MONITOR_THRESHOLD, on_block=self._record_hub_block)
+                self.hub_monitor.start()
             self.server.serve_forever()
 
         except OSError as e:
@@ -225,63 +910,164 @@ class PPTServer:
             raise
 
         finally:
+            self._withdraw_advertisement()
+            if self.hub_monitor is not None:
+                self.hub_monitor.stop()
+                self.hub_monitor = None
+            self._hub = self._server_thread_id = None
             # Ensure state is updated if server stops
             if self.state == ServerState.RUNNING:
                 with self._state_lock:
                     self.state = ServerState.STOPPED
                     self.status = "Server stopped"
 
-    def stop(self, timeout=5.0):
+    def _advertise(self, port):
+        """Publish the server's DNS-SD record, if enabled."""
+        if not self.discovery_enabled:
+            return
+        self.advertiser = ServiceAdvertiser(
+            DISCOVERY_SERVICE_TYPE,
+            f"{APP_NAME} on {socket.gethostname().split('.')[0]}",
+            port,
+            {"v": PROTOCOL_VERSION, "app": APP_VERSION, "token": self.instance_token, "path": "/"},
+            address=get_local_ip()
+        )
+        self.advertiser.start()
+
+    def _record_hub_block(self, duration, site):
+        """Record an event loop stall reported by the hub monitor."""
+        self.metrics.hub_blocks.inc(site)
+        self.metrics.hub_block_duration.observe(duration)
+
+    def _withdraw_advertisement(self):
+        """Withdraw the DNS-SD record so clients stop resolving a dead address."""
+        advertiser, self.advertiser = self.advertiser, None
+        if advertiser is not None:
+            advertiser.stop()
+
+    def stop(self, timeout=SHUTDOWN_TIMEOUT):
         """
-        Stop the server gracefully.
+        Stop the server gracefully. Safe to call from any thread.
+
+        The shutdown runs on the server's event loop. The controller gets a
+        server_shutdown event and the server waits for its ack, at most
+        SHUTDOWN_ACK_TIMEOUT, before disconnecting it and closing the
+        listener; the DNS-SD record is withdrawn in parallel.
 
         Args:
-            timeout (float): Maximum time to wait for shutdown in seconds
+            timeout (float): Seconds after which shutdown steps still running are abandoned
+
+        Returns:
+            float: Seconds the shutdown took
         """
-        with self._state_lock:
-            if self.state == ServerState.STOPPED:
-                logger.info("Server already stopped")
-                return
+        started = time.perf_counter()
+        if self.state == ServerState.STOPPED:
+            logger.info("Server already stopped")
+            return 0.0
 
-            if self.state != ServerState.RUNNING:
-                logger.warning(f"Attempting to stop server in state: {self.state}")
+        hub = self._hub
+        if hub is not None and self._server_thread_id != threading.get_ident():
+            done = threading.Event()
+            hub.loop.run_callback_threadsafe(gevent.spawn, self._shutdown, timeout, done)
+            if not done.wait(timeout + SHUTDOWN_ACK_TIMEOUT):
+                logger.warning("Server shutdown did not finish within %.1f s", timeout)
+        else:
+            self._shutdown(timeout)
 
-            self.state = ServerState.STOPPING
+        elapsed = time.perf_counter() - started
+        logger.info("Server stopped in %.0f ms", elapsed * 1000)
+        return elapsed
 
-        logger.info("Stopping server")
+    def _shutdown(self, timeout, done=None):
+        """
+        Shut down on the server thread; see stop().
 
-        # Disable laser overlay
-        if self.laser_overlay:
-            try:
-                self.laser_overlay.disable()
-            except Exception as e:
-                logger.error(f"Error disabling laser overlay: {e}")
+        Args:
+            timeout (float): Seconds after which shutdown steps still running are abandoned
+            done (threading.Event): Set when finished, for a caller on another thread
+        """
+        try:
+            with self._state_lock:
+                if self.state == ServerState.STOPPED:
+                    return
+                if self.state != ServerState.RUNNING:
+                    logger.warning("Attempting to stop server in state: %s", self.state)
+                self.state = ServerState.STOPPING
 
-        # Notify clients about shutdown
-        if self.sio and self.client_connected:
-            try:
-                logger.info("Notifying clients of shutdown")
-                self.sio.emit("server_shutdown", {"message": "Server is shutting down"}, namespace='/')
-                gevent.sleep(0.5)  # Give clients time to receive notification
-            except Exception as e:
-                logger.error(f"Error notifying clients of shutdown: {e}")
+            logger.info("Stopping server")
+            deadline = time.perf_counter() + timeout
 
-        # Stop the server
-        if self.server is not None:
-            try:
-                self.server.close()
-                self.server.stop(timeout=timeout)
-                logger.info("Server stopped successfully")
-            except Exception as e:
-                logger.error(f"Error stopping server: {e}")
-            finally:
-                self.server = None
+            # Withdrawing sends DNS-SD goodbye packets over a few hundred ms; it finishes on its
+            # own in the thread pool instead of holding up the shutdown
+            advertiser, self.advertiser = self.advertiser, None
+            if advertiser is not None:
+                gevent.get_hub().threadpool.spawn(advertiser.stop).rawlink(self._withdrawal_done)
 
-        with self._state_lock:
-            self.state = ServerState.STOPPED
-            self.status = "Server stopped"
-            self.client_connected = False
-            self.current_client_sid = None
+            # Disable laser overlay
+            if self.laser_overlay:
+                try:
+                    self.laser_overlay.disable()
+                except Exception as e:
+                    logger.error("Error disabling laser overlay: %s", e)
+
+            if self.mirror:
+                self.mirror.stop()
+            self.heartbeat.unwatch()
+
+            if self.recorder is not None:
+                self.recorder.close()
+
+            sid = self.current_client_sid
+            if self.sio and sid is not None:
+                self._notify_shutdown(sid)
+
+            # Stop the server
+            if self.server is not None:
+                try:
+                    if self.sio and sid is not None:
+                        self.sio.disconnect(sid)
+                    self.server.close()
+                    self.server.stop(timeout=max(0.0, deadline - time.perf_counter()))
+                except Exception as e:
+                    logger.error("Error stopping server: %s", e)
+                finally:
+                    self.server = None
+
+            with self._state_lock:
+                self.state = ServerState.STOPPED
+                self.status = "Server stopped"
+                self.client_connected = False
+                self.current_client_sid = None
+        finally:
+            if done is not None:
+                done.set()
+
+    @staticmethod
+    def _withdrawal_done(result):
+        """Log a DNS-SD withdrawal that failed in the thread pool during shutdown."""
+        if not result.successful():
+            logger.warning("Error withdrawing DNS-SD record: %s", result.exception)
+
+    def _notify_shutdown(self, sid):
+        """
+        Tell the controller the server is going away and wait briefly for its ack.
+
+        Args:
+            sid (str): The controller's sid
+
+        Returns:
+            bool: True if the client acknowledged within SHUTDOWN_ACK_TIMEOUT
+        """
+        acked = Event()
+        if not self._emit("server_shutdown", {"message": "Server is shutting down"}, to=sid,
+                          callback=lambda *args: acked.set()):
+            return False
+        if acked.wait(SHUTDOWN_ACK_TIMEOUT):
+            logger.info("Controller %s acknowledged the shutdown", sid)
+            return True
+        logger.info("Controller %s did not acknowledge the shutdown within %.0f ms", sid,
+                    SHUTDOWN_ACK_TIMEOUT * 1000)
+        return False
 
     def get_status(self):
         """
@@ -292,6 +1078,18 @@ class PPTServer:
         """
         return self.status
 
+    def get_latency_percentiles(self):
+        """
+        Get end-to-end command latency percentiles from the trace buffer.
+
+        Returns:
+            tuple: (p50, p99) in milliseconds, None where no commands were traced
+        """
+        return tuple(
+            None if value is None else value * 1000.0
+            for value in self.traces.percentiles(0.5, 0.99)
+        )
+
     def is_client_connected(self):
         """
         Check if a client is currently connected.
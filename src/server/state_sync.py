@@ -0,0 +1,111 @@
+"""Authoritative, versioned presentation state synchronized to clients with coalesced deltas."""
+
+from collections import deque
+
+import gevent
+
+
+class StateStore:
+    """
+    Flat key/value state with a version that increases with every delta sent.
+
+    Changes made within the coalescing window are merged into one delta, so a
+    burst (e.g. a command that moves the slide and stops the timer) costs one
+    message. Each delta names the version it applies to; a client that sees a
+    gap asks for a resync, and gets the merged missed deltas from the history
+    or, if they have been dropped from it, a full snapshot. Use it from the
+    server's event loop only.
+    """
+
+    def __init__(self, emit, initial=None, coalesce_window=0.05, history=64, on_delta=None):
+        """
+        Initialize the store.
+
+        Args:
+            emit (callable): emit(event, data, to=sid), e.g. PPTServer._emit
+            initial (dict): Initial state
+            coalesce_window (float): Seconds changes are held to be merged into one delta
+            history (int): Deltas kept for resyncing clients
+            on_delta (callable): Called with the number of changed keys of each delta sent
+        """
+        self.emit = emit
+        self.coalesce_window = coalesce_window
+        self.on_delta = on_delta
+        self.version = 0
+        self._state = dict(initial or {})
+        self._pending = {}
+        self._flush_scheduled = None
+        self._history = deque(maxlen=history)  # (version, changes)
+
+    def get(self, key, default=None):
+        """Get the current value of a key, including unsent changes."""
+        return self._state.get(key, default)
+
+    def update(self, **changes):
+        """
+        Change keys; values equal to the current ones are ignored.
+
+        Returns:
+            bool: True if anything changed
+        """
+        changed = False
+        for key, value in changes.items():
+            if key in self._state and self._state[key] == value:
+                continue
+            self._state[key] = value
+            self._pending[key] = value
+            changed = True
+
+        if changed and self._flush_scheduled is None:
+            self._flush_scheduled = gevent.spawn_later(self.coalesce_window, self.flush)
+        return changed
+
+    def flush(self):
+        """Send pending changes as one delta now."""
+        if self._flush_scheduled is not None:
+            if self._flush_scheduled is not gevent.getcurrent():
+                self._flush_scheduled.kill(block=False)
+            self._flush_scheduled = None
+        if not self._pending:
+            return
+
+        changes, self._pending = self._pending, {}
+        self.version += 1
+        self._history.append((self.version, changes))
+        self.emit("state_delta", {"from": self.version - 1, "version": self.version, "changes": changes})
+        if self.on_delta is not None:
+            self.on_delta(len(changes))
+
+    def snapshot(self):
+        """
+        Get the full state at the current version.
+
+        Pending changes are sent first, so the snapshot and later deltas line up.
+
+        Returns:
+            dict: {'version', 'state'}
+        """
+        self.flush()
+        return {"version": self.version, "state": dict(self._state)}
+
+    def resync(self, since):
+        """
+        Bring a client from an old version up to date.
+
+        Args:
+            since (int): Last version the client applied
+
+        Returns:
+            tuple: ('state_delta', merged delta) if the history covers the gap,
+                otherwise ('state_snapshot', snapshot)
+        """
+        self.flush()
+        oldest = self._history[0][0] if self._history else self.version + 1
+        if isinstance(since, bool) or not isinstance(since, int) or not oldest - 1 <= since <= self.version:
+            return "state_snapshot", self.snapshot()
+
+        changes = {}
+        for version, delta in self._history:
+            if version > since:
+                changes.update(delta)
+        return "state_delta", {"from": since, "version": self.version, "changes": changes}
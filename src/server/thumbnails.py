@@ -0,0 +1,325 @@
+"""Slide thumbnail rendering with a content-hashed, size-bounded disk cache."""
+
+import io
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from PIL import Image
+
+from ..utils import ensure_directory_exists, hash_file
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_DECK_SUFFIXES = {".pptx", ".ppt", ".ppsx", ".pps", ".odp"}
+IMAGE_FORMATS = {"webp": ("WEBP", "image/webp"), "jpeg": ("JPEG", "image/jpeg")}
+MANIFEST_NAME = "manifest.json"
+
+
+def find_soffice():
+    """
+    Locate the LibreOffice executable.
+
+    Returns:
+        str or None: Path to soffice, or None if not found
+    """
+    for name in ("soffice", "libreoffice"):
+        found = shutil.which(name)
+        if found:
+            return found
+
+    candidates = []
+    if sys.platform == "win32":
+        candidates.append(Path(os.environ.get("PROGRAMFILES", r"C:\Program Files")) / "LibreOffice/program/soffice.exe")
+    elif sys.platform == "darwin":
+        candidates.append(Path("/Applications/LibreOffice.app/Contents/MacOS/soffice"))
+
+    for candidate in candidates:
+        if candidate.exists():
+            return str(candidate)
+    return None
+
+
+class ThumbnailCache:
+    """
+    On-disk thumbnail store keyed by deck content hash.
+
+    Each deck lives in its own directory and is evicted as a unit, least
+    recently used first, once the total size exceeds the byte budget.
+    Recency survives restarts through the directory mtime.
+    """
+
+    def __init__(self, directory, max_bytes):
+        """
+        Initialize the cache.
+
+        Args:
+            directory (Path): Root cache directory
+            max_bytes (int): Byte budget across all decks
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._decks = OrderedDict()  # deck hash -> total bytes, oldest first
+        self._total_bytes = 0
+
+        ensure_directory_exists(self.directory)
+        self._load()
+
+    def _load(self):
+        """Index existing deck directories by last use."""
+        entries = []
+        for deck_dir in self.directory.iterdir():
+            if not (deck_dir / MANIFEST_NAME).exists():
+                # Incomplete render from a previous run
+                shutil.rmtree(deck_dir, ignore_errors=True)
+                continue
+            size = sum(f.stat().st_size for f in deck_dir.iterdir() if f.is_file())
+            entries.append((deck_dir.stat().st_mtime, deck_dir.name, size))
+
+        for _, name, size in sorted(entries):
+            self._decks[name] = size
+            self._total_bytes += size
+        logger.info("Thumbnail cache loaded: %s decks, %s bytes", len(self._decks), self._total_bytes)
+
+    def _deck_dir(self, deck):
+        return self.directory / deck
+
+    def manifest(self, deck):
+        """
+        Get the manifest of a cached deck and mark it as recently used.
+
+        Args:
+            deck (str): Deck content hash
+
+        Returns:
+            dict or None: Manifest, or None if the deck is not cached
+        """
+        with self._lock:
+            if deck not in self._decks:
+                return None
+            self._decks.move_to_end(deck)
+
+        deck_dir = self._deck_dir(deck)
+        try:
+            os.utime(deck_dir)
+            return json.loads((deck_dir / MANIFEST_NAME).read_text())
+        except OSError:
+            return None
+
+    def variant_path(self, deck, slide, size, fmt):
+        """
+        Get the path of a cached thumbnail.
+
+        Args:
+            deck (str): Deck content hash
+            slide (int): 1-based slide number
+            size (str): Size variant name
+            fmt (str): Image format name
+
+        Returns:
+            Path or None: Path to the file, or None if it is not cached
+        """
+        with self._lock:
+            if deck not in self._decks:
+                return None
+            self._decks.move_to_end(deck)
+
+        path = self._deck_dir(deck) / f"{slide}_{size}.{fmt}"
+        return path if path.exists() else None
+
+    def store(self, deck, files, manifest):
+        """
+        Store a fully rendered deck.
+
+        Args:
+            deck (str): Deck content hash
+            files (dict): File name -> image bytes
+            manifest (dict): Deck manifest
+        """
+        staging = Path(tempfile.mkdtemp(prefix=f".{deck[:12]}-", dir=self.directory))
+        size = 0
+        for name, data in files.items():
+            (staging / name).write_bytes(data)
+            size += len(data)
+        manifest_data = json.dumps(manifest).encode()
+        (staging / MANIFEST_NAME).write_bytes(manifest_data)
+        size += len(manifest_data)
+
+        deck_dir = self._deck_dir(deck)
+        with self._lock:
+            if deck in self._decks:
+                shutil.rmtree(staging, ignore_errors=True)
+                return
+            os.replace(staging, deck_dir)
+            self._decks[deck] = size
+            self._total_bytes += size
+            evicted = self._evict()
+
+        for name in evicted:
+            shutil.rmtree(self._deck_dir(name), ignore_errors=True)
+            logger.info("Evicted thumbnails for deck %s", name[:12])
+
+    def _evict(self):
+        """Drop least recently used decks until within budget. Caller holds the lock."""
+        evicted = []
+        while self._total_bytes > self.max_bytes and len(self._decks) > 1:
+            name, size = self._decks.popitem(last=False)
+            self._total_bytes -= size
+            evicted.append(name)
+        return evicted
+
+
+class ThumbnailService:
+    """Renders decks to thumbnails in a background worker and serves them from the cache."""
+
+    def __init__(self, cache, sizes, formats=("webp", "jpeg"), soffice_path=None):
+        """
+        Initialize the service.
+
+        Args:
+            cache (ThumbnailCache): Cache to store results in
+            sizes (dict): Size variant name -> maximum width in pixels
+            formats (tuple): Image formats to produce
+            soffice_path (str): LibreOffice executable, autodetected when None
+        """
+        self.cache = cache
+        self.sizes = sizes
+        self.formats = tuple(f for f in formats if f in IMAGE_FORMATS)
+        self.soffice_path = soffice_path
+
+        self._jobs = {}  # deck hash -> {'state': str, 'error': str or None}
+        self._hashes = {}  # (path, mtime_ns, size) -> deck hash
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = None
+
+    def submit(self, path):
+        """
+        Queue a deck for rendering unless it is already cached.
+
+        Hashes the file, so callers on an event loop should run this off-loop.
+
+        Args:
+            path (str or Path): Path to the presentation file
+
+        Returns:
+            dict: Deck status (see status())
+
+        Raises:
+            ValueError: If the path is not a readable presentation file
+        """
+        path = Path(path).expanduser()
+        if path.suffix.lower() not in SUPPORTED_DECK_SUFFIXES:
+            raise ValueError(f"Unsupported presentation type: {path.suffix}")
+        if not path.is_file():
+            raise ValueError(f"Presentation not found: {path}")
+
+        stat = path.stat()
+        key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+        deck = self._hashes.get(key)
+        if deck is None:
+            deck = hash_file(path)
+            self._hashes[key] = deck
+
+        if self.cache.manifest(deck) is None:
+            with self._lock:
+                job = self._jobs.get(deck)
+                if job is None or job["state"] == "error":
+                    self._jobs[deck] = {"state": "queued", "error": None}
+                    self._queue.put((deck, path))
+                    self._ensure_worker()
+
+        return self.status(deck)
+
+    def status(self, deck):
+        """
+        Get the rendering status of a deck.
+
+        Args:
+            deck (str): Deck content hash
+
+        Returns:
+            dict: {'deck', 'state', 'slides', 'sizes', 'formats', 'error'}
+        """
+        manifest = self.cache.manifest(deck)
+        if manifest is not None:
+            return {"deck": deck, "state": "ready", "error": None, **manifest}
+
+        job = self._jobs.get(deck, {"state": "unknown", "error": None})
+        return {"deck": deck, "state": job["state"], "error": job["error"], "slides": 0}
+
+    def _ensure_worker(self):
+        """Start the render worker thread if needed. Caller holds the lock."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="thumbnail-worker", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        """Worker loop: render queued decks one at a time."""
+        while True:
+            deck, path = self._queue.get()
+            self._jobs[deck]["state"] = "rendering"
+            started = time.monotonic()
+            try:
+                slides = self._render(deck, path)
+                self._jobs.pop(deck, None)
+                logger.info("Rendered %s slides of %s in %.1fs", slides, path.name, time.monotonic() - started)
+            except Exception as e:
+                logger.error("Thumbnail rendering failed for %s: %s", path, e)
+                self._jobs[deck] = {"state": "error", "error": str(e)}
+
+    def _render(self, deck, path):
+        """Render every slide of a deck into all variants and store them."""
+        soffice = self.soffice_path or find_soffice()
+        if soffice is None:
+            raise RuntimeError("LibreOffice (soffice) not found")
+        pdftoppm = shutil.which("pdftoppm")
+        if pdftoppm is None:
+            raise RuntimeError("pdftoppm (poppler-utils) not found")
+
+        with tempfile.TemporaryDirectory(prefix="ppt-thumbs-") as tmp:
+            tmp = Path(tmp)
+            # A private profile keeps headless soffice from colliding with a running instance
+            profile = (tmp / "profile").as_uri()
+            subprocess.run(
+                [soffice, f"-env:UserInstallation={profile}", "--headless",
+                 "--convert-to", "pdf", "--outdir", str(tmp), str(path)],
+                check=True, capture_output=True, timeout=300
+            )
+            pdf = tmp / f"{path.stem}.pdf"
+            if not pdf.exists():
+                raise RuntimeError("LibreOffice did not produce a PDF")
+
+            max_width = max(self.sizes.values())
+            subprocess.run(
+                [pdftoppm, "-png", "-scale-to-x", str(max_width), "-scale-to-y", "-1",
+                 str(pdf), str(tmp / "slide")],
+                check=True, capture_output=True, timeout=300
+            )
+            pages = sorted(tmp.glob("slide-*.png"), key=lambda p: int(p.stem.rsplit("-", 1)[1]))
+
+            files = {}
+            for number, page in enumerate(pages, start=1):
+                with Image.open(page) as image:
+                    image = image.convert("RGB")
+                    for size, width in self.sizes.items():
+                        variant = image.copy()
+                        variant.thumbnail((width, width * 4))
+                        for fmt in self.formats:
+                            buffer = io.BytesIO()
+                            variant.save(buffer, IMAGE_FORMATS[fmt][0], quality=80)
+                            files[f"{number}_{size}.{fmt}"] = buffer.getvalue()
+
+        manifest = {"slides": len(pages), "sizes": self.sizes, "formats": list(self.formats)}
+        self.cache.store(deck, files, manifest)
+        return len(pages)
@@ -0,0 +1,125 @@
+"""Presentation timer whose state is sent only on changes and rendered by the clients."""
+
+import time
+
+
+def server_clock():
+    """
+    Server time in milliseconds for clock synchronization.
+
+    Monotonic, so a wall-clock adjustment on the host cannot move a running
+    timer; clients only ever see it through their estimated offset.
+    """
+    return time.monotonic() * 1000.0
+
+
+def time_sync_reply(data, clock=server_clock):
+    """
+    Answer one NTP-style clock probe.
+
+    The client sends its send time t0 and, on receiving the reply at t3,
+    computes offset = ((t1 - t0) + (t2 - t3)) / 2 and
+    round trip = (t3 - t0) - (t2 - t1).
+
+    Args:
+        data (dict): {'t0': client send time in ms}
+        clock (callable): Server clock in ms
+
+    Returns:
+        dict or None: {'t0', 't1' (server receive time), 't2' (server send time)}, None if malformed
+    """
+    received = clock()
+    t0 = data.get("t0") if isinstance(data, dict) else None
+    if isinstance(t0, bool) or not isinstance(t0, (int, float)):
+        return None
+    return {"t0": t0, "t1": received, "t2": clock()}
+
+
+class PresentationTimer:
+    """
+    Elapsed/remaining talk time, as state plus a reference point.
+
+    While running, elapsed time is elapsed_ms + (server clock - started_at),
+    which every client can compute locally from its clock offset, so no
+    ticks need to be sent.
+    """
+
+    def __init__(self, clock=server_clock):
+        """
+        Initialize a stopped timer.
+
+        Args:
+            clock (callable): Server clock in ms
+        """
+        self.clock = clock
+        self.elapsed_ms = 0.0  # Accumulated before the current run
+        self.started_at = None  # Server clock at the last start while running
+        self.target_ms = None  # Planned talk length
+        self.version = 0
+
+    @property
+    def running(self):
+        return self.started_at is not None
+
+    def elapsed(self):
+        """Total elapsed milliseconds now."""
+        if self.started_at is None:
+            return self.elapsed_ms
+        return self.elapsed_ms + self.clock() - self.started_at
+
+    def control(self, action, target=None):
+        """
+        Apply a control action.
+
+        Args:
+            action (str): 'start', 'pause', 'reset' or 'target'
+            target (float): Talk length in seconds for 'target'; None or 0 clears it
+
+        Returns:
+            bool: True if the state changed
+
+        Raises:
+            ValueError: If the action or target is invalid
+        """
+        if action == "start":
+            if self.running:
+                return False
+            self.started_at = self.clock()
+        elif action == "pause":
+            if not self.running:
+                return False
+            self.elapsed_ms = self.elapsed()
+            self.started_at = None
+        elif action == "reset":
+            if not self.running and not self.elapsed_ms:
+                return False
+            self.elapsed_ms = 0.0
+            self.started_at = self.clock() if self.running else None
+        elif action == "target":
+            if target is not None and (isinstance(target, bool) or not isinstance(target, (int, float))
+                                       or not 0 <= target <= 24 * 3600):
+                raise ValueError(f"Invalid timer target: {target!r}")
+            target_ms = target * 1000.0 if target else None
+            if target_ms == self.target_ms:
+                return False
+            self.target_ms = target_ms
+        else:
+            raise ValueError(f"Unknown timer action: {action!r}")
+
+        self.version += 1
+        return True
+
+    def state(self):
+        """
+        Get the state sent to clients.
+
+        Returns:
+            dict: running, elapsed_ms, started_at (server clock ms or None), target_ms, version
+        """
+        return {
+            "running": self.running,
+            "elapsed_ms": self.elapsed_ms,
+            "started_at": self.started_at,
+            "target_ms": self.target_ms,
+            "version": self.version,
+        }
@@ -0,0 +1,137 @@
+"""Per-command latency traces kept in a fixed-size ring buffer."""
+
+import json
+import time
+
+# Span boundaries in the order a command passes through them
+TRACE_POINTS = ("received", "validated", "queued", "handle_start", "inject_start", "inject_end", "acked")
+SPANS = (
+    ("validate", "received", "validated"),
+    ("queue", "validated", "handle_start"),
+    ("handle", "handle_start", "acked"),
+    ("inject", "inject_start", "inject_end"),
+    ("ack", "inject_end", "acked"),
+)
+
+
+class CommandTrace:
+    """Monotonic timestamps (time.perf_counter) of one command's trip through the server."""
+
+    __slots__ = ("seq", "command", "ok") + TRACE_POINTS
+
+    def __init__(self):
+        self.reset(0, None)
+
+    def reset(self, seq, command):
+        """Reuse this record for a new command."""
+        self.seq = seq
+        self.command = command
+        self.ok = None
+        self.received = time.perf_counter()
+        self.validated = self.queued = self.handle_start = None
+        self.inject_start = self.inject_end = self.acked = None
+
+    @property
+    def total(self):
+        """float or None: Seconds from receive to ack emit, once complete."""
+        if self.acked is None:
+            return None
+        return self.acked - self.received
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class TraceRing:
+    """
+    Fixed-size ring of preallocated trace records.
+
+    Starting a trace overwrites the oldest record in place, so tracing does
+    not allocate per command.
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize the ring.
+
+        Args:
+            capacity (int): Number of traces kept
+        """
+        self.capacity = capacity
+        self._records = [CommandTrace() for _ in range(capacity)]
+        self._seq = 0
+
+    def start(self, command):
+        """
+        Begin a trace, stamping the receive time.
+
+        Args:
+            command: Raw command payload
+
+        Returns:
+            CommandTrace: Record to fill in as the command progresses
+        """
+        self._seq += 1
+        record = self._records[self._seq % self.capacity]
+        record.reset(self._seq, command if isinstance(command, str) else repr(command))
+        return record
+
+    def completed(self):
+        """
+        Get completed traces, oldest first.
+
+        Returns:
+            list: CommandTrace records with an ack timestamp
+        """
+        return sorted(
+            (r for r in self._records if r.seq and r.acked is not None),
+            key=lambda r: r.seq
+        )
+
+    def percentiles(self, *quantiles):
+        """
+        Compute end-to-end latency percentiles over the buffered traces.
+
+        Args:
+            *quantiles (float): Quantiles between 0 and 1, e.g. 0.5, 0.99
+
+        Returns:
+            list: Latency in seconds per quantile, or None values if no data
+        """
+        totals = sorted(r.total for r in self._records if r.seq and r.acked is not None)
+        if not totals:
+            return [None] * len(quantiles)
+        return [totals[min(len(totals) - 1, int(q * len(totals)))] for q in quantiles]
+
+    def to_json(self):
+        """
+        Dump completed traces as JSON.
+
+        Returns:
+            str: JSON array of trace dictionaries
+        """
+        return json.dumps([r.to_dict() for r in self.completed()])
+
+    def to_chrome_trace(self):
+        """
+        Dump completed traces in the Chrome trace event format (chrome://tracing, Perfetto).
+
+        Returns:
+            str: JSON trace document
+        """
+        events = []
+        for record in self.completed():
+            events.append({
+                "name": record.command, "cat": "command", "ph": "X", "pid": 1, "tid": 1,
+                "ts": record.received * 1e6, "dur": record.total * 1e6,
+                "args": {"seq": record.seq, "ok": record.ok},
+            })
+            for name, start_point, end_point in SPANS:
+                start, end = getattr(record, start_point), getattr(record, end_point)
+                if start is None or end is None:
+                    continue
+                events.append({
+                    "name": name, "cat": "span", "ph": "X", "pid": 1, "tid": 1,
+                    "ts": start * 1e6, "dur": (end - start) * 1e6,
+                })
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
@@ -1,5 +1,6 @@
 """Utility functions for the PPT Command Executor."""
 
+import hashlib
 import logging
 from pathlib import Path
 
@@ -22,14 +23,14 @@ def validate_asset_paths(*paths):
             path = Path(path)
 
         if not path.exists():
-            logger.warning(f"Asset path does not exist: {path}")
+            logger.warning("Asset path does not exist: %s", path)
             missing.append(str(path))
 
     all_exist = len(missing) == 0
     if all_exist:
-        logger.info(f"All {len(paths)} asset paths validated successfully")
+        logger.info("All %s asset paths validated successfully", len(paths))
     else:
-        logger.error(f"{len(missing)} asset paths missing: {missing}")
+        logger.error("%s asset paths missing: %s", len(missing), missing)
 
     return all_exist, missing
 
@@ -49,13 +50,31 @@ def ensure_directory_exists(directory):
 
     try:
         directory.mkdir(parents=True, exist_ok=True)
-        logger.debug(f"Directory ensured: {directory}")
+        logger.debug("Directory ensured: %s", directory)
         return True
     except Exception as e:
-        logger.error(f"Failed to create directory {directory}: {e}")
+        logger.error("Failed to create directory %s: %s", directory, e)
         return False
 
 
+def hash_file(path, chunk_size=1 << 20):
+    """
+    Compute the SHA-256 of a file's contents without reading it all into memory.
+
+    Args:
+        path (Path or str): File to hash
+        chunk_size (int): Read size in bytes
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def validate_port(port):
     """
     Validate a port number.
@@ -77,7 +96,7 @@ def validate_port(port):
 
     # Check for privileged ports on Unix-like systems
     if port < 1024:
-        logger.warning(f"Port {port} is a privileged port (< 1024) and may require elevated permissions")
+        logger.warning("Port %s is a privileged port (< 1024) and may require elevated permissions", port)
 
     return True
 
@@ -123,11 +142,51 @@ def validate_config(config_dict):
     if interval is not None and (not isinstance(interval, int) or interval < 100 or interval > 60000):
         errors.append(f"Invalid status update interval: {interval} (must be 100-60000 ms)")
 
+    # Validate numeric tuning settings: name -> (minimum, maximum)
+    ranges = {
+        'COMMAND_KEY_PAUSE': (0.0, 5.0),
+        'IMPRESS_UNO_PORT': (1, 65535),
+        'ENGINEIO_PING_INTERVAL': (1.0, 300.0),
+        'ENGINEIO_PING_TIMEOUT': (1.0, 300.0),
+        'HEARTBEAT_ACTIVE_INTERVAL': (0.2, 300.0),
+        'HEARTBEAT_IDLE_INTERVAL': (0.2, 3600.0),
+        'HEARTBEAT_IDLE_AFTER': (0.0, 3600.0),
+        'HEARTBEAT_TIMEOUT': (0.2, 300.0),
+        'SESSION_TTL': (0.0, 86400.0),
+        'MIRROR_SCALE': (0.1, 1.0),
+        'MIRROR_QUALITY': (1, 100),
+        'MIRROR_MIN_INTERVAL': (0.01, 10.0),
+        'MIRROR_IDLE_INTERVAL': (0.01, 60.0),
+        'INK_WIDTH': (1, 32),
+        'INK_SIMPLIFY_TOLERANCE': (0.0, 0.1),
+        'THUMBNAIL_CACHE_MAX_BYTES': (1024 * 1024, 1 << 40),
+        'LASER_FRAME_INTERVAL': (4, 1000),
+        'LASER_RADIUS': (1, 200),
+        'HUB_MONITOR_THRESHOLD': (0.0, 10.0),
+        'SHUTDOWN_ACK_TIMEOUT': (0.0, 5.0),
+        'SHUTDOWN_TIMEOUT': (0.1, 30.0),
+    }
+    for name, (minimum, maximum) in ranges.items():
+        value = config_dict.get(name)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not minimum <= value <= maximum:
+            errors.append(f"Invalid {name.lower()}: {value} (must be {minimum}-{maximum})")
+
+    active = config_dict.get('HEARTBEAT_ACTIVE_INTERVAL')
+    idle = config_dict.get('HEARTBEAT_IDLE_INTERVAL')
+    if isinstance(active, (int, float)) and isinstance(idle, (int, float)) and active > idle:
+        errors.append(f"Heartbeat active interval ({active}) must not exceed the idle interval ({idle})")
+
+    level = config_dict.get('LOG_LEVEL')
+    if level is not None and level not in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'):
+        errors.append(f"Invalid log level: {level}")
+
     is_valid = len(errors) == 0
 
     if is_valid:
         logger.info("Configuration validated successfully")
     else:
-        logger.error(f"Configuration validation failed: {errors}")
+        logger.error("Configuration validation failed: %s", errors)
 
     return is_valid, errors
@@ -0,0 +1 @@
+"""Bundled web controller served by the PPT Command Executor server."""
@@ -0,0 +1,175 @@
+"""Fingerprinting, precompression and in-memory serving of the bundled web client."""
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import re
+from collections import namedtuple
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+ENTRY_PAGE = "index.html"
+MANIFEST_NAME = "manifest.json"
+ASSET_REFERENCE = re.compile(r"\{\{asset:([\w.\-]+)\}\}")
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+Asset = namedtuple("Asset", ["name", "content_type", "etag", "identity", "gzip", "br"])
+
+
+def _compress(data, content_type):
+    """Return (gzip, brotli) encodings of data, or None where not worthwhile."""
+    if not content_type.startswith(COMPRESSIBLE_TYPES):
+        return None, None
+
+    gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+    gzipped = gzipped if len(gzipped) < len(data) else None
+
+    brotlied = None
+    if brotli is not None:
+        brotlied = brotli.compress(data, quality=11)
+        brotlied = brotlied if len(brotlied) < len(data) else None
+    return gzipped, brotlied
+
+
+def _make_asset(name, data):
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if content_type.startswith("text/"):
+        content_type += "; charset=utf-8"
+    gzipped, brotlied = _compress(data, content_type)
+    etag = hashlib.sha256(data).hexdigest()[:16]
+    return Asset(name, content_type, etag, data, gzipped, brotlied)
+
+
+def build_bundle(source_dir):
+    """
+    Build the client bundle from its sources.
+
+    Every file except the entry page is renamed to include a content hash.
+    References of the form {{asset:name}} in the entry page are rewritten to
+    the fingerprinted names.
+
+    Args:
+        source_dir (Path): Directory containing the client sources
+
+    Returns:
+        dict: Served path (without leading slash) -> Asset
+    """
+    source_dir = Path(source_dir)
+    renamed = {}
+    bundle = {}
+
+    for path in sorted(source_dir.iterdir()):
+        if not path.is_file() or path.name == ENTRY_PAGE:
+            continue
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:10]
+        fingerprinted = f"{path.stem}.{digest}{path.suffix}"
+        renamed[path.name] = fingerprinted
+        bundle[f"static/{fingerprinted}"] = _make_asset(fingerprinted, data)
+
+    def resolve(match):
+        name = match.group(1)
+        if name not in renamed:
+            raise ValueError(f"{ENTRY_PAGE} references unknown asset: {name}")
+        return f"/static/{renamed[name]}"
+
+    page = ASSET_REFERENCE.sub(resolve, (source_dir / ENTRY_PAGE).read_text(encoding="utf-8"))
+    bundle[""] = _make_asset(ENTRY_PAGE, page.encode("utf-8"))
+    return bundle
+
+
+def write_bundle(bundle, output_dir):
+    """
+    Write a bundle with its precompressed variants and a manifest.
+
+    Args:
+        bundle (dict): Bundle from build_bundle()
+        output_dir (Path): Destination directory (replaced contents)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for stale in output_dir.iterdir():
+        if stale.is_file():
+            stale.unlink()
+
+    manifest = {}
+    for route, asset in bundle.items():
+        (output_dir / asset.name).write_bytes(asset.identity)
+        encodings = []
+        for encoding, suffix in (("gzip", ".gz"), ("br", ".br")):
+            data = getattr(asset, encoding)
+            if data is not None:
+                (output_dir / f"{asset.name}{suffix}").write_bytes(data)
+                encodings.append(encoding)
+        manifest[route] = {
+            "file": asset.name,
+            "content_type": asset.content_type,
+            "etag": asset.etag,
+            "encodings": encodings,
+        }
+    (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+
+
+def load_bundle(dist_dir, source_dir):
+    """
+    Load the prebuilt bundle into memory, building it from sources if missing.
+
+    Args:
+        dist_dir (Path): Output of build_web.py
+        source_dir (Path): Client sources, used when no build output exists
+
+    Returns:
+        dict: Served path -> Asset (empty if neither exists)
+    """
+    dist_dir = Path(dist_dir)
+    manifest_path = dist_dir / MANIFEST_NAME
+    try:
+        if manifest_path.exists():
+            bundle = {}
+            for route, entry in json.loads(manifest_path.read_text()).items():
+                name = entry["file"]
+                encoded = {
+                    encoding: (dist_dir / f"{name}{suffix}").read_bytes()
+                    if encoding in entry["encodings"] else None
+                    for encoding, suffix in (("gzip", ".gz"), ("br", ".br"))
+                }
+                bundle[route] = Asset(
+                    name, entry["content_type"], entry["etag"],
+                    (dist_dir / name).read_bytes(), encoded["gzip"], encoded["br"]
+                )
+            logger.info("Loaded web client bundle (%s files) from %s", len(bundle), dist_dir)
+            return bundle
+
+        if Path(source_dir).exists():
+            logger.warning("Prebuilt web client not found, building it in memory (run build_web.py)")
+            return build_bundle(source_dir)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error("Failed to load web client bundle: %s", e)
+
+    return {}
+
+
+def choose_encoding(asset, accept_encoding):
+    """
+    Pick the smallest encoding the client accepts.
+
+    Args:
+        asset (Asset): Asset to serve
+        accept_encoding (werkzeug.datastructures.Accept): Parsed Accept-Encoding header
+
+    Returns:
+        tuple: (encoding name or None, body bytes)
+    """
+    if asset.br is not None and accept_encoding["br"]:
+        return "br", asset.br
+    if asset.gzip is not None and accept_encoding["gzip"]:
+        return "gzip", asset.gzip
+    return None, asset.identity
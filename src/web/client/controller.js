@@ -0,0 +1,571 @@
+// Controller page for PPT Command Executor.
+// Speaks the Engine.IO v4 / Socket.IO v5 wire protocol over a plain WebSocket,
+// so no client library has to be downloaded.
+(function () {
+  "use strict";
+
+  var RECONNECT_MIN_DELAY_MS = 250;
+  var RECONNECT_MAX_DELAY_MS = 4000;
+  // Unacknowledged commands older than this are not resent after a reconnect
+  var RESEND_WINDOW_MS = 3000;
+  // Clock sync: probes per burst, and the heartbeat disagreement that triggers a new burst
+  var SYNC_PROBES = 5;
+  var SYNC_PROBE_GAP_MS = 50;
+  var SYNC_TIMEOUT_MS = 5000;
+  var SYNC_DRIFT_MS = 40;
+
+  function SocketClient(onStatus) {
+    this.handlers = {};
+    this.onStatus = onStatus;
+    this.ws = null;
+    this.connected = false;
+    this.ackId = 0;
+    this.acks = {};
+    this.auth = null;
+    this.pendingBinary = null;
+    this.kicked = false;
+    this.serverStopping = false;  // Set on server_shutdown; its disconnect is not a takeover
+    this.retryDelay = RECONNECT_MIN_DELAY_MS;
+    this.retryTimer = null;
+  }
+
+  SocketClient.prototype.on = function (event, handler) {
+    this.handlers[event] = handler;
+  };
+
+  SocketClient.prototype.connect = function () {
+    clearTimeout(this.retryTimer);
+    this.retryTimer = null;
+    var scheme = location.protocol === "https:" ? "wss://" : "ws://";
+    var ws = new WebSocket(scheme + location.host + "/socket.io/?EIO=4&transport=websocket");
+    ws.binaryType = "arraybuffer";
+    this.ws = ws;
+    ws.onmessage = this.handleMessage.bind(this);
+    ws.onclose = function () {
+      this.connected = false;
+      this.onStatus(false);
+      // Another controller took over; reconnecting would just take the slot back
+      if (!this.kicked) {
+        this.retryTimer = setTimeout(this.connect.bind(this), this.retryDelay);
+        this.retryDelay = Math.min(this.retryDelay * 2, RECONNECT_MAX_DELAY_MS);
+      }
+    }.bind(this);
+  };
+
+  // Retry right away when the network comes back instead of waiting out the backoff
+  SocketClient.prototype.reconnectNow = function () {
+    if (this.retryTimer !== null) {
+      this.connect();
+    }
+  };
+
+  SocketClient.prototype.handleMessage = function (message) {
+    if (typeof message.data !== "string") {
+      this.handleBinary(message.data);
+      return;
+    }
+    var type = message.data.charAt(0);
+    var body = message.data.slice(1);
+    if (type === "0") {
+      // Engine.IO open: join the default namespace
+      this.ws.send("40" + (this.auth ? JSON.stringify(this.auth) : ""));
+    } else if (type === "2") {
+      this.ws.send("3");
+    } else if (type === "4") {
+      this.handlePacket(body);
+    }
+  };
+
+  SocketClient.prototype.handlePacket = function (packet) {
+    var type = packet.charAt(0);
+    var rest = packet.slice(1);
+    var attachments = 0;
+    if (type === "5" || type === "6") {
+      var dash = rest.indexOf("-");
+      attachments = parseInt(rest.slice(0, dash), 10);
+      rest = rest.slice(dash + 1);
+    }
+    if (rest.charAt(0) === "/") {
+      rest = rest.slice(rest.indexOf(",") + 1);
+    }
+    var match = /^(\d*)([\s\S]*)$/.exec(rest);
+    var id = match[1] ? parseInt(match[1], 10) : null;
+    var data = match[2] ? JSON.parse(match[2]) : null;
+
+    if (type === "0") {
+      this.connected = true;
+      this.serverStopping = false;
+      this.retryDelay = RECONNECT_MIN_DELAY_MS;
+      this.onStatus(true);
+      this.dispatch("connect", [data]);
+    } else if (type === "1") {
+      this.kicked = !this.serverStopping;
+      this.dispatch("disconnect", []);
+    } else if (type === "4") {
+      this.dispatch("connect_error", [data]);
+    } else if (type === "2" || type === "5") {
+      var packetInfo = { id: id, args: data };
+      if (attachments) {
+        this.pendingBinary = { packet: packetInfo, count: attachments, buffers: [] };
+      } else {
+        this.deliver(packetInfo);
+      }
+    } else if (type === "3" && this.acks[id]) {
+      this.acks[id].apply(null, data);
+      delete this.acks[id];
+    }
+  };
+
+  SocketClient.prototype.handleBinary = function (buffer) {
+    var pending = this.pendingBinary;
+    if (!pending) {
+      return;
+    }
+    pending.buffers.push(buffer);
+    if (pending.buffers.length === pending.count) {
+      this.pendingBinary = null;
+      pending.packet.args = this.reconstruct(pending.packet.args, pending.buffers);
+      this.deliver(pending.packet);
+    }
+  };
+
+  SocketClient.prototype.reconstruct = function (value, buffers) {
+    if (value && value._placeholder) {
+      return buffers[value.num];
+    }
+    if (Array.isArray(value)) {
+      return value.map(function (item) { return this.reconstruct(item, buffers); }, this);
+    }
+    if (value && typeof value === "object") {
+      Object.keys(value).forEach(function (key) { value[key] = this.reconstruct(value[key], buffers); }, this);
+    }
+    return value;
+  };
+
+  SocketClient.prototype.deliver = function (packet) {
+    var event = packet.args[0];
+    var args = packet.args.slice(1);
+    if (packet.id !== null) {
+      var ws = this.ws;
+      var id = packet.id;
+      args.push(function () {
+        ws.send("43" + id + JSON.stringify(Array.prototype.slice.call(arguments)));
+      });
+    }
+    this.dispatch(event, args);
+  };
+
+  SocketClient.prototype.dispatch = function (event, args) {
+    var handler = this.handlers[event];
+    if (handler) {
+      handler.apply(null, args);
+    }
+  };
+
+  SocketClient.prototype.emit = function (event, data, callback) {
+    if (!this.connected) {
+      return false;
+    }
+    var id = "";
+    if (callback) {
+      id = String(++this.ackId);
+      this.acks[id] = callback;
+    }
+    var args = data === undefined ? [event] : [event, data];
+    this.ws.send("42" + id + JSON.stringify(args));
+    return true;
+  };
+
+  // --- UI -------------------------------------------------------------
+
+  var statusEl = document.getElementById("status");
+  var slideEl = document.getElementById("slide");
+  var touchpad = document.getElementById("touchpad");
+  var laserButton = document.getElementById("laser-toggle");
+  var inkButton = document.getElementById("ink-toggle");
+  var inkTools = document.getElementById("ink-tools");
+  var socket = new SocketClient(function (connected) {
+    statusEl.textContent = connected ? "Connected" : "Reconnecting…";
+    statusEl.classList.toggle("connected", connected);
+    if (connected) {
+      syncClock();
+    }
+  });
+
+  // Session resumption: the token and command sequence survive reconnects and reloads
+  var storedToken = sessionStorage.getItem("ppt-session");
+  var seq = parseInt(sessionStorage.getItem("ppt-seq") || "0", 10);
+  var unacked = [];
+  if (storedToken) {
+    socket.auth = { session: storedToken };
+  }
+  window.addEventListener("online", function () { socket.reconnectNow(); });
+
+  function sendCommand(command) {
+    seq += 1;
+    sessionStorage.setItem("ppt-seq", String(seq));
+    unacked.push({ seq: seq, command: command, sentAt: Date.now() });
+    socket.emit("command", { command: command, seq: seq });
+  }
+
+  Array.prototype.forEach.call(document.querySelectorAll("[data-command]"), function (button) {
+    button.addEventListener("click", function () { sendCommand(button.dataset.command); });
+  });
+
+  document.getElementById("goto").addEventListener("submit", function (event) {
+    event.preventDefault();
+    var number = parseInt(document.getElementById("goto-number").value, 10);
+    if (number > 0) {
+      sendCommand("GOTO_SLIDE:" + number);
+    }
+  });
+
+  // The touchpad drives either the laser pointer or ink; both need the overlay shown
+  var laserEnabled = false;
+  var inkEnabled = false;
+  var pendingMove = null;
+
+  function setMode(laser, ink) {
+    laserEnabled = laser;
+    inkEnabled = ink;
+    laserButton.classList.toggle("active", laser);
+    inkButton.classList.toggle("active", ink);
+    inkTools.hidden = !ink;
+    touchpad.hidden = !(laser || ink);
+  }
+
+  function setLaser(enabled) {
+    setMode(enabled, false);
+  }
+
+  laserButton.addEventListener("click", function () {
+    setMode(!laserEnabled, false);
+    socket.emit("laser_pointer_toggle", { enabled: laserEnabled });
+  });
+
+  inkButton.addEventListener("click", function () {
+    setMode(false, !inkEnabled);
+    socket.emit("laser_pointer_toggle", { enabled: inkEnabled });
+  });
+
+  document.getElementById("ink-undo").addEventListener("click", function () { socket.emit("ink_undo"); });
+  document.getElementById("ink-clear").addEventListener("click", function () { socket.emit("ink_clear"); });
+
+  function padPoint(event) {
+    var rect = touchpad.getBoundingClientRect();
+    return [
+      Math.round(Math.min(1, Math.max(0, (event.clientX - rect.left) / rect.width)) * 10000) / 10000,
+      Math.round(Math.min(1, Math.max(0, (event.clientY - rect.top) / rect.height)) * 10000) / 10000
+    ];
+  }
+
+  // Ink: the points of a stroke are batched and sent once per animation frame
+  var strokeId = 0;
+  var strokePoints = null;
+  var drawing = false;
+  var inkFrame = false;
+
+  function flushInk() {
+    inkFrame = false;
+    if (strokePoints && strokePoints.length) {
+      socket.emit("ink_stroke", { id: strokeId, points: strokePoints });
+    }
+    strokePoints = drawing ? [] : null;
+  }
+
+  function addInkPoint(point) {
+    strokePoints.push(point[0], point[1]);
+    if (!inkFrame) {
+      inkFrame = true;
+      requestAnimationFrame(flushInk);
+    }
+  }
+
+  touchpad.addEventListener("pointerdown", function (event) {
+    if (!inkEnabled) {
+      return;
+    }
+    drawing = true;
+    strokeId += 1;
+    strokePoints = [];
+    touchpad.setPointerCapture(event.pointerId);
+    addInkPoint(padPoint(event));
+  });
+
+  function endStroke() {
+    if (drawing) {
+      drawing = false;
+      flushInk();
+    }
+  }
+
+  touchpad.addEventListener("pointerup", endStroke);
+  touchpad.addEventListener("pointercancel", endStroke);
+
+  // Laser pointer: one move event per animation frame at most
+  touchpad.addEventListener("pointermove", function (event) {
+    var point = padPoint(event);
+    if (inkEnabled) {
+      if (drawing) {
+        addInkPoint(point);
+      }
+      return;
+    }
+    var first = pendingMove === null;
+    pendingMove = { x: point[0], y: point[1] };
+    if (first) {
+      requestAnimationFrame(function () {
+        socket.emit("laser_pointer_move", pendingMove);
+        pendingMove = null;
+      });
+    }
+  });
+
+  // Presentation timer. The server sends its state only when it changes; the
+  // running clock is rendered here from an estimated offset to the server clock.
+  var timerEl = document.getElementById("timer");
+  var timerToggle = document.getElementById("timer-toggle");
+  var timerState = null;
+  var timerTimeout = null;
+  var clockOffset = null; // Server clock minus performance.now(), in ms
+  var clockRtt = Infinity;
+  var syncing = false;
+
+  // NTP-style burst: keep the probe with the shortest round trip, whose offset is the most precise
+  function syncClock() {
+    if (syncing) {
+      return;
+    }
+    syncing = true;
+    var best = null;
+    var remaining = SYNC_PROBES;
+    var done = false;
+    var guard = setTimeout(finish, SYNC_TIMEOUT_MS);
+
+    function finish() {
+      if (done) {
+        return;
+      }
+      done = true;
+      syncing = false;
+      clearTimeout(guard);
+      if (best) {
+        clockOffset = best.offset;
+        clockRtt = best.rtt;
+        renderTimer();
+      }
+    }
+
+    function probe() {
+      var sent = socket.emit("time_sync", { t0: performance.now() }, function (reply) {
+        var t3 = performance.now();
+        if (done) {
+          return;
+        }
+        if (reply) {
+          var rtt = (t3 - reply.t0) - (reply.t2 - reply.t1);
+          if (!best || rtt < best.rtt) {
+            best = { rtt: rtt, offset: ((reply.t1 - reply.t0) + (reply.t2 - t3)) / 2 };
+          }
+        }
+        remaining -= 1;
+        if (remaining > 0) {
+          setTimeout(probe, SYNC_PROBE_GAP_MS);
+        } else {
+          finish();
+        }
+      });
+      if (!sent) {
+        finish();
+      }
+    }
+
+    probe();
+  }
+
+  // A heartbeat carries the server clock at send time; resync only if it disagrees with the offset
+  function checkClock(serverTime) {
+    if (clockOffset === null) {
+      return;
+    }
+    var error = serverTime + clockRtt / 2 - (performance.now() + clockOffset);
+    if (Math.abs(error) > SYNC_DRIFT_MS + clockRtt / 2) {
+      syncClock();
+    }
+  }
+
+  function timerElapsed() {
+    if (!timerState.running) {
+      return timerState.elapsed_ms;
+    }
+    return timerState.elapsed_ms + performance.now() + clockOffset - timerState.started_at;
+  }
+
+  function formatClock(ms) {
+    var seconds = Math.floor(Math.abs(ms) / 1000);
+    var hours = Math.floor(seconds / 3600);
+    var minutes = Math.floor(seconds / 60) % 60;
+    var text = (hours ? hours + ":" + (minutes < 10 ? "0" : "") : "") + minutes + ":" +
+      (seconds % 60 < 10 ? "0" : "") + (seconds % 60);
+    return (ms < 0 ? "-" : "") + text;
+  }
+
+  function renderTimer() {
+    clearTimeout(timerTimeout);
+    if (!timerState || (timerState.running && clockOffset === null)) {
+      return;
+    }
+    var elapsed = timerElapsed();
+    var text = formatClock(elapsed);
+    var overtime = false;
+    if (timerState.target_ms) {
+      var remaining = timerState.target_ms - elapsed;
+      overtime = remaining < 0;
+      text += " / " + formatClock(remaining);
+    }
+    timerEl.textContent = text;
+    timerEl.classList.toggle("overtime", overtime);
+    timerToggle.textContent = timerState.running ? "Pause" : "Start";
+    if (timerState.running) {
+      // Wake up just after the displayed second changes, not on a fixed tick
+      timerTimeout = setTimeout(renderTimer, 1000 - (elapsed % 1000) + 5);
+    }
+  }
+
+  timerToggle.addEventListener("click", function () {
+    socket.emit("timer_control", { action: timerState && timerState.running ? "pause" : "start" });
+  });
+  document.getElementById("timer-reset").addEventListener("click", function () {
+    socket.emit("timer_control", { action: "reset" });
+  });
+  document.getElementById("timer-target").addEventListener("change", function (event) {
+    var minutes = parseFloat(event.target.value);
+    socket.emit("timer_control", { action: "target", target: minutes > 0 ? minutes * 60 : 0 });
+  });
+  // Timers are throttled in background tabs; redraw as soon as the page is visible again
+  document.addEventListener("visibilitychange", function () {
+    if (!document.hidden) {
+      renderTimer();
+    }
+  });
+
+  // Server events
+  socket.on("session", function (data) {
+    sessionStorage.setItem("ppt-session", data.token);
+    socket.auth = { session: data.token };
+    unacked = [];
+    setLaser(false);
+  });
+
+  socket.on("session_resumed", function (data) {
+    var now = Date.now();
+    // The server already handled everything up to last_seq; resend only recent commands after it
+    unacked = unacked.filter(function (entry) {
+      return entry.seq > data.last_seq && now - entry.sentAt < RESEND_WINDOW_MS;
+    });
+    unacked.forEach(function (entry) {
+      socket.emit("command", { command: entry.command, seq: entry.seq });
+    });
+    if (!(inkEnabled && data.laser_enabled)) {
+      setLaser(data.laser_enabled);
+    }
+  });
+
+  // Heartbeat: the server only pings when it has not heard from us; just acknowledge
+  socket.on("hb", function (data, ack) {
+    if (ack) {
+      ack();
+    }
+    if (data && typeof data.t === "number") {
+      checkClock(data.t);
+    }
+  });
+
+  // Presentation state: a snapshot on connect, then deltas that each name the version they apply to
+  var stateVersion = null;
+  var appState = {};
+  var resyncPending = false;
+
+  function applyState(changes) {
+    Object.keys(changes).forEach(function (key) { appState[key] = changes[key]; });
+    if ("timer" in changes) {
+      timerState = appState.timer;
+      renderTimer();
+    }
+    if ("slide" in changes || "total" in changes || "slideshow" in changes) {
+      slideEl.textContent = appState.slideshow && appState.slide ?
+        appState.slide + (appState.total ? " / " + appState.total : "") : "";
+    }
+    if ("laser" in changes && !appState.laser && (laserEnabled || inkEnabled)) {
+      setMode(false, false);
+    }
+  }
+
+  socket.on("state_snapshot", function (snapshot) {
+    stateVersion = snapshot.version;
+    resyncPending = false;
+    appState = {};
+    applyState(snapshot.state);
+  });
+
+  socket.on("state_delta", function (delta) {
+    if (stateVersion === null) {
+      return;
+    }
+    if (delta.version <= stateVersion) {
+      resyncPending = false; // Already up to date (e.g. an empty resync reply)
+      return;
+    }
+    if (delta.from !== stateVersion) {
+      // Missed a delta: ask for everything since the last version we applied
+      if (!resyncPending) {
+        resyncPending = true;
+        socket.emit("state_resync", { version: stateVersion });
+      }
+      return;
+    }
+    stateVersion = delta.version;
+    resyncPending = false;
+    applyState(delta.changes);
+  });
+
+  socket.on("command_ack", function (ack) {
+    if (ack && ack.seq) {
+      unacked = unacked.filter(function (entry) { return entry.seq > ack.seq; });
+    }
+  });
+
+  socket.on("slide_state", function (state) {
+    slideEl.textContent = state.current ? state.current + " / " + state.total : "";
+  });
+
+  socket.on("notes", function (data) {
+    document.getElementById("notes").hidden = false;
+    document.getElementById("notes-title").textContent =
+      data.current.slide + ". " + (data.current.title || "");
+    document.getElementById("notes-text").textContent = data.current.notes;
+    document.getElementById("notes-next").textContent =
+      data.next ? "Next: " + (data.next.title || "Slide " + data.next.slide) : "";
+    slideEl.textContent = data.current.slide + " / " + data.total;
+  });
+
+  socket.on("error", function (data) {
+    statusEl.textContent = data && data.message ? data.message : "Error";
+  });
+
+  socket.on("disconnect", function () {
+    statusEl.textContent = socket.serverStopping ? "Server stopped" : "Disconnected (another controller connected)";
+  });
+
+  // Acknowledge at once: the server waits for the ack (briefly) before disconnecting us.
+  // Keep retrying afterwards, so the controller finds the server again when it restarts.
+  socket.on("server_shutdown", function (data, ack) {
+    socket.serverStopping = true;
+    statusEl.textContent = "Server stopped";
+    if (typeof ack === "function") {
+      ack();
+    }
+  });
+
+  socket.connect();
+})();